@@ -1,12 +1,24 @@
 """Streamlit app for IntelliFlow SupportFlow."""
 
 import asyncio
+import atexit
+import hashlib
+import queue
 import sys
+import threading
+import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
+from uuid import uuid4
 
 import streamlit as st
 
+try:
+    import uvloop
+except ImportError:  # Optional; not available on Windows
+    uvloop = None
+
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -19,6 +31,25 @@ from src.db.connection import get_database, close_database
 from src.db.migrations import run_migrations
 from src.llm.client import get_llm_client
 from src.agents.orchestrator import Orchestrator
+from src.services.session_store import get_session_store, close_session_store
+
+# Maximum number of governance log entries kept per session
+MAX_GOVERNANCE_LOGS = 100
+
+# Plain text layout of a single governance log line
+_LOG_FMT = "{timestamp} [{status:5}] [{component}] {action}{details}"
+
+# Last formatted wall-clock second, shared by all sessions: (epoch second, "HH:MM:SS")
+_clock_cache: tuple[int, str] = (0, "")
+
+# Session state saved to the optional session store after each message
+PERSISTED_STATE_KEYS = (
+    "customer_id", "chat_history", "total_tokens", "session_cost", "tickets_created",
+)
+
+# Cookie Streamlit's XSRF protection sets once per browser; saved sessions are
+# bound to it so a shared URL alone can't load someone else's conversation
+BROWSER_COOKIE = "_streamlit_xsrf"
 
 
 # Page configuration
@@ -30,7 +61,7 @@ st.set_page_config(
 )
 
 # Custom CSS for styling
-st.markdown("""
+CSS = """
 <style>
     .main-title {
         font-size: 2.5rem;
@@ -44,6 +75,11 @@ st.markdown("""
         margin-top: 0;
         margin-bottom: 1.5rem;
     }
+    .metric-row {
+        display: grid;
+        grid-template-columns: repeat(3, 1fr);
+        gap: 1rem;
+    }
     .metric-card {
         background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
         padding: 1rem;
@@ -133,7 +169,7 @@ st.markdown("""
         background: linear-gradient(135deg, #5a6fd6 0%, #6a4190 100%);
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
 
 def init_session_state():
@@ -144,8 +180,13 @@ def init_session_state():
         st.session_state.orchestrator = None
     if "chat_history" not in st.session_state:
         st.session_state.chat_history = []
-    # Use shared governance state from intelliflow_core
+    # Use shared governance state from intelliflow_core, bounded with a deque
+    # so appends stay O(1) and old entries drop off automatically
     init_governance_state()
+    if not isinstance(st.session_state.governance_logs, deque):
+        st.session_state.governance_logs = deque(
+            st.session_state.governance_logs, maxlen=MAX_GOVERNANCE_LOGS
+        )
     if "total_tokens" not in st.session_state:
         st.session_state.total_tokens = 0
     if "session_cost" not in st.session_state:
@@ -156,6 +197,82 @@ def init_session_state():
         st.session_state.customer_id = f"STREAMLIT_{datetime.now().strftime('%Y%m%d%H%M%S')}"
     if "chaos_mode" not in st.session_state:
         st.session_state.chaos_mode = False
+    if "pending_reply" not in st.session_state:
+        st.session_state.pending_reply = None
+    if "session_id" not in st.session_state:
+        restore_session()
+
+
+def clock_hms() -> str:
+    """Get the current local time as HH:MM:SS, formatted at most once per second."""
+    global _clock_cache
+
+    now = time.time()
+    second = int(now)
+    if _clock_cache[0] != second:
+        # A single tuple assignment, so concurrent sessions never see a torn value
+        _clock_cache = (second, time.strftime("%H:%M:%S", time.localtime(now)))
+    return _clock_cache[1]
+
+
+def _session_store_key(session_id: str) -> str | None:
+    """Get the key a session is saved under, bound to this browser.
+
+    Args:
+        session_id: Session ID from the URL
+
+    Returns:
+        Digest of the session ID and the browser's cookie, or None if the
+        browser has no cookie to bind to
+    """
+    browser_token = st.context.cookies.get(BROWSER_COOKIE)
+    if not browser_token:
+        return None
+
+    return hashlib.blake2b(
+        f"{session_id}\0{browser_token}".encode("utf-8"),
+        digest_size=16,
+    ).hexdigest()
+
+
+def restore_session():
+    """Restore this browser session from the session store, if enabled.
+
+    The session ID is kept in the URL so a reload, restart or another replica
+    can find the saved snapshot. The snapshot is stored under a key that also
+    depends on the browser's cookie, so the URL only works in the browser
+    that created it. Browsers without the cookie are not persisted.
+    """
+    store = get_session_store()
+    session_id = st.query_params.get("session") or uuid4().hex
+    st.session_state.session_id = session_id
+    st.session_state.session_store_key = None
+
+    if store is None:
+        return
+
+    store_key = _session_store_key(session_id)
+    if store_key is None:
+        return
+
+    st.session_state.session_store_key = store_key
+    st.query_params["session"] = session_id
+    snapshot = run_async(store.load(store_key))
+    if snapshot:
+        for key in PERSISTED_STATE_KEYS:
+            if key in snapshot:
+                st.session_state[key] = snapshot[key]
+
+
+def persist_session():
+    """Save this session's chat history and metrics to the session store."""
+    store = get_session_store()
+    store_key = st.session_state.session_store_key
+    if store is None or store_key is None:
+        return
+
+    snapshot = {key: st.session_state[key] for key in PERSISTED_STATE_KEYS}
+    run_async(store.save(store_key, snapshot))
 
 
 async def initialize_system():
@@ -168,14 +285,69 @@ async def initialize_system():
 
     llm_client = get_llm_client(settings)
     orchestrator = Orchestrator(db=db, llm_client=llm_client)
+    await orchestrator.token_tracker.warm_pricing()
+
+    return orchestrator
+
+
+@st.cache_resource(show_spinner=False)
+def get_event_loop():
+    """Get the event loop shared by all sessions.
+
+    The loop runs forever in a daemon thread so that the aiosqlite connection
+    and LLM HTTP clients stay bound to a single loop for the process lifetime.
+    It is a uvloop loop when uvloop is installed.
+    """
+    loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, name="supportflow-loop", daemon=True)
+    thread.start()
+    return loop
+
+
+def run_async(coro):
+    """Run a coroutine on the shared event loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result()
+
 
+def _shutdown_system():
+    """Close the shared database connection at process exit."""
+    loop = get_event_loop()
+    asyncio.run_coroutine_threadsafe(close_session_store(), loop).result(timeout=5)
+    asyncio.run_coroutine_threadsafe(close_database(), loop).result(timeout=5)
+    loop.call_soon_threadsafe(loop.stop)
+
+
+@st.cache_resource(show_spinner=False)
+def get_orchestrator():
+    """Get the orchestrator shared by all sessions.
+
+    Streamlit caches the result, so the database connection, migrations and
+    LLM client are set up once per process rather than once per session.
+    """
+    orchestrator = run_async(initialize_system())
+    atexit.register(_shutdown_system)
     return orchestrator
 
 
-async def process_message(message: str):
-    """Process a customer message through the orchestrator."""
-    orchestrator = st.session_state.orchestrator
-    chaos_mode = st.session_state.chaos_mode
+async def _run_pipeline(orchestrator, customer_id: str, message: str, chaos_mode: bool, on_token):
+    """Process a message and fetch its ticket details on the shared loop."""
+    result = await orchestrator.process_message(
+        customer_id=customer_id,
+        message=message,
+        chaos_mode=chaos_mode,
+        on_token=on_token,
+    )
+    details = await orchestrator.get_ticket_details(result.ticket.id)
+    return result, details
+
+
+def submit_message(message: str):
+    """Start processing a customer message on the shared event loop.
+
+    Returns immediately; render_pending_reply polls for the result.
+    """
+    ss = st.session_state
+    chaos_mode = ss.chaos_mode
 
     add_governance_log(
         "Orchestrator",
@@ -183,16 +355,34 @@ async def process_message(message: str):
         True,
         f"Length: {len(message)}" + (" [CHAOS MODE]" if chaos_mode else "")
     )
+    add_governance_log("Classifier", "Classifying message", True)
+
+    # The loop thread streams the reply into a queue that the script thread
+    # drains on each poll
+    chunks: queue.SimpleQueue = queue.SimpleQueue()
+    future = asyncio.run_coroutine_threadsafe(
+        _run_pipeline(ss.orchestrator, ss.customer_id, message, chaos_mode, chunks.put),
+        get_event_loop(),
+    )
 
-    try:
-        # Process the message
-        add_governance_log("Classifier", "Classifying message", True)
+    ss.pending_reply = {
+        "message": message,
+        "timestamp": clock_hms(),
+        "future": future,
+        "chunks": chunks,
+        "text": "",
+    }
 
-        result = await orchestrator.process_message(
-            customer_id=st.session_state.customer_id,
-            message=message,
-            chaos_mode=chaos_mode,
-        )
+
+def finish_message(pending: dict):
+    """Record the outcome of a processed message in the session."""
+    # Local alias avoids repeated SessionStateProxy attribute lookups
+    ss = st.session_state
+    ss.pending_reply = None
+    message = pending["message"]
+
+    try:
+        result, details = pending["future"].result()
 
         # Log classification
         add_governance_log(
@@ -212,8 +402,8 @@ async def process_message(message: str):
 
         # Log response generation
         add_governance_log(
-            result.handler_used,
-            "Generated response",
+            "ResponseCache" if result.from_cache else result.handler_used,
+            "Reused cached response" if result.from_cache else "Generated response",
             True,
             f"Length: {len(result.response)}"
         )
@@ -228,30 +418,30 @@ async def process_message(message: str):
                 policy_ids
             )
 
-        # Get ticket details for cost
-        details = await orchestrator.get_ticket_details(result.ticket.id)
-
         # Update session metrics
-        st.session_state.tickets_created += 1
-        st.session_state.session_cost += details["total_cost_usd"]
+        ss.tickets_created += 1
+        ss.session_cost += details["total_cost_usd"]
 
         # Calculate tokens from usage records
-        for usage in details["token_usage"]:
-            st.session_state.total_tokens += usage["input_tokens"] + usage["output_tokens"]
+        ss.total_tokens += sum(
+            usage["input_tokens"] + usage["output_tokens"]
+            for usage in details["token_usage"]
+        )
 
         # Log ticket creation
         add_governance_log(
             "Database",
             "Ticket created",
             True,
-            f"ID: {result.ticket.id[:8]}..."
+            f"ID: {result.ticket.short_id}..."
         )
 
         # Add to chat history
-        st.session_state.chat_history.append({
+        ss.chat_history.append({
+            "id": uuid4().hex,
             "role": "user",
             "content": message,
-            "timestamp": datetime.now().strftime("%H:%M:%S"),
+            "timestamp": pending["timestamp"],
         })
 
         # Format cited policies for storage
@@ -260,7 +450,8 @@ async def process_message(message: str):
             for p in result.cited_policies
         ] if result.cited_policies else []
 
-        st.session_state.chat_history.append({
+        ss.chat_history.append({
+            "id": uuid4().hex,
             "role": "agent",
             "content": result.response,
             "category": result.classification.category.value,
@@ -268,7 +459,7 @@ async def process_message(message: str):
             "handler": result.handler_used,
             "ticket_id": result.ticket.id,
             "cost": details["total_cost_usd"],
-            "timestamp": datetime.now().strftime("%H:%M:%S"),
+            "timestamp": clock_hms(),
             "cited_policies": cited_policies,
         })
 
@@ -280,6 +471,7 @@ async def process_message(message: str):
                 result.escalation_reason or ""
             )
 
+        persist_session()
         return True
 
     except Exception as e:
@@ -288,32 +480,63 @@ async def process_message(message: str):
         return False
 
 
-def render_chat_message(msg):
-    """Render a single chat message."""
-    if msg["role"] == "user":
-        st.markdown(f"""
+@st.cache_data(max_entries=500, show_spinner=False)
+def _render_user_html(msg_id: str, content: str, timestamp: str) -> str:
+    """Build the HTML for a customer message (cached per message)."""
+    return f"""
         <div class="chat-message user-message">
-            <strong>Customer</strong> <span style="color: #888; font-size: 0.8rem;">({msg['timestamp']})</span>
-            <p style="margin: 0.5rem 0 0 0;">{msg['content']}</p>
+            <strong>Customer</strong> <span style="color: #888; font-size: 0.8rem;">({timestamp})</span>
+            <p style="margin: 0.5rem 0 0 0;">{content}</p>
         </div>
-        """, unsafe_allow_html=True)
-    else:
-        category = msg.get("category", "query")
-        badge_class = f"{category}-badge"
-
-        st.markdown(f"""
+        """
+
+
+@st.cache_data(max_entries=500, show_spinner=False)
+def _render_agent_html(
+    msg_id: str,
+    content: str,
+    category: str,
+    confidence: float,
+    handler: str,
+    cost: float,
+) -> str:
+    """Build the HTML for an agent response (cached per message)."""
+    badge_class = f"{category}-badge"
+
+    return f"""
         <div class="chat-message agent-message">
             <div style="margin-bottom: 0.5rem;">
                 <span class="classification-badge {badge_class}">{category.upper()}</span>
                 <span style="color: #888; font-size: 0.8rem;">
-                    Confidence: {msg.get('confidence', 0):.0%} |
-                    Handler: {msg.get('handler', 'unknown')} |
-                    Cost: ${msg.get('cost', 0):.6f}
+                    Confidence: {confidence:.0%} |
+                    Handler: {handler} |
+                    Cost: ${cost:.6f}
                 </span>
             </div>
-            <p style="margin: 0;">{msg['content']}</p>
+            <p style="margin: 0;">{content}</p>
         </div>
-        """, unsafe_allow_html=True)
+        """
+
+
+def render_chat_message(msg):
+    """Render a single chat message."""
+    if msg["role"] == "user":
+        st.markdown(
+            _render_user_html(msg.get("id"), msg["content"], msg["timestamp"]),
+            unsafe_allow_html=True,
+        )
+    else:
+        st.markdown(
+            _render_agent_html(
+                msg.get("id"),
+                msg["content"],
+                msg.get("category", "query"),
+                msg.get("confidence", 0),
+                msg.get("handler", "unknown"),
+                msg.get("cost", 0),
+            ),
+            unsafe_allow_html=True,
+        )
 
         # Render policy section using native Streamlit formatting
         cited_policies = msg.get("cited_policies", [])
@@ -324,6 +547,27 @@ def render_chat_message(msg):
                     st.markdown(f"- **{policy['id']}**: {policy['title']}")
 
 
+@st.cache_data(max_entries=100, show_spinner=False)
+def _render_metrics_html(total_tokens: int, session_cost: float, tickets_created: int) -> str:
+    """Build the HTML for the metrics bar as a single three-card row."""
+    return f"""
+    <div class="metric-row">
+        <div class="metric-card">
+            <div class="metric-value">{total_tokens:,}</div>
+            <div class="metric-label">Total Tokens</div>
+        </div>
+        <div class="metric-card">
+            <div class="metric-value">${session_cost:.6f}</div>
+            <div class="metric-label">Session Cost</div>
+        </div>
+        <div class="metric-card">
+            <div class="metric-value">{tickets_created}</div>
+            <div class="metric-label">Tickets Created</div>
+        </div>
+    </div>
+    """
+
+
 def render_governance_log():
     """Render the governance log panel using GovernanceLogEntry from intelliflow_core."""
     if not st.session_state.governance_logs:
@@ -331,28 +575,37 @@ def render_governance_log():
         return
 
     # Build plain text log entries (reversed for newest-first display)
-    log_lines = []
-    for entry in reversed(st.session_state.governance_logs):
-        status = "OK" if entry.success else "ERROR"
-        timestamp = format_timestamp_short(entry.timestamp)
-        details = f' - {entry.details}' if entry.details else ""
-        line = f'{timestamp} [{status:5}] [{entry.component}] {entry.action}{details}'
-        log_lines.append(line)
+    log_text = "\n".join(
+        _format_log_entry(entry) for entry in reversed(st.session_state.governance_logs)
+    )
 
     # Display as code block for monospace formatting
-    log_text = "\n".join(log_lines)
     st.code(log_text, language=None)
 
 
+def _format_log_entry(entry) -> str:
+    """Format a governance log entry as a single plain text line."""
+    return _LOG_FMT.format(
+        timestamp=format_timestamp_short(entry.timestamp),
+        status="OK" if entry.success else "ERROR",
+        component=entry.component,
+        action=entry.action,
+        details=" - " + entry.details if entry.details else "",
+    )
+
+
 def main():
     """Main Streamlit app."""
+    # Streamlit drops elements a rerun doesn't emit, so the style block is
+    # re-sent every run; it is a constant and never rebuilt.
+    st.markdown(CSS, unsafe_allow_html=True)
     init_session_state()
 
     # Initialize system if needed
     if not st.session_state.initialized:
         with st.spinner("Initializing IntelliFlow SupportFlow..."):
             try:
-                st.session_state.orchestrator = asyncio.run(initialize_system())
+                st.session_state.orchestrator = get_orchestrator()
                 st.session_state.initialized = True
                 add_governance_log("System", "Initialized successfully", True)
             except Exception as e:
@@ -375,31 +628,14 @@ def main():
     st.markdown('<p class="subtitle">Governed Multi-Agent Workflow for Banking Support</p>', unsafe_allow_html=True)
 
     # Metrics bar
-    col1, col2, col3 = st.columns(3)
-
-    with col1:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-value">{st.session_state.total_tokens:,}</div>
-            <div class="metric-label">Total Tokens</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col2:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-value">${st.session_state.session_cost:.6f}</div>
-            <div class="metric-label">Session Cost</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col3:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-value">{st.session_state.tickets_created}</div>
-            <div class="metric-label">Tickets Created</div>
-        </div>
-        """, unsafe_allow_html=True)
+    st.markdown(
+        _render_metrics_html(
+            st.session_state.total_tokens,
+            st.session_state.session_cost,
+            st.session_state.tickets_created,
+        ),
+        unsafe_allow_html=True,
+    )
 
     st.markdown("<br>", unsafe_allow_html=True)
 
@@ -408,56 +644,89 @@ def main():
 
     # Left column - Chat interface
     with left_col:
-        st.markdown("### Chat Interface")
-
-        # Chat history container
-        chat_container = st.container()
-
-        with chat_container:
-            if st.session_state.chat_history:
-                for msg in st.session_state.chat_history:
-                    render_chat_message(msg)
-            else:
-                st.markdown("""
-                <div style="text-align: center; color: #888; padding: 2rem; background: #f9f9f9; border-radius: 10px;">
-                    <p style="font-size: 1.1rem;">Welcome to IntelliFlow SupportFlow</p>
-                    <p>Enter a customer message below to begin. Try messages like:</p>
-                    <ul style="text-align: left; display: inline-block;">
-                        <li>"Thank you for the excellent service!"</li>
-                        <li>"I'm frustrated with the fees on my account!"</li>
-                        <li>"What are your branch hours?"</li>
-                    </ul>
-                </div>
-                """, unsafe_allow_html=True)
-
-        # Input area
-        st.markdown("<br>", unsafe_allow_html=True)
-
-        with st.form(key="message_form", clear_on_submit=True):
-            user_input = st.text_area(
-                "Customer Message",
-                placeholder="Enter customer message here...",
-                height=100,
-                label_visibility="collapsed",
-            )
-
-            submit_button = st.form_submit_button("Send Message")
-
-            if submit_button and user_input.strip():
-                with st.spinner("Processing message..."):
-                    asyncio.run(process_message(user_input.strip()))
-                st.rerun()
+        render_chat_panel()
 
     # Right column - Governance Log
     with right_col:
-        st.markdown("### Governance Log")
-        render_governance_log()
-
-        # Refresh button
-        if st.button("Clear Logs", key="clear_logs"):
-            st.session_state.governance_logs = []
-            add_governance_log("System", "Logs cleared", True)
-            st.rerun()
+        render_governance_panel()
+
+
+@st.fragment
+def render_chat_panel():
+    """Render the chat history and message input.
+
+    Runs as a fragment, so submitting a message reruns only this panel while
+    the reply is polled.
+    """
+    st.markdown("### Chat Interface")
+
+    # Chat history container
+    chat_container = st.container()
+
+    with chat_container:
+        if st.session_state.chat_history:
+            for msg in st.session_state.chat_history:
+                render_chat_message(msg)
+        elif st.session_state.pending_reply is None:
+            st.markdown("""
+            <div style="text-align: center; color: #888; padding: 2rem; background: #f9f9f9; border-radius: 10px;">
+                <p style="font-size: 1.1rem;">Welcome to IntelliFlow SupportFlow</p>
+                <p>Enter a customer message below to begin. Try messages like:</p>
+                <ul style="text-align: left; display: inline-block;">
+                    <li>"Thank you for the excellent service!"</li>
+                    <li>"I'm frustrated with the fees on my account!"</li>
+                    <li>"What are your branch hours?"</li>
+                </ul>
+            </div>
+            """, unsafe_allow_html=True)
+
+        if st.session_state.pending_reply is not None:
+            render_pending_reply()
+
+    user_input = st.chat_input("Enter customer message here...")
+
+    if user_input and user_input.strip():
+        if st.session_state.pending_reply is not None:
+            st.toast("Still processing the previous message")
+        else:
+            submit_message(user_input.strip())
+            with chat_container:
+                render_pending_reply()
+
+
+@st.fragment(run_every=0.5)
+def render_pending_reply():
+    """Show the in-flight message and its streamed reply until it completes."""
+    pending = st.session_state.pending_reply
+    if pending is None:
+        return
+
+    chunks = pending["chunks"]
+    while not chunks.empty():
+        pending["text"] += chunks.get()
+
+    if pending["future"].done():
+        finish_message(pending)
+        # Metrics and the governance log changed as well
+        st.rerun()
+
+    st.markdown(
+        _render_user_html("pending", pending["message"], pending["timestamp"]),
+        unsafe_allow_html=True,
+    )
+    st.markdown(pending["text"] or "_Processing message..._")
+
+
+@st.fragment
+def render_governance_panel():
+    """Render the governance log and its controls as an independent fragment."""
+    st.markdown("### Governance Log")
+    render_governance_log()
+
+    if st.button("Clear Logs", key="clear_logs"):
+        st.session_state.governance_logs.clear()
+        add_governance_log("System", "Logs cleared", True)
+        st.rerun(scope="fragment")
 
 
 if __name__ == "__main__":
@@ -1,12 +1,13 @@
 """Abstract base class for all agents."""
 
 from abc import ABC, abstractmethod
-from typing import Any
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
 
 from ..db.connection import DatabaseConnection
-from ..llm.client import LLMClient, LLMResponse
+from ..llm.client import LLMClient, LLMResponse, TokenCallback
 from ..llm.token_tracker import TokenTracker
-from ..services.audit_service import AuditService
+from ..services.audit_service import ActionTracker, AuditService
 from ..utils.enums import AuditAction
 from ..utils.logger import get_logger
 
@@ -14,6 +15,9 @@ from ..utils.logger import get_logger
 class BaseAgent(ABC):
     """Abstract base class for all agents in the support flow system."""
 
+    # Whether process() accepts pre-fetched policies via a `policies` argument
+    uses_policies: bool = False
+
     def __init__(
         self,
         db: DatabaseConnection,
@@ -67,6 +71,8 @@ class BaseAgent(ABC):
         action: AuditAction,
         max_tokens: int = 1024,
         temperature: float = 0.7,
+        retry_max_tokens: int | None = None,
+        on_token: TokenCallback | None = None,
     ) -> LLMResponse:
         """Call the LLM with tracking and auditing.
 
@@ -76,30 +82,87 @@ class BaseAgent(ABC):
             action: Audit action type
             max_tokens: Maximum tokens in response
             temperature: Sampling temperature
+            retry_max_tokens: Larger limit to retry with if the response
+                is truncated at max_tokens
+            on_token: Streams the response, passing each text delta here
 
         Returns:
             LLM response
         """
+        async with self.tracked_llm_call(
+            ticket_id=ticket_id,
+            user_message=user_message,
+            action=action,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            retry_max_tokens=retry_max_tokens,
+            on_token=on_token,
+        ) as (response, _tracker):
+            return response
+
+    @asynccontextmanager
+    async def tracked_llm_call(
+        self,
+        ticket_id: str,
+        user_message: str,
+        action: AuditAction,
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+        retry_max_tokens: int | None = None,
+        on_token: TokenCallback | None = None,
+        system_prompt: str | None = None,
+        coalesce: bool = False,
+    ) -> AsyncIterator[tuple[LLMResponse, ActionTracker]]:
+        """Call the LLM inside an audit tracking context.
+
+        The audit entry is written when the context exits, so callers can
+        refine the tracker output (e.g. with parsed decision details) first.
+
+        Args:
+            ticket_id: Associated ticket ID
+            user_message: Message to send to LLM
+            action: Audit action type
+            max_tokens: Maximum tokens in response
+            temperature: Sampling temperature
+            retry_max_tokens: Larger limit to retry with if the response
+                is truncated at max_tokens
+            on_token: Streams the response, passing each text delta here
+            system_prompt: Prompt to use instead of the agent's system_prompt
+            coalesce: Share the request with identical ones in flight (see
+                LLMClient.complete); only for calls whose output need not vary
+
+        Yields:
+            Tuple of the LLM response and its action tracker
+        """
         async with self.audit_service.track_action(
             ticket_id=ticket_id,
             agent_name=self.name,
             action=action,
             input_summary=self._truncate(user_message, 200),
         ) as tracker:
-            # Call LLM
-            response = await self.llm_client.complete(
-                system_prompt=self.system_prompt,
-                user_message=user_message,
-                max_tokens=max_tokens,
-                temperature=temperature,
+            # A streamed reply is shown as it arrives and can't be retried,
+            # so it gets the larger limit up front
+            if on_token is not None and retry_max_tokens:
+                max_tokens, retry_max_tokens = retry_max_tokens, None
+
+            response = await self._complete_tracked(
+                ticket_id, user_message, max_tokens, temperature, on_token, system_prompt,
+                coalesce,
             )
 
-            # Track token usage
-            await self.token_tracker.track_usage(
-                ticket_id=ticket_id,
-                agent_name=self.name,
-                response=response,
-            )
+            # Most responses fit a small limit; only regenerate the ones that don't
+            if response.truncated and retry_max_tokens:
+                self.logger.info(
+                    "llm_response_truncated",
+                    ticket_id=ticket_id,
+                    max_tokens=max_tokens,
+                    retry_max_tokens=retry_max_tokens,
+                )
+                response = await self._complete_tracked(
+                    ticket_id, user_message, retry_max_tokens, temperature,
+                    system_prompt=system_prompt,
+                    coalesce=coalesce,
+                )
 
             # Update tracker
             tracker.set_output(
@@ -114,7 +177,60 @@ class BaseAgent(ABC):
                 output_tokens=response.output_tokens,
             )
 
-            return response
+            yield response, tracker
+
+    async def _complete_tracked(
+        self,
+        ticket_id: str,
+        user_message: str,
+        max_tokens: int,
+        temperature: float,
+        on_token: TokenCallback | None = None,
+        system_prompt: str | None = None,
+        coalesce: bool = False,
+    ) -> LLMResponse:
+        """Send one completion request and record its token usage.
+
+        Args:
+            ticket_id: Associated ticket ID
+            user_message: Message to send to LLM
+            max_tokens: Maximum tokens in response
+            temperature: Sampling temperature
+            on_token: Streams the response, passing each text delta here
+            system_prompt: Prompt to use instead of the agent's system_prompt
+            coalesce: Share the request with identical ones in flight
+
+        Returns:
+            LLM response
+        """
+        system_prompt = system_prompt or self.system_prompt
+
+        if on_token is not None:
+            response = await self.llm_client.complete_stream(
+                system_prompt=system_prompt,
+                user_message=user_message,
+                on_token=on_token,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                cache_key=self.name,
+            )
+        else:
+            response = await self.llm_client.complete(
+                system_prompt=system_prompt,
+                user_message=user_message,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                cache_key=self.name,
+                coalesce=coalesce,
+            )
+
+        await self.token_tracker.track_usage(
+            ticket_id=ticket_id,
+            agent_name=self.name,
+            response=response,
+        )
+
+        return response
 
     def _truncate(self, text: str, max_length: int) -> str:
         """Truncate text to max length.
@@ -1,13 +1,38 @@
 """Message classifier agent."""
 
-import json
+import hashlib
+import re
+from collections import OrderedDict
 from dataclasses import dataclass
 
+import orjson
+
 from .base_agent import BaseAgent
-from ..llm.prompts import CLASSIFIER_SYSTEM_PROMPT
-from ..utils.enums import MessageCategory, AuditAction
+from ..llm.prompts import CLASSIFIER_SYSTEM_PROMPT, CLASSIFY_AND_RESPOND_SYSTEM_PROMPT
+from ..utils.enums import MESSAGE_CATEGORY_BY_VALUE, MessageCategory, AuditAction
 from ..utils.exceptions import ClassificationError
 
+# Markdown code fences the model sometimes wraps around its JSON output
+_FENCE_RE = re.compile(r"^```[a-zA-Z]*\s*|\s*```$")
+
+# Whole messages whose category is unambiguous, classified without the LLM
+_OBVIOUS_POSITIVE_RE = re.compile(
+    r"\s*(?:thanks?|thank you|thx|great|awesome|perfect|love (?:it|this))"
+    r"(?: (?:so|very) much| a lot)?[\s!.:)]*",
+    re.IGNORECASE,
+)
+_OBVIOUS_NEGATIVE_RE = re.compile(
+    r"\s*(?:(?:this is )?(?:terrible|awful|horrible|unacceptable|ridiculous)"
+    r"|worst (?:service|bank|app|experience)(?: ever)?)[\s!.]*",
+    re.IGNORECASE,
+)
+
+# Confidence reported for messages matched by the patterns above
+LOCAL_CLASSIFICATION_CONFIDENCE = 0.98
+
+# Maximum number of LLM classifications remembered for repeated messages
+CLASSIFICATION_CACHE_MAX_ENTRIES = 1024
+
 
 @dataclass
 class ClassificationResult:
@@ -21,6 +46,20 @@ class ClassificationResult:
 class ClassifierAgent(BaseAgent):
     """Agent that classifies customer messages into categories."""
 
+    def __init__(self, *args, **kwargs):
+        """Initialize the agent.
+
+        Args:
+            *args: Positional arguments for BaseAgent
+            **kwargs: Keyword arguments for BaseAgent
+        """
+        super().__init__(*args, **kwargs)
+        # LLM classifications and drafted replies keyed by prompt, model and
+        # normalized message, least recent first
+        self._classification_cache: OrderedDict[
+            bytes, tuple[ClassificationResult, str | None]
+        ] = OrderedDict()
+
     @property
     def name(self) -> str:
         """Get the agent name."""
@@ -50,17 +89,223 @@ class ClassifierAgent(BaseAgent):
             message_length=len(message),
         )
 
-        response = await self.call_llm(
+        local_result = await self._classify_locally(ticket_id, message)
+        if local_result is not None:
+            return local_result
+
+        cached = await self._classify_from_cache(ticket_id, message, self.system_prompt)
+        if cached is not None:
+            return cached[0]
+
+        async with self.tracked_llm_call(
             ticket_id=ticket_id,
             user_message=message,
             action=AuditAction.CLASSIFY,
             max_tokens=256,
             temperature=0.3,  # Lower temperature for more consistent classification
+            coalesce=True,  # Identical messages in flight share one classification
+        ) as (response, tracker):
+            result = self._parse_response(response.content)
+
+            # Record classification details on the same audit entry
+            tracker.set_output(
+                output_summary=f"category={result.category.value}",
+                reasoning=result.reasoning,
+                confidence=result.confidence,
+            )
+
+        self._cache_classification(message, self.system_prompt, result)
+
+        self.logger.info(
+            "message_classified",
+            ticket_id=ticket_id,
+            category=result.category.value,
+            confidence=result.confidence,
+        )
+
+        return result
+
+    async def process_and_respond(
+        self,
+        ticket_id: str,
+        message: str,
+    ) -> tuple[ClassificationResult, str | None]:
+        """Classify a message and, if it is positive, draft the reply in the same call.
+
+        Args:
+            ticket_id: Associated ticket ID
+            message: Customer message to classify
+
+        Returns:
+            Tuple of the ClassificationResult and the reply for positive
+            messages (None for other categories)
+
+        Raises:
+            ClassificationError: If classification fails
+        """
+        self.logger.info(
+            "classifying_message",
+            ticket_id=ticket_id,
+            message_length=len(message),
+            fast_path=True,
+        )
+
+        # Obvious messages skip the LLM; the handler then writes the reply
+        local_result = await self._classify_locally(ticket_id, message)
+        if local_result is not None:
+            return local_result, None
+
+        cached = await self._classify_from_cache(
+            ticket_id, message, CLASSIFY_AND_RESPOND_SYSTEM_PROMPT
+        )
+        if cached is not None:
+            return cached
+
+        async with self.tracked_llm_call(
+            ticket_id=ticket_id,
+            user_message=message,
+            action=AuditAction.CLASSIFY,
+            max_tokens=512,
+            temperature=0.5,  # Between classifier and positive handler settings
+            system_prompt=CLASSIFY_AND_RESPOND_SYSTEM_PROMPT,
+        ) as (response, tracker):
+            result, data = self._parse_payload(response.content)
+
+            reply = data.get("response")
+            if result.category != MessageCategory.POSITIVE or not isinstance(reply, str):
+                reply = None
+
+            tracker.set_output(
+                output_summary=f"category={result.category.value}",
+                reasoning=result.reasoning,
+                confidence=result.confidence,
+            )
+
+        reply = reply or None
+        self._cache_classification(message, CLASSIFY_AND_RESPOND_SYSTEM_PROMPT, result, reply)
+
+        self.logger.info(
+            "message_classified",
+            ticket_id=ticket_id,
+            category=result.category.value,
+            confidence=result.confidence,
+            drafted_reply=reply is not None,
         )
 
-        result = self._parse_response(response.content)
+        return result, reply
 
-        # Update the audit log with classification details
+    async def _classify_locally(
+        self,
+        ticket_id: str,
+        message: str,
+    ) -> ClassificationResult | None:
+        """Classify a message without the LLM when its category is obvious.
+
+        Args:
+            ticket_id: Associated ticket ID
+            message: Customer message to classify
+
+        Returns:
+            ClassificationResult if the whole message matched a known
+            positive or negative phrase, otherwise None
+        """
+        if _OBVIOUS_POSITIVE_RE.fullmatch(message):
+            category = MessageCategory.POSITIVE
+        elif _OBVIOUS_NEGATIVE_RE.fullmatch(message):
+            category = MessageCategory.NEGATIVE
+        else:
+            return None
+
+        result = ClassificationResult(
+            category=category,
+            confidence=LOCAL_CLASSIFICATION_CONFIDENCE,
+            reasoning=f"Message is a common {category.value} phrase",
+        )
+
+        await self._record_classification(ticket_id, message, result, local=True)
+        return result
+
+    async def _classify_from_cache(
+        self,
+        ticket_id: str,
+        message: str,
+        system_prompt: str,
+    ) -> tuple[ClassificationResult, str | None] | None:
+        """Reuse the LLM classification of an earlier identical message.
+
+        Messages differing only in case or whitespace are treated as the same.
+
+        Args:
+            ticket_id: Associated ticket ID
+            message: Customer message to classify
+            system_prompt: System prompt the classification would be made with
+
+        Returns:
+            The cached ClassificationResult and drafted reply, or None if the
+            message is new
+        """
+        key = self._cache_key(message, system_prompt)
+        cached = self._classification_cache.get(key)
+        if cached is None:
+            return None
+
+        self._classification_cache.move_to_end(key)
+        await self._record_classification(ticket_id, message, cached[0], cached=True)
+        return cached
+
+    def _cache_classification(
+        self,
+        message: str,
+        system_prompt: str,
+        result: ClassificationResult,
+        reply: str | None = None,
+    ) -> None:
+        """Remember an LLM classification for repeats of the message.
+
+        Args:
+            message: Customer message that was classified
+            system_prompt: System prompt it was classified with
+            result: Its classification
+            reply: Reply drafted in the same call, if any
+        """
+        key = self._cache_key(message, system_prompt)
+        self._classification_cache[key] = (result, reply)
+        self._classification_cache.move_to_end(key)
+
+        if len(self._classification_cache) > CLASSIFICATION_CACHE_MAX_ENTRIES:
+            self._classification_cache.popitem(last=False)
+
+    def _cache_key(self, message: str, system_prompt: str) -> bytes:
+        """Build the cache key for a message classified with the given prompt.
+
+        Args:
+            message: Customer message
+            system_prompt: System prompt used for the classification
+
+        Returns:
+            Key from _classification_key for the client's current model
+        """
+        settings = self.llm_client.settings
+        return _classification_key(
+            message, system_prompt, settings.llm_provider.value, settings.active_model
+        )
+
+    async def _record_classification(
+        self,
+        ticket_id: str,
+        message: str,
+        result: ClassificationResult,
+        **log_fields: bool,
+    ) -> None:
+        """Audit and log a classification made without calling the LLM.
+
+        Args:
+            ticket_id: Associated ticket ID
+            message: Customer message that was classified
+            result: Its classification
+            **log_fields: Extra fields for the log entry saying where the
+                result came from
+        """
         await self.audit_service.log_action(
             ticket_id=ticket_id,
             agent_name=self.name,
@@ -77,10 +322,9 @@ class ClassifierAgent(BaseAgent):
             ticket_id=ticket_id,
             category=result.category.value,
             confidence=result.confidence,
+            **log_fields,
         )
 
-        return result
-
     def _parse_response(self, content: str) -> ClassificationResult:
         """Parse the LLM response into a ClassificationResult.
 
@@ -90,24 +334,33 @@ class ClassifierAgent(BaseAgent):
         Returns:
             Parsed ClassificationResult
 
+        Raises:
+            ClassificationError: If parsing fails
+        """
+        return self._parse_payload(content)[0]
+
+    def _parse_payload(self, content: str) -> tuple[ClassificationResult, dict]:
+        """Parse the LLM response into a ClassificationResult and its raw JSON.
+
+        Args:
+            content: Raw LLM response
+
+        Returns:
+            Tuple of the parsed ClassificationResult and the decoded object
+
         Raises:
             ClassificationError: If parsing fails
         """
         try:
             # Clean the response (remove markdown code blocks if present)
-            cleaned = content.strip()
-            if cleaned.startswith("```"):
-                # Remove code block markers
-                lines = cleaned.split("\n")
-                cleaned = "\n".join(lines[1:-1]) if len(lines) > 2 else cleaned
+            cleaned = _FENCE_RE.sub("", content.strip())
 
-            data = json.loads(cleaned)
+            data = orjson.loads(cleaned)
 
             # Validate and extract category
             category_str = data.get("category", "").lower()
-            try:
-                category = MessageCategory(category_str)
-            except ValueError:
+            category = MESSAGE_CATEGORY_BY_VALUE.get(category_str)
+            if category is None:
                 raise ClassificationError(
                     f"Invalid category: {category_str}",
                     details={"raw_response": content},
@@ -124,9 +377,9 @@ class ClassifierAgent(BaseAgent):
                 category=category,
                 confidence=confidence,
                 reasoning=reasoning,
-            )
+            ), data
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             self.logger.error(
                 "classification_parse_error",
                 error=str(e),
@@ -145,3 +398,23 @@ class ClassifierAgent(BaseAgent):
                 f"Classification failed: {e}",
                 details={"raw_response": content},
             )
+
+
+def _classification_key(message: str, system_prompt: str, provider: str, model: str) -> bytes:
+    """Build the classification cache key for a message.
+
+    Args:
+        message: Customer message
+        system_prompt: System prompt the message is classified with
+        provider: LLM provider
+        model: Model name
+
+    Returns:
+        16-byte digest of the prompt, model and case- and whitespace-normalized
+        message
+    """
+    normalized = " ".join(message.lower().split())
+    return hashlib.blake2b(
+        f"{provider}\0{model}\0{system_prompt}\0{normalized}".encode("utf-8"),
+        digest_size=16,
+    ).digest()
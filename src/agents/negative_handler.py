@@ -2,29 +2,22 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
 from typing import List
 
 from .base_agent import BaseAgent
+from .types import HandlerResponse
+from ..llm.client import TokenCallback
 from ..llm.prompts import NEGATIVE_HANDLER_SYSTEM_PROMPT
 from ..services.policy_service import Policy, get_policy_service
 from ..utils.enums import AuditAction, TicketPriority
-
-
-@dataclass
-class HandlerResponse:
-    """Response from a handler agent."""
-
-    response: str
-    priority: TicketPriority
-    requires_escalation: bool = False
-    escalation_reason: str | None = None
-    cited_policies: List[Policy] = field(default_factory=list)
+from ..utils.text import compile_keyword_pattern
 
 
 class NegativeHandler(BaseAgent):
     """Agent that handles customer complaints and negative feedback."""
 
+    uses_policies = True
+
     # Keywords that indicate escalation may be needed
     ESCALATION_KEYWORDS = [
         "fraud",
@@ -43,6 +36,21 @@ class NegativeHandler(BaseAgent):
         "identity theft",
     ]
 
+    # Keywords that indicate a complaint is time-sensitive
+    HIGH_PRIORITY_KEYWORDS = [
+        "urgent",
+        "immediately",
+        "asap",
+        "emergency",
+        "cannot access",
+        "locked out",
+        "missing money",
+        "large amount",
+    ]
+
+    _ESCALATION_RE = compile_keyword_pattern(ESCALATION_KEYWORDS)
+    _HIGH_PRIORITY_RE = compile_keyword_pattern(HIGH_PRIORITY_KEYWORDS)
+
     @property
     def name(self) -> str:
         """Get the agent name."""
@@ -53,12 +61,20 @@ class NegativeHandler(BaseAgent):
         """Get the system prompt."""
         return NEGATIVE_HANDLER_SYSTEM_PROMPT
 
-    async def process(self, ticket_id: str, message: str) -> HandlerResponse:
+    async def process(
+        self,
+        ticket_id: str,
+        message: str,
+        policies: List[Policy] | None = None,
+        on_token: TokenCallback | None = None,
+    ) -> HandlerResponse:
         """Generate a response to complaints/negative feedback.
 
         Args:
             ticket_id: Associated ticket ID
             message: Customer message
+            policies: Pre-fetched relevant policies (searched here if None)
+            on_token: Optional callback to stream the response through
 
         Returns:
             HandlerResponse with the generated response
@@ -76,7 +92,9 @@ class NegativeHandler(BaseAgent):
 
         # Search for relevant policies
         policy_service = get_policy_service()
-        relevant_policies = policy_service.search_policies(message)
+        relevant_policies = (
+            policies if policies is not None else policy_service.search_policies(message)
+        )
 
         # Build enhanced message with policy context
         policy_context = policy_service.format_policies_for_prompt(relevant_policies)
@@ -89,8 +107,10 @@ class NegativeHandler(BaseAgent):
             ticket_id=ticket_id,
             user_message=enhanced_message,
             action=AuditAction.RESPOND,
-            max_tokens=768,  # Slightly more tokens for empathetic responses
+            max_tokens=256,  # Enough for most replies
             temperature=0.6,  # Slightly lower for more consistent tone
+            retry_max_tokens=768,  # Room for longer empathetic responses
+            on_token=on_token,
         )
 
         self.logger.info(
@@ -107,7 +127,7 @@ class NegativeHandler(BaseAgent):
             priority=priority,
             requires_escalation=escalation_needed,
             escalation_reason=escalation_reason,
-            cited_policies=relevant_policies,
+            cited_policies=tuple(relevant_policies),
         )
 
     def _check_escalation(self, message: str) -> tuple[bool, str | None]:
@@ -119,11 +139,9 @@ class NegativeHandler(BaseAgent):
         Returns:
             Tuple of (needs_escalation, reason)
         """
-        message_lower = message.lower()
-
-        for keyword in self.ESCALATION_KEYWORDS:
-            if keyword in message_lower:
-                return True, f"Message contains escalation trigger: '{keyword}'"
+        match = self._ESCALATION_RE.search(message)
+        if match:
+            return True, f"Message contains escalation trigger: '{match.group(1).lower()}'"
 
         return False, None
 
@@ -140,23 +158,8 @@ class NegativeHandler(BaseAgent):
         if escalation_needed:
             return TicketPriority.CRITICAL  # Priority 1
 
-        message_lower = message.lower()
-
-        # High priority indicators
-        high_priority_keywords = [
-            "urgent",
-            "immediately",
-            "asap",
-            "emergency",
-            "cannot access",
-            "locked out",
-            "missing money",
-            "large amount",
-        ]
-
-        for keyword in high_priority_keywords:
-            if keyword in message_lower:
-                return TicketPriority.HIGH  # Priority 2
+        if self._HIGH_PRIORITY_RE.search(message):
+            return TicketPriority.HIGH  # Priority 2
 
         # Default to high-medium priority for complaints
         return TicketPriority.HIGH  # Priority 2 for most complaints
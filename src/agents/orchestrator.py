@@ -2,30 +2,70 @@
 
 from __future__ import annotations
 
-import random
-from dataclasses import dataclass, field
-from typing import Any, List
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Tuple
 
 from ..db.connection import DatabaseConnection
 from ..db.models import Ticket
-from ..llm.client import LLMClient
+from ..db.write_buffer import buffered_writes
+from ..llm.client import LLMClient, TokenCallback
 from ..llm.token_tracker import TokenTracker
 from ..services.ticket_service import TicketService
 from ..services.audit_service import AuditService
-from ..services.policy_service import Policy
-from ..utils.enums import MessageCategory, AuditAction, TicketStatus
+from ..services.policy_service import Policy, get_policy_service
+from ..utils.enums import MessageCategory, AuditAction, TicketPriority, TicketStatus
 from ..utils.exceptions import ChaosError
 from ..utils.logger import get_logger
 
+from .base_agent import BaseAgent
 from .classifier_agent import ClassifierAgent, ClassificationResult
 from .positive_handler import PositiveHandler
 from .negative_handler import NegativeHandler
 from .query_handler import QueryHandler
+from .response_cache import CachedResponse, ResponseCache
+from .types import HandlerResponse
 
 logger = get_logger(__name__)
 
+# Messages up to this length are classified and, when positive, answered
+# by a single LLM call
+FAST_PATH_MAX_LENGTH = 280
 
-@dataclass
+# Minimum classifier confidence for using the single-call reply
+FAST_PATH_MIN_CONFIDENCE = 0.8
+
+# Categories whose replies may be reused for identical messages. Query
+# replies include the customer's ticket history, so they are never shared.
+CACHEABLE_CATEGORIES = frozenset({MessageCategory.POSITIVE, MessageCategory.NEGATIVE})
+
+# Messages processed at once by one orchestrator; the rest wait their turn
+DEFAULT_MAX_CONCURRENCY = 16
+
+# A chaos check fails when its random byte is below this (77/256 ~ 30%)
+CHAOS_FAILURE_THRESHOLD = 77
+
+# Random bytes drawn from the OS at a time for chaos checks
+CHAOS_RANDOM_BATCH = 64
+
+CHAOS_FAILURE_MESSAGES = (
+    "Simulated network timeout",
+    "Service temporarily unavailable",
+    "Database connection dropped",
+    "Rate limit exceeded",
+    "Internal processing error",
+)
+
+# Handler agent class for each message category
+HANDLER_CLASSES: dict[MessageCategory, type[BaseAgent]] = {
+    MessageCategory.POSITIVE: PositiveHandler,
+    MessageCategory.NEGATIVE: NegativeHandler,
+    MessageCategory.QUERY: QueryHandler,
+}
+
+
+@dataclass(frozen=True, slots=True)
 class ProcessingResult:
     """Result of processing a customer message."""
 
@@ -35,7 +75,8 @@ class ProcessingResult:
     handler_used: str
     requires_escalation: bool = False
     escalation_reason: str | None = None
-    cited_policies: List[Policy] = field(default_factory=list)
+    cited_policies: Tuple[Policy, ...] = ()
+    from_cache: bool = False
 
 
 class Orchestrator:
@@ -45,18 +86,23 @@ class Orchestrator:
         self,
         db: DatabaseConnection,
         llm_client: LLMClient,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
     ):
         """Initialize the orchestrator.
 
         Args:
             db: Database connection
             llm_client: LLM client
+            max_concurrency: Maximum number of messages processed at once
         """
         self.db = db
         self.llm_client = llm_client
+        self.max_concurrency = max_concurrency
+        self._concurrency = asyncio.Semaphore(max_concurrency)
         self.token_tracker = TokenTracker(db)
         self.audit_service = AuditService(db)
         self.ticket_service = TicketService(db)
+        self.response_cache = ResponseCache()
 
         # Initialize agents
         self.classifier = ClassifierAgent(
@@ -66,29 +112,41 @@ class Orchestrator:
             audit_service=self.audit_service,
         )
 
-        self.handlers: dict[MessageCategory, Any] = {
-            MessageCategory.POSITIVE: PositiveHandler(
-                db=db,
-                llm_client=llm_client,
-                token_tracker=self.token_tracker,
-                audit_service=self.audit_service,
-            ),
-            MessageCategory.NEGATIVE: NegativeHandler(
-                db=db,
-                llm_client=llm_client,
-                token_tracker=self.token_tracker,
-                audit_service=self.audit_service,
-            ),
-            MessageCategory.QUERY: QueryHandler(
-                db=db,
-                llm_client=llm_client,
-                token_tracker=self.token_tracker,
-                audit_service=self.audit_service,
-            ),
-        }
+        # Handlers are created on first use (see _get_handler)
+        self._handlers: dict[MessageCategory, BaseAgent] = {}
+
+        # Random bytes consumed by chaos checks, refilled in batches
+        self._chaos_bytes: Iterator[int] = iter(())
 
         logger.info("orchestrator_initialized")
 
+    @property
+    def handlers(self) -> dict[MessageCategory, BaseAgent]:
+        """Get the handler agent for every category, creating any not used yet."""
+        for category in HANDLER_CLASSES:
+            self._get_handler(category)
+        return self._handlers
+
+    def _get_handler(self, category: MessageCategory) -> BaseAgent:
+        """Get the handler for a category, creating it on first use.
+
+        Args:
+            category: Message category
+
+        Returns:
+            The handler agent for the category
+        """
+        handler = self._handlers.get(category)
+        if handler is None:
+            handler = HANDLER_CLASSES[category](
+                db=self.db,
+                llm_client=self.llm_client,
+                token_tracker=self.token_tracker,
+                audit_service=self.audit_service,
+            )
+            self._handlers[category] = handler
+        return handler
+
     def _maybe_trigger_chaos(self, component: str, chaos_mode: bool) -> None:
         """Possibly trigger a chaos failure.
 
@@ -99,28 +157,89 @@ class Orchestrator:
         Raises:
             ChaosError: If chaos mode triggers a failure (30% chance)
         """
-        if chaos_mode and random.random() < 0.3:
-            failure_messages = [
-                "Simulated network timeout",
-                "Service temporarily unavailable",
-                "Database connection dropped",
-                "Rate limit exceeded",
-                "Internal processing error",
-            ]
-            raise ChaosError(component, random.choice(failure_messages))
+        if not chaos_mode:
+            return
+
+        if self._next_chaos_byte() < CHAOS_FAILURE_THRESHOLD:
+            message_index = self._next_chaos_byte() % len(CHAOS_FAILURE_MESSAGES)
+            raise ChaosError(component, CHAOS_FAILURE_MESSAGES[message_index])
+
+    def _next_chaos_byte(self) -> int:
+        """Get the next random byte for chaos checks.
+
+        Returns:
+            A random integer in [0, 255]
+        """
+        byte = next(self._chaos_bytes, None)
+        if byte is None:
+            self._chaos_bytes = iter(os.urandom(CHAOS_RANDOM_BATCH))
+            byte = next(self._chaos_bytes)
+        return byte
 
     async def process_message(
         self,
         customer_id: str,
         message: str,
         chaos_mode: bool = False,
+        on_token: TokenCallback | None = None,
     ) -> ProcessingResult:
         """Process a customer message through the complete workflow.
 
+        At most max_concurrency messages are processed at once; further
+        calls wait for a slot.
+
+        Args:
+            customer_id: Customer identifier
+            message: Customer message
+            chaos_mode: If True, randomly inject failures for testing
+            on_token: Optional callback that receives the handler's response
+                text as it streams from the LLM
+
+        Returns:
+            ProcessingResult with ticket and response details
+        """
+        async with self._concurrency:
+            return await self._process_message(customer_id, message, chaos_mode, on_token)
+
+    async def process_messages(
+        self,
+        items: Iterable[tuple[str, str]],
+        chaos_mode: bool = False,
+        return_exceptions: bool = False,
+    ) -> list[ProcessingResult | BaseException]:
+        """Process several customer messages concurrently.
+
+        Args:
+            items: (customer_id, message) pairs
+            chaos_mode: If True, randomly inject failures for testing
+            return_exceptions: If True, a failed message's exception is
+                returned in its place instead of being raised
+
+        Returns:
+            Results in the same order as items
+        """
+        return await asyncio.gather(
+            *(
+                self.process_message(customer_id, message, chaos_mode)
+                for customer_id, message in items
+            ),
+            return_exceptions=return_exceptions,
+        )
+
+    async def _process_message(
+        self,
+        customer_id: str,
+        message: str,
+        chaos_mode: bool,
+        on_token: TokenCallback | None,
+    ) -> ProcessingResult:
+        """Run the workflow for one message (see process_message).
+
         Args:
             customer_id: Customer identifier
             message: Customer message
             chaos_mode: If True, randomly inject failures for testing
+            on_token: Optional callback for the streamed response
 
         Returns:
             ProcessingResult with ticket and response details
@@ -140,57 +259,42 @@ class Orchestrator:
         )
 
         try:
-            # Chaos check: ticket creation
-            self._maybe_trigger_chaos("TicketService", chaos_mode)
-
-            # Step 2: Classify the message
-            self._maybe_trigger_chaos("Classifier", chaos_mode)
-            classification = await self.classifier.process(
-                ticket_id=ticket.id,
-                message=message,
-            )
-
-            # Update ticket with classification
-            ticket.category = classification.category
-            ticket.metadata["classification_confidence"] = classification.confidence
-            ticket.metadata["classification_reasoning"] = classification.reasoning
-            await self.ticket_service.update_ticket(ticket)
-
-            # Step 3: Route to appropriate handler
-            self._maybe_trigger_chaos("Router", chaos_mode)
-            handler = self.handlers[classification.category]
-
-            # Log routing decision
-            await self.audit_service.log_action(
-                ticket_id=ticket.id,
-                agent_name="orchestrator",
-                action=AuditAction.ROUTE,
-                input_summary=f"category={classification.category.value}",
-                output_summary=f"handler={handler.name}",
-                decision_reasoning=f"Routing to {handler.name} based on classification",
-                confidence_score=classification.confidence,
-                success=True,
-            )
-
-            # Step 4: Generate response
-            self._maybe_trigger_chaos(handler.name, chaos_mode)
-            handler_response = await handler.process(
-                ticket_id=ticket.id,
-                message=message,
-            )
-
-            # Step 5: Update ticket with response
-            ticket.agent_response = handler_response.response
-            ticket.handler_agent = handler.name
-            ticket.priority = handler_response.priority
-            ticket.status = TicketStatus.RESOLVED
-
-            if handler_response.requires_escalation:
-                ticket.status = TicketStatus.ESCALATED
-                ticket.metadata["escalation_reason"] = handler_response.escalation_reason
-
-            self._maybe_trigger_chaos("Database", chaos_mode)
-            await self.ticket_service.update_ticket(ticket)
+            # Audit and token rows and the final ticket update for this message
+            # are written in one transaction
+            async with buffered_writes(self.db):
+                # Chaos check: ticket creation
+                self._maybe_trigger_chaos("TicketService", chaos_mode)
+
+                policy_version = get_policy_service().version
+                cached = self.response_cache.get(message, policy_version)
+
+                if cached is not None:
+                    classification, handler, handler_response = await self._replay_cached(
+                        ticket, cached, chaos_mode, on_token
+                    )
+                else:
+                    classification, handler, handler_response = await self._generate_response(
+                        ticket, message, chaos_mode, on_token
+                    )
+                    if classification.category in CACHEABLE_CATEGORIES:
+                        self.response_cache.put(
+                            message,
+                            policy_version,
+                            CachedResponse(classification, handler.name, handler_response),
+                        )
+
+                # Step 5: Update ticket with response
+                ticket.agent_response = handler_response.response
+                ticket.handler_agent = handler.name
+                ticket.priority = handler_response.priority
+                ticket.status = TicketStatus.RESOLVED
+
+                if handler_response.requires_escalation:
+                    ticket.status = TicketStatus.ESCALATED
+                    ticket.metadata["escalation_reason"] = handler_response.escalation_reason
+
+                self._maybe_trigger_chaos("Database", chaos_mode)
+                await self.ticket_service.update_ticket(ticket)
 
             # Get final token usage cost
             total_cost = await self.token_tracker.get_ticket_cost(ticket.id)
@@ -215,10 +319,12 @@ class Orchestrator:
                 requires_escalation=handler_response.requires_escalation,
                 escalation_reason=handler_response.escalation_reason,
                 cited_policies=handler_response.cited_policies,
+                from_cache=cached is not None,
             )
 
         except ChaosError:
             # Re-raise chaos errors without additional logging
+            await self._save_failed_classification(ticket)
             raise
 
         except Exception as e:
@@ -239,8 +345,185 @@ class Orchestrator:
                 error_message=str(e),
             )
 
+            await self._save_failed_classification(ticket)
             raise
 
+    async def _save_failed_classification(self, ticket: Ticket) -> None:
+        """Keep the classification of a ticket whose processing failed.
+
+        The ticket's other fields may already hold the unsaved reply, so only
+        its category and metadata are written.
+
+        Args:
+            ticket: Ticket being processed
+        """
+        if "classification_confidence" not in ticket.metadata:
+            return
+
+        try:
+            await self.ticket_service.save_classification(ticket)
+        except Exception as e:
+            logger.warning(
+                "classification_save_failed",
+                ticket_id=ticket.id,
+                error=str(e),
+            )
+
+    async def _generate_response(
+        self,
+        ticket: Ticket,
+        message: str,
+        chaos_mode: bool,
+        on_token: TokenCallback | None,
+    ) -> tuple[ClassificationResult, Any, Any]:
+        """Classify a message, route it and generate the handler's reply.
+
+        Args:
+            ticket: Ticket being processed
+            message: Customer message
+            chaos_mode: If True, randomly inject failures for testing
+            on_token: Optional callback for the streamed reply
+
+        Returns:
+            Tuple of (classification, handler, handler response)
+        """
+        # Speculatively search policies off the event loop while the classifier
+        # waits on the LLM; the result is used if the handler cites policies
+        policy_task = asyncio.create_task(
+            asyncio.to_thread(get_policy_service().search_policies, message)
+        )
+
+        try:
+            # Step 2: Classify the message. Short messages also get a draft
+            # reply in the same call, used if they turn out to be positive.
+            self._maybe_trigger_chaos("Classifier", chaos_mode)
+            fast_reply = None
+            if len(message) <= FAST_PATH_MAX_LENGTH:
+                classification, fast_reply = await self.classifier.process_and_respond(
+                    ticket_id=ticket.id,
+                    message=message,
+                )
+            else:
+                classification = await self.classifier.process(
+                    ticket_id=ticket.id,
+                    message=message,
+                )
+
+            use_fast_reply = (
+                fast_reply is not None
+                and classification.confidence >= FAST_PATH_MIN_CONFIDENCE
+            )
+
+            # Record the classification on the ticket; it is written with the
+            # response in a single update once the reply is ready
+            self._apply_classification(ticket, classification)
+
+            # Step 3: Route to appropriate handler
+            self._maybe_trigger_chaos("Router", chaos_mode)
+            handler = self._get_handler(classification.category)
+
+            # Log routing decision
+            await self.audit_service.log_action(
+                ticket_id=ticket.id,
+                agent_name="orchestrator",
+                action=AuditAction.ROUTE,
+                input_summary=f"category={classification.category.value}",
+                output_summary=f"handler={handler.name}",
+                decision_reasoning=(
+                    f"Routing to {handler.name} based on classification"
+                    + (" (reply drafted by classifier)" if use_fast_reply else "")
+                ),
+                confidence_score=classification.confidence,
+                success=True,
+            )
+
+            # Step 4: Generate response
+            self._maybe_trigger_chaos(handler.name, chaos_mode)
+            if use_fast_reply:
+                handler_response = HandlerResponse(
+                    response=fast_reply,
+                    priority=TicketPriority.MINIMAL,
+                )
+                if on_token is not None:
+                    on_token(fast_reply)
+            else:
+                handler_kwargs: dict[str, Any] = {}
+                if handler.uses_policies:
+                    handler_kwargs["policies"] = await policy_task
+
+                handler_response = await handler.process(
+                    ticket_id=ticket.id,
+                    message=message,
+                    on_token=on_token,
+                    **handler_kwargs,
+                )
+
+            return classification, handler, handler_response
+        finally:
+            # Not needed on the fast path or after a failure
+            if not policy_task.done():
+                policy_task.cancel()
+            elif not policy_task.cancelled():
+                policy_task.exception()
+
+    async def _replay_cached(
+        self,
+        ticket: Ticket,
+        cached: CachedResponse,
+        chaos_mode: bool,
+        on_token: TokenCallback | None,
+    ) -> tuple[ClassificationResult, Any, Any]:
+        """Reuse the reply generated for an identical earlier message.
+
+        The chaos checks of the skipped steps still run, so cached replies
+        fail as often as generated ones in chaos mode.
+
+        Args:
+            ticket: Ticket being processed
+            cached: Cached classification and reply
+            chaos_mode: If True, randomly inject failures for testing
+            on_token: Optional callback for the reply text
+
+        Returns:
+            Tuple of (classification, handler, handler response)
+        """
+        classification = cached.classification
+        self._maybe_trigger_chaos("Classifier", chaos_mode)
+        self._apply_classification(ticket, classification)
+        ticket.metadata["response_cached"] = True
+
+        self._maybe_trigger_chaos("Router", chaos_mode)
+        handler = self._get_handler(classification.category)
+        self._maybe_trigger_chaos(handler.name, chaos_mode)
+
+        await self.audit_service.log_action(
+            ticket_id=ticket.id,
+            agent_name="response_cache",
+            action=AuditAction.RESPOND,
+            input_summary=f"category={classification.category.value}",
+            output_summary=f"handler={cached.handler_name}",
+            decision_reasoning="Reused the reply generated for an identical earlier message",
+            confidence_score=classification.confidence,
+            success=True,
+        )
+
+        if on_token is not None:
+            on_token(cached.handler_response.response)
+
+        return classification, handler, cached.handler_response
+
+    @staticmethod
+    def _apply_classification(ticket: Ticket, classification: ClassificationResult) -> None:
+        """Copy classification details onto a ticket.
+
+        Args:
+            ticket: Ticket to update
+            classification: Classification result
+        """
+        ticket.category = classification.category
+        ticket.metadata["classification_confidence"] = classification.confidence
+        ticket.metadata["classification_reasoning"] = classification.reasoning
+
     async def get_ticket_details(self, ticket_id: str) -> dict:
         """Get full details for a ticket including audit trail and costs.
 
@@ -250,10 +533,13 @@ class Orchestrator:
         Returns:
             Dictionary with ticket details
         """
-        ticket = await self.ticket_service.get_ticket(ticket_id)
-        audit_trail = await self.audit_service.get_ticket_audit_trail(ticket_id)
-        usage_records = await self.token_tracker.get_ticket_usage(ticket_id)
-        total_cost = await self.token_tracker.get_ticket_cost(ticket_id)
+        # Independent reads, served concurrently by the read pool
+        ticket, audit_trail, usage_records, total_cost = await asyncio.gather(
+            self.ticket_service.get_ticket(ticket_id),
+            self.audit_service.get_ticket_audit_trail(ticket_id),
+            self.token_tracker.get_ticket_usage(ticket_id),
+            self.token_tracker.get_ticket_cost(ticket_id),
+        )
 
         return {
             "ticket": ticket.to_dict(),
@@ -268,14 +554,17 @@ class Orchestrator:
         Returns:
             Dictionary with statistics
         """
-        ticket_stats = await self.ticket_service.get_statistics()
-        audit_stats = await self.audit_service.get_statistics()
-        usage_summary = await self.token_tracker.get_summary()
-        cost_by_agent = await self.token_tracker.get_cost_by_agent()
+        ticket_stats, audit_stats, usage = await asyncio.gather(
+            self.ticket_service.get_statistics(),
+            self.audit_service.get_statistics(),
+            self.token_tracker.get_aggregates(),
+        )
+        usage_summary, cost_by_agent, _, _ = usage
 
         return {
             "tickets": ticket_stats,
             "audit": audit_stats,
             "usage": usage_summary,
             "cost_by_agent": cost_by_agent,
+            "policy_search_cache": get_policy_service().search_cache_info(),
         }
@@ -2,26 +2,13 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import List
-
 from .base_agent import BaseAgent
+from .types import HandlerResponse
+from ..llm.client import TokenCallback
 from ..llm.prompts import POSITIVE_HANDLER_SYSTEM_PROMPT
-from ..services.policy_service import Policy
 from ..utils.enums import AuditAction, TicketPriority
 
 
-@dataclass
-class HandlerResponse:
-    """Response from a handler agent."""
-
-    response: str
-    priority: TicketPriority
-    requires_escalation: bool = False
-    escalation_reason: str | None = None
-    cited_policies: List[Policy] = field(default_factory=list)
-
-
 class PositiveHandler(BaseAgent):
     """Agent that handles positive customer feedback."""
 
@@ -35,12 +22,18 @@ class PositiveHandler(BaseAgent):
         """Get the system prompt."""
         return POSITIVE_HANDLER_SYSTEM_PROMPT
 
-    async def process(self, ticket_id: str, message: str) -> HandlerResponse:
+    async def process(
+        self,
+        ticket_id: str,
+        message: str,
+        on_token: TokenCallback | None = None,
+    ) -> HandlerResponse:
         """Generate a response to positive feedback.
 
         Args:
             ticket_id: Associated ticket ID
             message: Customer message
+            on_token: Optional callback to stream the response through
 
         Returns:
             HandlerResponse with the generated response
@@ -56,6 +49,7 @@ class PositiveHandler(BaseAgent):
             action=AuditAction.RESPOND,
             max_tokens=512,
             temperature=0.7,
+            on_token=on_token,
         )
 
         self.logger.info(
@@ -2,30 +2,37 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import asyncio
 from typing import List
 
 from .base_agent import BaseAgent
+from .types import HandlerResponse
 from ..db.repositories.ticket_repository import TicketRepository
 from ..db.models import Ticket
+from ..llm.client import TokenCallback
 from ..llm.prompts import QUERY_HANDLER_SYSTEM_PROMPT
 from ..services.policy_service import Policy, get_policy_service
 from ..utils.enums import AuditAction, TicketPriority
+from ..utils.text import compile_keyword_pattern
 
 
-@dataclass
-class HandlerResponse:
-    """Response from a handler agent."""
+class QueryHandler(BaseAgent):
+    """Agent that handles customer queries and questions."""
 
-    response: str
-    priority: TicketPriority
-    requires_escalation: bool = False
-    escalation_reason: str | None = None
-    cited_policies: List[Policy] = field(default_factory=list)
+    uses_policies = True
 
+    # Keywords that mark a query as higher priority
+    HIGHER_PRIORITY_KEYWORDS = [
+        "how do i transfer",
+        "wire transfer",
+        "international",
+        "investment",
+        "mortgage",
+        "loan application",
+        "account opening",
+    ]
 
-class QueryHandler(BaseAgent):
-    """Agent that handles customer queries and questions."""
+    _HIGHER_PRIORITY_RE = compile_keyword_pattern(HIGHER_PRIORITY_KEYWORDS)
 
     def __init__(self, *args, **kwargs):
         """Initialize the query handler."""
@@ -51,34 +58,36 @@ class QueryHandler(BaseAgent):
         Returns:
             Formatted context string for the LLM
         """
-        # Get previous tickets for this customer
-        previous_tickets: List[Ticket] = await self.ticket_repo.get_by_customer(
-            ticket.customer_id
+        # Most recent previous tickets, filtered and limited in SQL
+        history = await self.ticket_repo.get_recent_by_customer(
+            ticket.customer_id, exclude_ticket_id=ticket.id, limit=5, preview_length=100
         )
 
-        # Filter out current ticket and limit to recent history
-        history = [t for t in previous_tickets if t.id != ticket.id][:5]
-
         if not history:
             return ""
 
-        context_lines = ["[Previous interactions with this customer:]"]
-        for prev_ticket in history:
-            category = prev_ticket.category.value if prev_ticket.category else "unknown"
-            status = prev_ticket.status.value if prev_ticket.status else "unknown"
-            context_lines.append(
-                f"- [{category.upper()}] {prev_ticket.customer_message[:100]}..."
-                f" (Status: {status})"
-            )
-
-        return "\n".join(context_lines)
-
-    async def process(self, ticket_id: str, message: str) -> HandlerResponse:
+        return "\n".join([
+            "[Previous interactions with this customer:]",
+            *[
+                f"- [{category.value.upper()}] {preview}... (Status: {status.value})"
+                for category, status, preview in history
+            ],
+        ])
+
+    async def process(
+        self,
+        ticket_id: str,
+        message: str,
+        policies: List[Policy] | None = None,
+        on_token: TokenCallback | None = None,
+    ) -> HandlerResponse:
         """Generate a response to a customer query.
 
         Args:
             ticket_id: Associated ticket ID
             message: Customer message
+            policies: Pre-fetched relevant policies (searched here if None)
+            on_token: Optional callback to stream the response through
 
         Returns:
             HandlerResponse with the generated response
@@ -88,27 +97,41 @@ class QueryHandler(BaseAgent):
             ticket_id=ticket_id,
         )
 
-        # Look up the ticket from the database
-        ticket = await self.ticket_repo.get_by_id(ticket_id)
-
-        self.logger.debug(
-            "ticket_retrieved",
-            ticket_id=ticket_id,
-            customer_id=ticket.customer_id,
-            category=ticket.category.value if ticket.category else None,
+        # Policy search doesn't depend on the ticket, so run it in a worker
+        # thread while the ticket and customer history are fetched
+        policy_service = get_policy_service()
+        policy_task = (
+            None
+            if policies is not None
+            else asyncio.create_task(
+                asyncio.to_thread(policy_service.search_policies, message)
+            )
         )
 
-        # Determine priority based on query type
-        priority = self._determine_priority(message)
+        try:
+            # Look up the ticket from the database
+            ticket = await self.ticket_repo.get_by_id(ticket_id)
 
-        # Build context from customer history
-        customer_context = await self._get_customer_context(ticket)
+            self.logger.debug(
+                "ticket_retrieved",
+                ticket_id=ticket_id,
+                customer_id=ticket.customer_id,
+                category=ticket.category.value if ticket.category else None,
+            )
 
-        # Search for relevant policies
-        policy_service = get_policy_service()
-        relevant_policies = policy_service.search_policies(message)
+            # Build context from customer history
+            customer_context = await self._get_customer_context(ticket)
+        except BaseException:
+            if policy_task is not None:
+                policy_task.cancel()
+            raise
+
+        relevant_policies = policies if policy_task is None else await policy_task
         policy_context = policy_service.format_policies_for_prompt(relevant_policies)
 
+        # Determine priority based on query type
+        priority = self._determine_priority(message)
+
         # Build enhanced message with context
         context_parts = []
         if customer_context:
@@ -132,6 +155,7 @@ class QueryHandler(BaseAgent):
             action=AuditAction.RESPOND,
             max_tokens=512,
             temperature=0.7,
+            on_token=on_token,
         )
 
         self.logger.info(
@@ -146,7 +170,7 @@ class QueryHandler(BaseAgent):
             response=response.content,
             priority=priority,
             requires_escalation=False,
-            cited_policies=relevant_policies,
+            cited_policies=tuple(relevant_policies),
         )
 
     def _determine_priority(self, message: str) -> TicketPriority:
@@ -158,22 +182,9 @@ class QueryHandler(BaseAgent):
         Returns:
             Appropriate TicketPriority
         """
-        message_lower = message.lower()
-
         # Higher priority queries
-        higher_priority_keywords = [
-            "how do i transfer",
-            "wire transfer",
-            "international",
-            "investment",
-            "mortgage",
-            "loan application",
-            "account opening",
-        ]
-
-        for keyword in higher_priority_keywords:
-            if keyword in message_lower:
-                return TicketPriority.MEDIUM  # Priority 3
+        if self._HIGHER_PRIORITY_RE.search(message):
+            return TicketPriority.MEDIUM  # Priority 3
 
         # Default to low priority for simple informational queries
         return TicketPriority.LOW  # Priority 4
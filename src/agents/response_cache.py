@@ -0,0 +1,101 @@
+"""In-process cache of generated replies for repeated customer messages."""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from .classifier_agent import ClassificationResult
+from .types import HandlerResponse
+
+# Maximum number of cached replies kept (least recently used are evicted)
+CACHE_MAX_ENTRIES = 4096
+
+
+@dataclass
+class CachedResponse:
+    """A classification and reply generated for an earlier message."""
+
+    classification: ClassificationResult
+    handler_name: str
+    handler_response: HandlerResponse
+
+
+class ResponseCache:
+    """LRU cache of replies keyed by normalized message and policy version."""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries to keep
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, CachedResponse] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(message: str, policy_version: str) -> bytes:
+        """Build the cache key for a message.
+
+        Messages differing only in case or whitespace share a key. The policy
+        version is part of the key so replies citing old policies are not
+        served after the policy file changes.
+
+        Args:
+            message: Customer message
+            policy_version: Version of the loaded policies
+
+        Returns:
+            16-byte digest
+        """
+        normalized = " ".join(message.lower().split())
+        return hashlib.blake2b(
+            f"{policy_version}\0{normalized}".encode("utf-8"),
+            digest_size=16,
+        ).digest()
+
+    def get(self, message: str, policy_version: str) -> CachedResponse | None:
+        """Look up the cached reply for a message.
+
+        Args:
+            message: Customer message
+            policy_version: Version of the loaded policies
+
+        Returns:
+            The cached entry, or None on a miss
+        """
+        key = self.make_key(message, policy_version)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, message: str, policy_version: str, entry: CachedResponse) -> None:
+        """Cache the reply generated for a message.
+
+        Args:
+            message: Customer message
+            policy_version: Version of the loaded policies
+            entry: Classification and reply to cache
+        """
+        key = self.make_key(message, policy_version)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        """Get the number of cached entries."""
+        return len(self._entries)
@@ -0,0 +1,20 @@
+"""Types shared by the handler agents."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Tuple
+
+from ..services.policy_service import Policy
+from ..utils.enums import TicketPriority
+
+
+@dataclass(frozen=True, slots=True)
+class HandlerResponse:
+    """Response from a handler agent."""
+
+    response: str
+    priority: TicketPriority
+    requires_escalation: bool = False
+    escalation_reason: str | None = None
+    cited_policies: Tuple[Policy, ...] = ()
@@ -1,8 +1,9 @@
 """Configuration management using pydantic-settings."""
 
-from functools import lru_cache
+import sys
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Mapping, Optional
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -10,6 +11,25 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 from .utils.enums import LLMProvider
 
 
+@lru_cache(maxsize=1)
+def _load_streamlit_secrets() -> Mapping[str, Any]:
+    """Load Streamlit Cloud secrets once.
+
+    Streamlit is only consulted when it has already been imported, i.e. when
+    running inside a Streamlit app. Other processes never pay its import.
+
+    Returns:
+        The secrets mapping, or an empty dict if unavailable
+    """
+    st = sys.modules.get("streamlit")
+    if st is None:
+        return {}
+    try:
+        return dict(st.secrets)
+    except Exception:
+        return {}
+
+
 def _get_streamlit_secret(key: str) -> Optional[str]:
     """Try to get a secret from Streamlit Cloud secrets.
 
@@ -19,13 +39,7 @@ def _get_streamlit_secret(key: str) -> Optional[str]:
     Returns:
         The secret value if found, None otherwise
     """
-    try:
-        import streamlit as st
-        if hasattr(st, "secrets") and key in st.secrets:
-            return st.secrets[key]
-    except Exception:
-        pass
-    return None
+    return _load_streamlit_secrets().get(key)
 
 
 class Settings(BaseSettings):
@@ -36,6 +50,8 @@ class Settings(BaseSettings):
         env_file_encoding="utf-8",
         case_sensitive=False,
         extra="ignore",
+        # Immutable so the derived values below can be cached
+        frozen=True,
     )
 
     # Application
@@ -53,9 +69,15 @@ class Settings(BaseSettings):
     anthropic_api_key: Optional[str] = Field(default=None)
     anthropic_model: str = Field(default="claude-3-haiku-20240307")
 
+    # Maximum LLM requests in flight at once, to stay under provider rate limits
+    llm_max_concurrency: int = Field(default=8, ge=1)
+
     # Database
     database_path: str = Field(default="data/supportflow.db")
 
+    # Session persistence (optional, requires the redis package)
+    redis_url: Optional[str] = Field(default=None)
+
     # Logging
     log_level: str = Field(default="INFO")
     log_format: str = Field(default="json")
@@ -78,19 +100,19 @@ class Settings(BaseSettings):
             raise ValueError(f"Invalid log format: {v}. Must be one of {valid_formats}")
         return v.lower()
 
-    @property
+    @cached_property
     def database_path_resolved(self) -> Path:
         """Get the resolved database path."""
         return Path(self.database_path)
 
-    @property
+    @cached_property
     def active_api_key(self) -> Optional[str]:
         """Get the API key for the active provider."""
         if self.llm_provider == LLMProvider.OPENAI:
             return self.openai_api_key
         return self.anthropic_api_key
 
-    @property
+    @cached_property
     def active_model(self) -> str:
         """Get the model name for the active provider."""
         if self.llm_provider == LLMProvider.OPENAI:
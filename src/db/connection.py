@@ -5,7 +5,7 @@ from __future__ import annotations
 import asyncio
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import AsyncIterator
+from typing import Any, AsyncIterator, Callable, Sequence, TypeVar
 
 import aiosqlite
 
@@ -13,19 +13,54 @@ from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
+# Builds a result object from a raw row tuple, e.g. Ticket.from_row
+RowFactory = Callable[[Sequence[Any]], T]
+
+# Per-connection tuning: WAL lets readers proceed during writes, and with
+# synchronous=NORMAL commits only fsync at checkpoints rather than per write
+CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -64000",
+    "PRAGMA mmap_size = 268435456",
+)
+
+# Prepared statements kept per connection by the sqlite3 driver. All SQL in
+# the repositories is constant text, so every statement is parsed once.
+STATEMENT_CACHE_SIZE = 256
+
+# Number of read-only connections used for queries on file databases
+DEFAULT_READ_POOL_SIZE = 4
 
 class DatabaseConnection:
-    """Async SQLite connection manager."""
+    """Async SQLite connection manager.
 
-    def __init__(self, db_path: str | Path):
+    Writes go through a single connection guarded by a lock so commits never
+    interleave. Reads use a pool of read-only connections, which WAL mode lets
+    run alongside writes; in-memory databases are private to one connection,
+    so they read from the writer instead.
+    """
+
+    def __init__(self, db_path: str | Path, read_pool_size: int = DEFAULT_READ_POOL_SIZE):
         """Initialize the connection manager.
 
         Args:
             db_path: Path to the SQLite database file
+            read_pool_size: Number of read-only connections to open
         """
         self.db_path = Path(db_path)
+        self.read_pool_size = 0 if str(db_path) == ":memory:" else read_pool_size
         self._connection: aiosqlite.Connection | None = None
+        self._readers: list[aiosqlite.Connection] = []
+        self._read_pool: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
         self._lock = asyncio.Lock()
+        # Task that holds the open transaction(), if any
+        self._transaction_owner: asyncio.Task | None = None
 
     async def initialize(self) -> None:
         """Initialize the database connection and create directories if needed."""
@@ -33,16 +68,39 @@ class DatabaseConnection:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Connect to database
-        self._connection = await aiosqlite.connect(self.db_path)
-        self._connection.row_factory = aiosqlite.Row
+        self._connection = await self._connect()
+
+        for _ in range(self.read_pool_size):
+            reader = await self._connect()
+            await reader.execute("PRAGMA query_only = ON")
+            self._readers.append(reader)
+            self._read_pool.put_nowait(reader)
+
+        logger.info(
+            "database_connected",
+            path=str(self.db_path),
+            read_pool_size=self.read_pool_size,
+        )
+
+    async def _connect(self) -> aiosqlite.Connection:
+        """Open a connection with the standard pragmas applied."""
+        connection = await aiosqlite.connect(
+            self.db_path, cached_statements=STATEMENT_CACHE_SIZE
+        )
+        connection.row_factory = aiosqlite.Row
 
-        # Enable foreign keys
-        await self._connection.execute("PRAGMA foreign_keys = ON")
+        for pragma in CONNECTION_PRAGMAS:
+            await connection.execute(pragma)
 
-        logger.info("database_connected", path=str(self.db_path))
+        return connection
 
     async def close(self) -> None:
         """Close the database connection."""
+        for reader in self._readers:
+            await reader.close()
+        self._readers.clear()
+        self._read_pool = asyncio.Queue()
+
         if self._connection:
             await self._connection.close()
             self._connection = None
@@ -59,16 +117,77 @@ class DatabaseConnection:
     async def transaction(self) -> AsyncIterator[aiosqlite.Connection]:
         """Context manager for database transactions.
 
+        execute() and execute_many() calls made inside the block join the
+        transaction instead of committing on their own, and reads see its
+        uncommitted writes. The transaction is opened with BEGIN IMMEDIATE,
+        so DDL statements are included and the write lock is taken up front.
+
+        A transaction() opened inside another one by the same task joins the
+        enclosing transaction, so repository methods can group their own statements
+        whether or not the caller already opened one.
+
         Yields:
             The database connection within a transaction
         """
+        if self._in_transaction():
+            yield self.connection
+            return
+
         async with self._lock:
+            self._transaction_owner = asyncio.current_task()
             try:
+                await self.connection.execute("BEGIN IMMEDIATE")
                 yield self.connection
                 await self.connection.commit()
-            except Exception:
+            except BaseException:
+                # Includes cancellation, which would otherwise leave the
+                # writer inside an open transaction
                 await self.connection.rollback()
                 raise
+            finally:
+                self._transaction_owner = None
+
+    def _in_transaction(self) -> bool:
+        """Check whether the current task holds the open transaction().
+
+        Tasks started inside the block are not the owner, so their writes
+        wait for the lock and their reads use the pool as usual.
+        """
+        return (
+            self._transaction_owner is not None
+            and self._transaction_owner is asyncio.current_task()
+        )
+
+    @asynccontextmanager
+    async def _writer(self) -> AsyncIterator[bool]:
+        """Hold the write lock unless the current task is already in a transaction.
+
+        Yields:
+            True if the caller should commit its own statement
+        """
+        if self._in_transaction():
+            yield False
+        else:
+            async with self._lock:
+                yield True
+
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a read connection from the pool.
+
+        Yields:
+            A read-only connection, or the writer when there is no pool or
+            the current task is in a transaction
+        """
+        if not self._readers or self._in_transaction():
+            yield self.connection
+            return
+
+        reader = await self._read_pool.get()
+        try:
+            yield reader
+        finally:
+            self._read_pool.put_nowait(reader)
 
     async def execute(
         self,
@@ -84,9 +203,10 @@ class DatabaseConnection:
         Returns:
             The cursor after execution
         """
-        async with self._lock:
+        async with self._writer() as autocommit:
             cursor = await self.connection.execute(sql, parameters or ())
-            await self.connection.commit()
+            if autocommit:
+                await self.connection.commit()
             return cursor
 
     async def execute_many(
@@ -100,54 +220,129 @@ class DatabaseConnection:
             sql: SQL statement to execute
             parameters: List of parameter tuples/dicts
         """
-        async with self._lock:
+        async with self._writer() as autocommit:
             await self.connection.executemany(sql, parameters)
-            await self.connection.commit()
+            if autocommit:
+                await self.connection.commit()
+
+    async def execute_returning(
+        self,
+        sql: str,
+        parameters: tuple | dict | None = None,
+    ) -> list[aiosqlite.Row]:
+        """Execute a write statement with a RETURNING clause.
+
+        Args:
+            sql: SQL statement to execute
+            parameters: Query parameters
+
+        Returns:
+            The rows produced by the RETURNING clause
+        """
+        async with self._writer() as autocommit:
+            cursor = await self.connection.execute(sql, parameters or ())
+            # Step the statement to completion before committing
+            rows = await cursor.fetchall()
+            if autocommit:
+                await self.connection.commit()
+            return rows
+
+    async def executescript(self, sql: str) -> None:
+        """Execute a multi-statement SQL script in a single call.
+
+        sqlite3 commits any pending transaction before running a script, so
+        this must not be called inside transaction(). Scripts that need to be
+        atomic should contain their own BEGIN/COMMIT; a failed script is
+        rolled back.
+
+        Args:
+            sql: SQL statements separated by semicolons
+
+        Raises:
+            RuntimeError: If called inside transaction()
+        """
+        if self._in_transaction():
+            raise RuntimeError("executescript() cannot run inside transaction()")
+
+        async with self._lock:
+            try:
+                await self.connection.executescript(sql)
+            except Exception:
+                await self.connection.rollback()
+                raise
 
     async def fetch_one(
         self,
         sql: str,
         parameters: tuple | dict | None = None,
-    ) -> aiosqlite.Row | None:
+        row_factory: RowFactory[T] | None = None,
+    ) -> aiosqlite.Row | T | None:
         """Fetch a single row.
 
         Args:
             sql: SQL query
             parameters: Query parameters
+            row_factory: Builds the result from the raw row tuple instead of
+                returning an aiosqlite.Row
 
         Returns:
             The row or None if not found
         """
-        async with self._lock:
-            cursor = await self.connection.execute(sql, parameters or ())
+        async with self._reader() as connection:
+            cursor = await connection.execute(sql, parameters or ())
+            _set_row_factory(cursor, row_factory)
             return await cursor.fetchone()
 
     async def fetch_all(
         self,
         sql: str,
         parameters: tuple | dict | None = None,
-    ) -> list[aiosqlite.Row]:
+        row_factory: RowFactory[T] | None = None,
+    ) -> list[aiosqlite.Row] | list[T]:
         """Fetch all rows.
 
         Args:
             sql: SQL query
             parameters: Query parameters
+            row_factory: Builds each result from the raw row tuple instead of
+                returning aiosqlite.Row objects
 
         Returns:
             List of rows
         """
-        async with self._lock:
-            cursor = await self.connection.execute(sql, parameters or ())
+        async with self._reader() as connection:
+            if row_factory is None:
+                # Execute and fetch in one hop to the connection's thread
+                return list(await connection.execute_fetchall(sql, parameters or ()))
+
+            cursor = await connection.execute(sql, parameters or ())
+            _set_row_factory(cursor, row_factory)
             return await cursor.fetchall()
 
 
+def _set_row_factory(cursor: aiosqlite.Cursor, row_factory: RowFactory[Any] | None) -> None:
+    """Have the driver build rows with row_factory as they are fetched.
+
+    The factory then runs on the connection's worker thread during the fetch,
+    and no intermediate aiosqlite.Row is created for each row.
+    """
+    if row_factory is not None:
+        cursor.row_factory = lambda _cursor, row: row_factory(row)
+
+
 # Global connection instance
 _db_connection: DatabaseConnection | None = None
 
+# Serializes first-time initialization of the global connection
+_db_init_lock = asyncio.Lock()
+
 
 async def get_database(db_path: str | Path | None = None) -> DatabaseConnection:
     """Get or create the database connection.
 
+    Concurrent first calls share one connection, and the connection is only
+    published once it has initialized successfully.
+
     Args:
         db_path: Optional path to database (only used on first call)
 
@@ -156,14 +351,19 @@ async def get_database(db_path: str | Path | None = None) -> DatabaseConnection:
     """
     global _db_connection
 
-    if _db_connection is None:
-        if db_path is None:
-            from ..config import get_settings
+    if _db_connection is not None:
+        return _db_connection
+
+    async with _db_init_lock:
+        if _db_connection is None:
+            if db_path is None:
+                from ..config import get_settings
 
-            db_path = get_settings().database_path
+                db_path = get_settings().database_path
 
-        _db_connection = DatabaseConnection(db_path)
-        await _db_connection.initialize()
+            connection = DatabaseConnection(db_path)
+            await connection.initialize()
+            _db_connection = connection
 
     return _db_connection
 
@@ -1,10 +1,16 @@
 """Database schema migrations."""
 
 from .connection import DatabaseConnection
+from .models import now, to_epoch_ms
+from .repositories.usage_repository import UPSERT_MODEL_PRICING_SQL
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Schema version recorded in PRAGMA user_version once migrations complete.
+# Bump this whenever the DDL below changes so existing databases re-migrate.
+SCHEMA_VERSION = 6
+
 # SQL statements for creating tables
 CREATE_TICKETS_TABLE = """
 CREATE TABLE IF NOT EXISTS tickets (
@@ -17,9 +23,9 @@ CREATE TABLE IF NOT EXISTS tickets (
     agent_response TEXT,
     handler_agent TEXT,
     metadata TEXT DEFAULT '{}',
-    created_at TEXT NOT NULL,
-    updated_at TEXT NOT NULL,
-    resolved_at TEXT
+    created_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    resolved_at INTEGER
 );
 """
 
@@ -36,7 +42,7 @@ CREATE TABLE IF NOT EXISTS audit_logs (
     duration_ms INTEGER DEFAULT 0,
     success INTEGER DEFAULT 1,
     error_message TEXT,
-    created_at TEXT NOT NULL,
+    created_at INTEGER NOT NULL,
     FOREIGN KEY (ticket_id) REFERENCES tickets(id)
 );
 """
@@ -53,7 +59,7 @@ CREATE TABLE IF NOT EXISTS token_usage (
     input_cost_usd REAL DEFAULT 0.0,
     output_cost_usd REAL DEFAULT 0.0,
     cached_tokens INTEGER DEFAULT 0,
-    created_at TEXT NOT NULL,
+    created_at INTEGER NOT NULL,
     FOREIGN KEY (ticket_id) REFERENCES tickets(id)
 );
 """
@@ -65,24 +71,154 @@ CREATE TABLE IF NOT EXISTS model_pricing (
     input_cost_per_1k REAL NOT NULL,
     output_cost_per_1k REAL NOT NULL,
     cached_input_cost_per_1k REAL DEFAULT 0.0,
-    updated_at TEXT NOT NULL
+    updated_at INTEGER NOT NULL
+);
+"""
+
+# Running per-agent and per-model totals of token_usage, kept up to date by
+# UsageRepository so usage aggregates don't rescan the whole table
+CREATE_USAGE_AGG_BY_AGENT_TABLE = """
+CREATE TABLE IF NOT EXISTS usage_agg_by_agent (
+    agent_name TEXT PRIMARY KEY,
+    requests INTEGER NOT NULL DEFAULT 0,
+    input_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    input_cost_usd REAL NOT NULL DEFAULT 0.0,
+    output_cost_usd REAL NOT NULL DEFAULT 0.0,
+    cached_tokens INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+CREATE_USAGE_AGG_BY_MODEL_TABLE = """
+CREATE TABLE IF NOT EXISTS usage_agg_by_model (
+    model_name TEXT PRIMARY KEY,
+    requests INTEGER NOT NULL DEFAULT 0,
+    input_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    input_cost_usd REAL NOT NULL DEFAULT 0.0,
+    output_cost_usd REAL NOT NULL DEFAULT 0.0,
+    cached_tokens INTEGER NOT NULL DEFAULT 0
 );
 """
 
 # Indexes for common queries
 CREATE_INDEXES = [
-    "CREATE INDEX IF NOT EXISTS idx_tickets_customer_id ON tickets(customer_id);",
-    "CREATE INDEX IF NOT EXISTS idx_tickets_status ON tickets(status);",
-    "CREATE INDEX IF NOT EXISTS idx_tickets_category ON tickets(category);",
+    "CREATE INDEX IF NOT EXISTS idx_tickets_customer_created ON tickets(customer_id, created_at DESC);",
+    "CREATE INDEX IF NOT EXISTS idx_tickets_status_created ON tickets(status, created_at DESC);",
+    "CREATE INDEX IF NOT EXISTS idx_tickets_category_created ON tickets(category, created_at DESC);",
     "CREATE INDEX IF NOT EXISTS idx_tickets_created_at ON tickets(created_at);",
-    "CREATE INDEX IF NOT EXISTS idx_audit_logs_ticket_id ON audit_logs(ticket_id);",
-    "CREATE INDEX IF NOT EXISTS idx_audit_logs_agent_name ON audit_logs(agent_name);",
+    "CREATE INDEX IF NOT EXISTS idx_audit_logs_ticket_created ON audit_logs(ticket_id, created_at);",
+    "CREATE INDEX IF NOT EXISTS idx_audit_logs_agent_created ON audit_logs(agent_name, created_at DESC);",
+    "CREATE INDEX IF NOT EXISTS idx_audit_logs_action_created ON audit_logs(action, created_at DESC);",
+    "CREATE INDEX IF NOT EXISTS idx_audit_logs_failures ON audit_logs(created_at DESC) WHERE success = 0;",
     "CREATE INDEX IF NOT EXISTS idx_audit_logs_created_at ON audit_logs(created_at);",
-    "CREATE INDEX IF NOT EXISTS idx_token_usage_ticket_id ON token_usage(ticket_id);",
-    "CREATE INDEX IF NOT EXISTS idx_token_usage_agent_name ON token_usage(agent_name);",
+    # Carries the cost columns so per-ticket cost totals are index-only
+    "CREATE INDEX IF NOT EXISTS idx_token_usage_ticket_cost ON token_usage(ticket_id, created_at, input_cost_usd, output_cost_usd);",
+    "CREATE INDEX IF NOT EXISTS idx_token_usage_agent_created ON token_usage(agent_name, created_at DESC);",
     "CREATE INDEX IF NOT EXISTS idx_token_usage_created_at ON token_usage(created_at);",
 ]
 
+# Indexes superseded by the ones above (each is a prefix of a composite index)
+DROP_INDEXES = [
+    "DROP INDEX IF EXISTS idx_token_usage_ticket_created;",
+    "DROP INDEX IF EXISTS idx_tickets_customer_id;",
+    "DROP INDEX IF EXISTS idx_tickets_status;",
+    "DROP INDEX IF EXISTS idx_tickets_category;",
+    "DROP INDEX IF EXISTS idx_audit_logs_ticket_id;",
+    "DROP INDEX IF EXISTS idx_audit_logs_agent_name;",
+    "DROP INDEX IF EXISTS idx_token_usage_ticket_id;",
+    "DROP INDEX IF EXISTS idx_token_usage_agent_name;",
+]
+
+# All schema DDL as one atomic script, so it runs in a single call
+SCHEMA_SCRIPT = "\n".join([
+    "BEGIN IMMEDIATE;",
+    CREATE_TICKETS_TABLE,
+    CREATE_AUDIT_LOGS_TABLE,
+    CREATE_TOKEN_USAGE_TABLE,
+    CREATE_MODEL_PRICING_TABLE,
+    CREATE_USAGE_AGG_BY_AGENT_TABLE,
+    CREATE_USAGE_AGG_BY_MODEL_TABLE,
+    *DROP_INDEXES,
+    *CREATE_INDEXES,
+    "COMMIT;",
+])
+
+# Timestamp columns per table. Before schema version 4 they held ISO-8601
+# TEXT; they now hold INTEGER milliseconds since the Unix epoch.
+TIMESTAMP_COLUMNS = {
+    "tickets": ("created_at", "updated_at", "resolved_at"),
+    "audit_logs": ("created_at",),
+    "token_usage": ("created_at",),
+    "model_pricing": ("updated_at",),
+}
+
+CREATE_TABLES = {
+    "tickets": CREATE_TICKETS_TABLE,
+    "audit_logs": CREATE_AUDIT_LOGS_TABLE,
+    "token_usage": CREATE_TOKEN_USAGE_TABLE,
+    "model_pricing": CREATE_MODEL_PRICING_TABLE,
+}
+
+
+def _build_timestamp_conversion_script() -> str:
+    """Build the script rewriting ISO TEXT timestamps as epoch milliseconds.
+
+    SQLite can't change a column's type in place, so each table is rebuilt:
+    created under a temporary name with the current DDL, filled from the old
+    table with its timestamps converted, then swapped in. Foreign key
+    enforcement is off while tables are swapped; run_migrations restores it.
+    """
+    statements = ["PRAGMA foreign_keys = OFF;", "BEGIN IMMEDIATE;"]
+    for table, create_sql in CREATE_TABLES.items():
+        new_table = f"{table}_new"
+        columns = [
+            f"CAST(ROUND((julianday({column}) - 2440587.5) * 86400000) AS INTEGER)"
+            if column in TIMESTAMP_COLUMNS[table]
+            else column
+            for column in _table_columns(create_sql)
+        ]
+        statements += [
+            create_sql.replace(f"IF NOT EXISTS {table} (", f"{new_table} ("),
+            f"INSERT INTO {new_table} SELECT {', '.join(columns)} FROM {table};",
+            f"DROP TABLE {table};",
+            f"ALTER TABLE {new_table} RENAME TO {table};",
+        ]
+    statements.append("COMMIT;")
+    return "\n".join(statements)
+
+
+def _table_columns(create_sql: str) -> list[str]:
+    """Get the column names, in order, from a CREATE TABLE statement."""
+    body = create_sql[create_sql.index("(") + 1 : create_sql.rindex(")")]
+    return [
+        line.split()[0]
+        for line in body.strip().splitlines()
+        if not line.strip().startswith("FOREIGN KEY")
+    ]
+
+
+TIMESTAMP_CONVERSION_SCRIPT = _build_timestamp_conversion_script()
+
+# Recompute the usage rollups from token_usage, for databases created before
+# the rollup tables existed
+REBUILD_USAGE_ROLLUPS_SQL = [
+    "DELETE FROM usage_agg_by_agent",
+    """
+    INSERT INTO usage_agg_by_agent
+    SELECT agent_name, COUNT(*), SUM(input_tokens), SUM(output_tokens),
+           SUM(input_cost_usd), SUM(output_cost_usd), SUM(cached_tokens)
+    FROM token_usage GROUP BY agent_name
+    """,
+    "DELETE FROM usage_agg_by_model",
+    """
+    INSERT INTO usage_agg_by_model
+    SELECT model_name, COUNT(*), SUM(input_tokens), SUM(output_tokens),
+           SUM(input_cost_usd), SUM(output_cost_usd), SUM(cached_tokens)
+    FROM token_usage GROUP BY model_name
+    """,
+]
+
 # Default model pricing data
 DEFAULT_MODEL_PRICING = [
     # OpenAI models
@@ -104,31 +240,65 @@ async def run_migrations(db: DatabaseConnection) -> None:
     Args:
         db: Database connection instance
     """
-    logger.info("running_migrations")
+    current_version = await _get_schema_version(db)
+    if current_version >= SCHEMA_VERSION:
+        logger.debug("migrations_up_to_date", version=current_version)
+        return
+
+    logger.info(
+        "running_migrations",
+        from_version=current_version,
+        to_version=SCHEMA_VERSION,
+    )
+
+    if await _has_text_timestamps(db):
+        try:
+            await db.executescript(TIMESTAMP_CONVERSION_SCRIPT)
+        finally:
+            await db.execute("PRAGMA foreign_keys = ON")
+        logger.info("converted_timestamps_to_epoch_ms")
+
+    # Create tables and indexes
+    await db.executescript(SCHEMA_SCRIPT)
+    logger.debug("created_schema")
 
-    # Create tables
-    await db.execute(CREATE_TICKETS_TABLE)
-    logger.debug("created_table", table="tickets")
+    # Seed data and version bump are applied atomically. The DDL above is
+    # idempotent, so a failure here just reruns it next time.
+    async with db.transaction():
+        await _seed_model_pricing(db)
+        for statement in REBUILD_USAGE_ROLLUPS_SQL:
+            await db.execute(statement)
+        await db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
-    await db.execute(CREATE_AUDIT_LOGS_TABLE)
-    logger.debug("created_table", table="audit_logs")
+    logger.info("migrations_complete", version=SCHEMA_VERSION)
 
-    await db.execute(CREATE_TOKEN_USAGE_TABLE)
-    logger.debug("created_table", table="token_usage")
 
-    await db.execute(CREATE_MODEL_PRICING_TABLE)
-    logger.debug("created_table", table="model_pricing")
+async def _get_schema_version(db: DatabaseConnection) -> int:
+    """Get the schema version stored in the database.
 
-    # Create indexes
-    for index_sql in CREATE_INDEXES:
-        await db.execute(index_sql)
+    Args:
+        db: Database connection instance
 
-    logger.debug("created_indexes")
+    Returns:
+        The stored schema version (0 for a fresh database)
+    """
+    row = await db.fetch_one("PRAGMA user_version")
+    return row[0] if row else 0
 
-    # Insert default pricing data
-    await _seed_model_pricing(db)
 
-    logger.info("migrations_complete")
+async def _has_text_timestamps(db: DatabaseConnection) -> bool:
+    """Check whether the tables predate epoch-millisecond timestamps.
+
+    Args:
+        db: Database connection instance
+
+    Returns:
+        True if the existing tickets table stores timestamps as TEXT
+    """
+    row = await db.fetch_one(
+        "SELECT type FROM pragma_table_info('tickets') WHERE name = 'created_at'"
+    )
+    return row is not None and row[0] == "TEXT"
 
 
 async def _seed_model_pricing(db: DatabaseConnection) -> None:
@@ -137,19 +307,11 @@ async def _seed_model_pricing(db: DatabaseConnection) -> None:
     Args:
         db: Database connection instance
     """
-    from datetime import datetime
-
-    now = datetime.utcnow().isoformat()
-
-    for model_name, provider, input_cost, output_cost, cached_cost in DEFAULT_MODEL_PRICING:
-        # Use INSERT OR REPLACE to handle existing entries
-        await db.execute(
-            """
-            INSERT OR REPLACE INTO model_pricing
-            (model_name, provider, input_cost_per_1k, output_cost_per_1k, cached_input_cost_per_1k, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (model_name, provider, input_cost, output_cost, cached_cost, now),
-        )
+    updated_at = to_epoch_ms(now())
+
+    await db.execute_many(
+        UPSERT_MODEL_PRICING_SQL,
+        [(*pricing, updated_at) for pricing in DEFAULT_MODEL_PRICING],
+    )
 
     logger.debug("seeded_model_pricing", count=len(DEFAULT_MODEL_PRICING))
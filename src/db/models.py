@@ -3,17 +3,31 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Any
-import json
-import uuid
+from datetime import datetime, timedelta
+import os
+from typing import Any, NamedTuple, Sequence
 
-from ..utils.enums import MessageCategory, TicketStatus, TicketPriority, AuditAction
+import orjson
+
+from ..utils.enums import (
+    AUDIT_ACTION_BY_VALUE,
+    MESSAGE_CATEGORY_BY_VALUE,
+    TICKET_PRIORITY_BY_VALUE,
+    TICKET_STATUS_BY_VALUE,
+    AuditAction,
+    MessageCategory,
+    TicketPriority,
+    TicketStatus,
+)
 
 
 def generate_id() -> str:
-    """Generate a unique ID."""
-    return str(uuid.uuid4())
+    """Generate a unique ID.
+
+    128 random bits as 32 hex characters: several times faster than
+    formatting a uuid4, and a shorter primary key.
+    """
+    return os.urandom(16).hex()
 
 
 def now() -> datetime:
@@ -21,7 +35,32 @@ def now() -> datetime:
     return datetime.utcnow()
 
 
-@dataclass
+# Timestamps are stored as INTEGER milliseconds since the Unix epoch
+_EPOCH = datetime(1970, 1, 1)
+_MILLISECOND = timedelta(milliseconds=1)
+
+
+def to_epoch_ms(value: datetime) -> int:
+    """Convert a naive UTC datetime to its stored epoch-milliseconds value."""
+    return (value - _EPOCH) // _MILLISECOND
+
+
+def from_epoch_ms(value: int) -> datetime:
+    """Convert a stored epoch-milliseconds value to a naive UTC datetime."""
+    return _EPOCH + _MILLISECOND * value
+
+
+def _dump_metadata(metadata: dict[str, Any]) -> str:
+    """Serialize ticket metadata, skipping the encoder for the common empty case."""
+    return orjson.dumps(metadata).decode() if metadata else "{}"
+
+
+def _load_metadata(raw: str | None) -> dict[str, Any]:
+    """Deserialize ticket metadata, skipping the decoder for empty values."""
+    return orjson.loads(raw) if raw and raw != "{}" else {}
+
+
+@dataclass(slots=True)
 class Ticket:
     """Support ticket data model."""
 
@@ -38,8 +77,13 @@ class Ticket:
     updated_at: datetime = field(default_factory=now)
     resolved_at: datetime | None = None
 
+    @property
+    def short_id(self) -> str:
+        """Get the abbreviated ticket ID used in logs and the UI."""
+        return self.id[:8]
+
     def to_dict(self) -> dict[str, Any]:
-        """Convert to dictionary for database storage."""
+        """Convert to a dictionary with ISO-formatted timestamps."""
         return {
             "id": self.id,
             "customer_id": self.customer_id,
@@ -49,25 +93,89 @@ class Ticket:
             "priority": self.priority.value,
             "agent_response": self.agent_response,
             "handler_agent": self.handler_agent,
-            "metadata": json.dumps(self.metadata),
+            "metadata": _dump_metadata(self.metadata),
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
             "resolved_at": self.resolved_at.isoformat() if self.resolved_at else None,
         }
 
+    def to_row(self) -> tuple:
+        """Convert to a tuple of column values in table order."""
+        return (
+            self.id,
+            self.customer_id,
+            self.customer_message,
+            self.category.value,
+            self.status.value,
+            self.priority.value,
+            self.agent_response,
+            self.handler_agent,
+            _dump_metadata(self.metadata),
+            to_epoch_ms(self.created_at),
+            to_epoch_ms(self.updated_at),
+            to_epoch_ms(self.resolved_at) if self.resolved_at else None,
+        )
+
+    def to_update_row(self) -> tuple:
+        """Convert to the parameters of a full ticket UPDATE.
+
+        The mutable columns in table order followed by the id; the immutable
+        customer_id and created_at are left out, so created_at isn't
+        re-formatted on every update, and updated_at is set by SQLite.
+        """
+        return (
+            self.customer_message,
+            self.category.value,
+            self.status.value,
+            self.priority.value,
+            self.agent_response,
+            self.handler_agent,
+            _dump_metadata(self.metadata),
+            to_epoch_ms(self.resolved_at) if self.resolved_at else None,
+            self.id,
+        )
+
+    def to_classification_row(self) -> tuple:
+        """Convert to the parameters of a category and metadata UPDATE."""
+        return (self.category.value, _dump_metadata(self.metadata), self.id)
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "Ticket":
+        """Create from a `SELECT *` row, reading columns by position."""
+        (
+            id_, customer_id, customer_message, category, status, priority,
+            agent_response, handler_agent, metadata, created_at, updated_at, resolved_at,
+        ) = row
+        # Fields are assigned directly, skipping the dataclass __init__; the
+        # other models' from_row do the same
+        obj = object.__new__(cls)
+        obj.id = id_
+        obj.customer_id = customer_id
+        obj.customer_message = customer_message
+        obj.category = MESSAGE_CATEGORY_BY_VALUE[category]
+        obj.status = TICKET_STATUS_BY_VALUE[status]
+        obj.priority = TICKET_PRIORITY_BY_VALUE[priority]
+        obj.agent_response = agent_response
+        obj.handler_agent = handler_agent
+        obj.metadata = _load_metadata(metadata)
+        obj.created_at = from_epoch_ms(created_at)
+        obj.updated_at = from_epoch_ms(updated_at)
+        obj.resolved_at = from_epoch_ms(resolved_at) if resolved_at is not None else None
+        return obj
+
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "Ticket":
-        """Create from database row."""
+        """Create from a dictionary produced by to_dict."""
         return cls(
             id=data["id"],
             customer_id=data["customer_id"],
             customer_message=data["customer_message"],
-            category=MessageCategory(data["category"]),
-            status=TicketStatus(data["status"]),
-            priority=TicketPriority(data["priority"]),
+            category=MESSAGE_CATEGORY_BY_VALUE[data["category"]],
+            status=TICKET_STATUS_BY_VALUE[data["status"]],
+            priority=TICKET_PRIORITY_BY_VALUE[data["priority"]],
             agent_response=data["agent_response"],
             handler_agent=data["handler_agent"],
-            metadata=json.loads(data["metadata"]) if data["metadata"] else {},
+            metadata=_load_metadata(data["metadata"]),
             created_at=datetime.fromisoformat(data["created_at"]),
             updated_at=datetime.fromisoformat(data["updated_at"]),
             resolved_at=datetime.fromisoformat(data["resolved_at"])
@@ -76,7 +184,15 @@ class Ticket:
         )
 
 
-@dataclass
+class TicketHistoryEntry(NamedTuple):
+    """The fields of a past ticket used to build customer history context."""
+
+    category: MessageCategory
+    status: TicketStatus
+    message_preview: str
+
+
+@dataclass(slots=True)
 class AuditLog:
     """Audit log entry for agent actions."""
 
@@ -94,7 +210,7 @@ class AuditLog:
     created_at: datetime = field(default_factory=now)
 
     def to_dict(self) -> dict[str, Any]:
-        """Convert to dictionary for database storage."""
+        """Convert to a dictionary with ISO-formatted timestamps."""
         return {
             "id": self.id,
             "ticket_id": self.ticket_id,
@@ -110,14 +226,53 @@ class AuditLog:
             "created_at": self.created_at.isoformat(),
         }
 
+    def to_row(self) -> tuple:
+        """Convert to a tuple of column values in table order."""
+        return (
+            self.id,
+            self.ticket_id,
+            self.agent_name,
+            self.action.value,
+            self.input_summary,
+            self.output_summary,
+            self.decision_reasoning,
+            self.confidence_score,
+            self.duration_ms,
+            self.success,
+            self.error_message,
+            to_epoch_ms(self.created_at),
+        )
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "AuditLog":
+        """Create from a `SELECT *` row, reading columns by position."""
+        (
+            id_, ticket_id, agent_name, action, input_summary, output_summary,
+            decision_reasoning, confidence_score, duration_ms, success, error_message, created_at,
+        ) = row
+        obj = object.__new__(cls)
+        obj.id = id_
+        obj.ticket_id = ticket_id
+        obj.agent_name = agent_name
+        obj.action = AUDIT_ACTION_BY_VALUE[action]
+        obj.input_summary = input_summary
+        obj.output_summary = output_summary
+        obj.decision_reasoning = decision_reasoning
+        obj.confidence_score = confidence_score
+        obj.duration_ms = duration_ms
+        obj.success = bool(success)
+        obj.error_message = error_message
+        obj.created_at = from_epoch_ms(created_at)
+        return obj
+
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "AuditLog":
-        """Create from database row."""
+        """Create from a dictionary produced by to_dict."""
         return cls(
             id=data["id"],
             ticket_id=data["ticket_id"],
             agent_name=data["agent_name"],
-            action=AuditAction(data["action"]),
+            action=AUDIT_ACTION_BY_VALUE[data["action"]],
             input_summary=data["input_summary"],
             output_summary=data["output_summary"],
             decision_reasoning=data["decision_reasoning"],
@@ -129,7 +284,7 @@ class AuditLog:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class TokenUsage:
     """Token usage record for LLM calls."""
 
@@ -156,7 +311,7 @@ class TokenUsage:
         return self.input_cost_usd + self.output_cost_usd
 
     def to_dict(self) -> dict[str, Any]:
-        """Convert to dictionary for database storage."""
+        """Convert to a dictionary with ISO-formatted timestamps."""
         return {
             "id": self.id,
             "ticket_id": self.ticket_id,
@@ -171,9 +326,46 @@ class TokenUsage:
             "created_at": self.created_at.isoformat(),
         }
 
+    def to_row(self) -> tuple:
+        """Convert to a tuple of column values in table order."""
+        return (
+            self.id,
+            self.ticket_id,
+            self.agent_name,
+            self.model_name,
+            self.provider,
+            self.input_tokens,
+            self.output_tokens,
+            self.input_cost_usd,
+            self.output_cost_usd,
+            self.cached_tokens,
+            to_epoch_ms(self.created_at),
+        )
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "TokenUsage":
+        """Create from a `SELECT *` row, reading columns by position."""
+        (
+            id_, ticket_id, agent_name, model_name, provider, input_tokens,
+            output_tokens, input_cost_usd, output_cost_usd, cached_tokens, created_at,
+        ) = row
+        obj = object.__new__(cls)
+        obj.id = id_
+        obj.ticket_id = ticket_id
+        obj.agent_name = agent_name
+        obj.model_name = model_name
+        obj.provider = provider
+        obj.input_tokens = input_tokens
+        obj.output_tokens = output_tokens
+        obj.input_cost_usd = input_cost_usd
+        obj.output_cost_usd = output_cost_usd
+        obj.cached_tokens = cached_tokens
+        obj.created_at = from_epoch_ms(created_at)
+        return obj
+
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "TokenUsage":
-        """Create from database row."""
+        """Create from a dictionary produced by to_dict."""
         return cls(
             id=data["id"],
             ticket_id=data["ticket_id"],
@@ -189,7 +381,7 @@ class TokenUsage:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ModelPricing:
     """Pricing information for LLM models."""
 
@@ -200,8 +392,16 @@ class ModelPricing:
     cached_input_cost_per_1k: float = 0.0
     updated_at: datetime = field(default_factory=now)
 
+    def per_token_rates(self) -> tuple[float, float, float]:
+        """Get the USD cost of one input, cached input and output token."""
+        return (
+            self.input_cost_per_1k / 1000,
+            self.cached_input_cost_per_1k / 1000,
+            self.output_cost_per_1k / 1000,
+        )
+
     def to_dict(self) -> dict[str, Any]:
-        """Convert to dictionary for database storage."""
+        """Convert to a dictionary with ISO-formatted timestamps."""
         return {
             "model_name": self.model_name,
             "provider": self.provider,
@@ -213,7 +413,7 @@ class ModelPricing:
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "ModelPricing":
-        """Create from database row."""
+        """Create from a dictionary produced by to_dict."""
         return cls(
             model_name=data["model_name"],
             provider=data["provider"],
@@ -222,3 +422,30 @@ class ModelPricing:
             cached_input_cost_per_1k=data["cached_input_cost_per_1k"],
             updated_at=datetime.fromisoformat(data["updated_at"]),
         )
+
+    def to_row(self) -> tuple:
+        """Convert to a tuple of column values in table order."""
+        return (
+            self.model_name,
+            self.provider,
+            self.input_cost_per_1k,
+            self.output_cost_per_1k,
+            self.cached_input_cost_per_1k,
+            to_epoch_ms(self.updated_at),
+        )
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "ModelPricing":
+        """Create from a `SELECT *` row, reading columns by position."""
+        (
+            model_name, provider, input_cost_per_1k, output_cost_per_1k,
+            cached_input_cost_per_1k, updated_at,
+        ) = row
+        return cls(
+            model_name,
+            provider,
+            input_cost_per_1k,
+            output_cost_per_1k,
+            cached_input_cost_per_1k,
+            from_epoch_ms(updated_at),
+        )
@@ -10,6 +10,17 @@ from ...utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+INSERT_AUDIT_LOG_SQL = """
+INSERT INTO audit_logs
+(id, ticket_id, agent_name, action, input_summary, output_summary,
+ decision_reasoning, confidence_score, duration_ms, success, error_message, created_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SELECT_AUDIT_LOGS_BY_TICKET_SQL = (
+    "SELECT * FROM audit_logs WHERE ticket_id = ? ORDER BY created_at ASC"
+)
+
 
 class AuditRepository:
     """Repository for audit log database operations."""
@@ -31,31 +42,8 @@ class AuditRepository:
         Returns:
             The created audit log
         """
-        data = audit_log.to_dict()
-
         try:
-            await self.db.execute(
-                """
-                INSERT INTO audit_logs
-                (id, ticket_id, agent_name, action, input_summary, output_summary,
-                 decision_reasoning, confidence_score, duration_ms, success, error_message, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    data["id"],
-                    data["ticket_id"],
-                    data["agent_name"],
-                    data["action"],
-                    data["input_summary"],
-                    data["output_summary"],
-                    data["decision_reasoning"],
-                    data["confidence_score"],
-                    data["duration_ms"],
-                    data["success"],
-                    data["error_message"],
-                    data["created_at"],
-                ),
-            )
+            await self.db.execute(INSERT_AUDIT_LOG_SQL, audit_log.to_row())
 
             logger.debug(
                 "audit_log_created",
@@ -68,6 +56,26 @@ class AuditRepository:
         except Exception as e:
             raise DatabaseError(f"Failed to create audit log: {e}", operation="create")
 
+    async def create_many(self, audit_logs: List[AuditLog]) -> None:
+        """Insert several audit log entries with a single executemany.
+
+        Args:
+            audit_logs: Audit logs to create
+        """
+        if not audit_logs:
+            return
+
+        try:
+            await self.db.execute_many(
+                INSERT_AUDIT_LOG_SQL,
+                [audit_log.to_row() for audit_log in audit_logs],
+            )
+
+            logger.debug("audit_logs_created", count=len(audit_logs))
+
+        except Exception as e:
+            raise DatabaseError(f"Failed to create audit logs: {e}", operation="create_many")
+
     async def get_by_ticket(self, ticket_id: str) -> List[AuditLog]:
         """Get all audit logs for a ticket.
 
@@ -77,13 +85,12 @@ class AuditRepository:
         Returns:
             List of audit logs
         """
-        rows = await self.db.fetch_all(
-            "SELECT * FROM audit_logs WHERE ticket_id = ? ORDER BY created_at ASC",
+        return await self.db.fetch_all(
+            SELECT_AUDIT_LOGS_BY_TICKET_SQL,
             (ticket_id,),
+            row_factory=AuditLog.from_row,
         )
 
-        return [AuditLog.from_dict(dict(row)) for row in rows]
-
     async def get_by_agent(self, agent_name: str, limit: int = 100) -> List[AuditLog]:
         """Get audit logs for a specific agent.
 
@@ -94,7 +101,7 @@ class AuditRepository:
         Returns:
             List of audit logs
         """
-        rows = await self.db.fetch_all(
+        return await self.db.fetch_all(
             """
             SELECT * FROM audit_logs
             WHERE agent_name = ?
@@ -102,10 +109,9 @@ class AuditRepository:
             LIMIT ?
             """,
             (agent_name, limit),
+            row_factory=AuditLog.from_row,
         )
 
-        return [AuditLog.from_dict(dict(row)) for row in rows]
-
     async def get_by_action(self, action: AuditAction, limit: int = 100) -> List[AuditLog]:
         """Get audit logs for a specific action type.
 
@@ -116,7 +122,7 @@ class AuditRepository:
         Returns:
             List of audit logs
         """
-        rows = await self.db.fetch_all(
+        return await self.db.fetch_all(
             """
             SELECT * FROM audit_logs
             WHERE action = ?
@@ -124,10 +130,9 @@ class AuditRepository:
             LIMIT ?
             """,
             (action.value, limit),
+            row_factory=AuditLog.from_row,
         )
 
-        return [AuditLog.from_dict(dict(row)) for row in rows]
-
     async def get_failures(self, limit: int = 100) -> List[AuditLog]:
         """Get failed audit logs.
 
@@ -137,7 +142,7 @@ class AuditRepository:
         Returns:
             List of failed audit logs
         """
-        rows = await self.db.fetch_all(
+        return await self.db.fetch_all(
             """
             SELECT * FROM audit_logs
             WHERE success = 0
@@ -145,10 +150,9 @@ class AuditRepository:
             LIMIT ?
             """,
             (limit,),
+            row_factory=AuditLog.from_row,
         )
 
-        return [AuditLog.from_dict(dict(row)) for row in rows]
-
     async def get_recent(self, limit: int = 50) -> List[AuditLog]:
         """Get recent audit logs.
 
@@ -158,13 +162,12 @@ class AuditRepository:
         Returns:
             List of recent audit logs
         """
-        rows = await self.db.fetch_all(
+        return await self.db.fetch_all(
             "SELECT * FROM audit_logs ORDER BY created_at DESC LIMIT ?",
             (limit,),
+            row_factory=AuditLog.from_row,
         )
 
-        return [AuditLog.from_dict(dict(row)) for row in rows]
-
     async def count_by_agent(self) -> dict[str, int]:
         """Get count of audit logs by agent.
 
@@ -205,3 +208,34 @@ class AuditRepository:
         )
 
         return {row["agent_name"]: row["avg_duration"] for row in rows}
+
+    async def get_aggregates(
+        self,
+    ) -> tuple[dict[str, int], dict[str, int], dict[str, float]]:
+        """Get per-agent counts, per-action counts and per-agent durations in one query.
+
+        Equivalent to count_by_agent, count_by_action and
+        get_average_duration_by_agent combined.
+
+        Returns:
+            Tuple of (agent to count, action to count, agent to average
+            duration in ms)
+        """
+        rows = await self.db.fetch_all(
+            """
+            SELECT 'agent' AS dimension, agent_name AS key, COUNT(*) AS value
+            FROM audit_logs GROUP BY agent_name
+            UNION ALL
+            SELECT 'action', action, COUNT(*)
+            FROM audit_logs GROUP BY action
+            UNION ALL
+            SELECT 'duration', agent_name, AVG(duration_ms)
+            FROM audit_logs WHERE success = 1 GROUP BY agent_name
+            """
+        )
+
+        aggregates: dict[str, dict] = {"agent": {}, "action": {}, "duration": {}}
+        for dimension, key, value in rows:
+            aggregates[dimension][key] = value
+
+        return aggregates["agent"], aggregates["action"], aggregates["duration"]
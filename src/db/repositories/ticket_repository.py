@@ -1,16 +1,84 @@
 """Repository for ticket CRUD operations."""
 
-from datetime import datetime
 from typing import List
 
 from ..connection import DatabaseConnection
-from ..models import Ticket
-from ...utils.enums import TicketStatus, MessageCategory
+from ..models import Ticket, TicketHistoryEntry, from_epoch_ms
+from ...utils.enums import (
+    MESSAGE_CATEGORY_BY_VALUE,
+    TICKET_STATUS_BY_VALUE,
+    MessageCategory,
+    TicketStatus,
+)
 from ...utils.exceptions import TicketNotFoundError, DatabaseError
 from ...utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Hot-path statements, kept as constants so each is prepared once per
+# connection and then served from the driver's statement cache
+INSERT_TICKET_SQL = """
+INSERT INTO tickets
+(id, customer_id, customer_message, category, status, priority,
+ agent_response, handler_agent, metadata, created_at, updated_at, resolved_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Current time as epoch milliseconds (the stored timestamp format), so
+# update timestamps are produced by SQLite rather than computed in Python
+NOW_SQL = "CAST(ROUND((julianday('now') - 2440587.5) * 86400000) AS INTEGER)"
+
+UPDATE_TICKET_SQL = f"""
+UPDATE tickets SET
+    customer_message = ?,
+    category = ?,
+    status = ?,
+    priority = ?,
+    agent_response = ?,
+    handler_agent = ?,
+    metadata = ?,
+    updated_at = {NOW_SQL},
+    resolved_at = ?
+WHERE id = ?
+RETURNING updated_at
+"""
+
+UPDATE_CLASSIFICATION_SQL = f"""
+UPDATE tickets SET category = ?, metadata = ?, updated_at = {NOW_SQL}
+WHERE id = ?
+RETURNING updated_at
+"""
+
+SELECT_TICKET_BY_ID_SQL = "SELECT * FROM tickets WHERE id = ?"
+
+# Partial updates for single-ticket state transitions; each writes only the
+# changed columns and returns the updated row, so no read is needed first
+RESOLVE_TICKET_SQL = f"""
+UPDATE tickets SET
+    status = ?,
+    agent_response = COALESCE(?, agent_response),
+    resolved_at = {NOW_SQL},
+    updated_at = {NOW_SQL}
+WHERE id = ?
+RETURNING *
+"""
+
+SET_RESPONSE_SQL = f"""
+UPDATE tickets SET
+    status = ?, agent_response = ?, handler_agent = ?, updated_at = {NOW_SQL}
+WHERE id = ?
+RETURNING *
+"""
+
+ESCALATE_TICKET_SQL = f"""
+UPDATE tickets SET
+    status = ?,
+    metadata = json_set(COALESCE(metadata, '{{}}'), '$.escalation_reason', ?),
+    updated_at = {NOW_SQL}
+WHERE id = ?
+RETURNING *
+"""
+
 
 class TicketRepository:
     """Repository for ticket database operations."""
@@ -32,31 +100,8 @@ class TicketRepository:
         Returns:
             The created ticket
         """
-        data = ticket.to_dict()
-
         try:
-            await self.db.execute(
-                """
-                INSERT INTO tickets
-                (id, customer_id, customer_message, category, status, priority,
-                 agent_response, handler_agent, metadata, created_at, updated_at, resolved_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    data["id"],
-                    data["customer_id"],
-                    data["customer_message"],
-                    data["category"],
-                    data["status"],
-                    data["priority"],
-                    data["agent_response"],
-                    data["handler_agent"],
-                    data["metadata"],
-                    data["created_at"],
-                    data["updated_at"],
-                    data["resolved_at"],
-                ),
-            )
+            await self.db.execute(INSERT_TICKET_SQL, ticket.to_row())
 
             logger.debug("ticket_created", ticket_id=ticket.id)
             return ticket
@@ -64,6 +109,26 @@ class TicketRepository:
         except Exception as e:
             raise DatabaseError(f"Failed to create ticket: {e}", operation="create")
 
+    async def create_many(self, tickets: List[Ticket]) -> None:
+        """Insert several tickets with a single executemany.
+
+        Args:
+            tickets: Tickets to create
+        """
+        if not tickets:
+            return
+
+        try:
+            await self.db.execute_many(
+                INSERT_TICKET_SQL,
+                [ticket.to_row() for ticket in tickets],
+            )
+
+            logger.debug("tickets_created", count=len(tickets))
+
+        except Exception as e:
+            raise DatabaseError(f"Failed to create tickets: {e}", operation="create_many")
+
     async def get_by_id(self, ticket_id: str) -> Ticket:
         """Get a ticket by ID.
 
@@ -76,15 +141,14 @@ class TicketRepository:
         Raises:
             TicketNotFoundError: If ticket not found
         """
-        row = await self.db.fetch_one(
-            "SELECT * FROM tickets WHERE id = ?",
-            (ticket_id,),
+        ticket = await self.db.fetch_one(
+            SELECT_TICKET_BY_ID_SQL, (ticket_id,), row_factory=Ticket.from_row
         )
 
-        if not row:
+        if ticket is None:
             raise TicketNotFoundError(ticket_id)
 
-        return Ticket.from_dict(dict(row))
+        return ticket
 
     async def update(self, ticket: Ticket) -> Ticket:
         """Update an existing ticket.
@@ -95,37 +159,10 @@ class TicketRepository:
         Returns:
             The updated ticket
         """
-        ticket.updated_at = datetime.utcnow()
-        data = ticket.to_dict()
-
         try:
-            await self.db.execute(
-                """
-                UPDATE tickets SET
-                    customer_message = ?,
-                    category = ?,
-                    status = ?,
-                    priority = ?,
-                    agent_response = ?,
-                    handler_agent = ?,
-                    metadata = ?,
-                    updated_at = ?,
-                    resolved_at = ?
-                WHERE id = ?
-                """,
-                (
-                    data["customer_message"],
-                    data["category"],
-                    data["status"],
-                    data["priority"],
-                    data["agent_response"],
-                    data["handler_agent"],
-                    data["metadata"],
-                    data["updated_at"],
-                    data["resolved_at"],
-                    data["id"],
-                ),
-            )
+            rows = await self.db.execute_returning(UPDATE_TICKET_SQL, ticket.to_update_row())
+            if rows:
+                ticket.updated_at = from_epoch_ms(rows[0][0])
 
             logger.debug("ticket_updated", ticket_id=ticket.id)
             return ticket
@@ -133,6 +170,31 @@ class TicketRepository:
         except Exception as e:
             raise DatabaseError(f"Failed to update ticket: {e}", operation="update")
 
+    async def update_classification(self, ticket: Ticket) -> Ticket:
+        """Write only a ticket's category and metadata.
+
+        Args:
+            ticket: Ticket with updated classification
+
+        Returns:
+            The updated ticket
+        """
+        try:
+            rows = await self.db.execute_returning(
+                UPDATE_CLASSIFICATION_SQL, ticket.to_classification_row()
+            )
+            if rows:
+                ticket.updated_at = from_epoch_ms(rows[0][0])
+
+            logger.debug("ticket_classification_updated", ticket_id=ticket.id)
+            return ticket
+
+        except Exception as e:
+            raise DatabaseError(
+                f"Failed to update ticket classification: {e}",
+                operation="update_classification",
+            )
+
     async def get_by_customer(self, customer_id: str) -> List[Ticket]:
         """Get all tickets for a customer.
 
@@ -142,12 +204,49 @@ class TicketRepository:
         Returns:
             List of tickets
         """
-        rows = await self.db.fetch_all(
+        return await self.db.fetch_all(
             "SELECT * FROM tickets WHERE customer_id = ? ORDER BY created_at DESC",
             (customer_id,),
+            row_factory=Ticket.from_row,
+        )
+
+    async def get_recent_by_customer(
+        self,
+        customer_id: str,
+        exclude_ticket_id: str | None = None,
+        limit: int = 5,
+        preview_length: int = 100,
+    ) -> List[TicketHistoryEntry]:
+        """Get a customer's most recent tickets, projected to history fields.
+
+        Args:
+            customer_id: Customer ID
+            exclude_ticket_id: Ticket to leave out (e.g. the current one)
+            limit: Maximum number of tickets to return
+            preview_length: Number of characters of each message to return
+
+        Returns:
+            History entries, newest first
+        """
+        rows = await self.db.fetch_all(
+            """
+            SELECT category, status, substr(customer_message, 1, ?) AS message_preview
+            FROM tickets
+            WHERE customer_id = ? AND id IS NOT ?
+            ORDER BY created_at DESC
+            LIMIT ?
+            """,
+            (preview_length, customer_id, exclude_ticket_id, limit),
         )
 
-        return [Ticket.from_dict(dict(row)) for row in rows]
+        return [
+            TicketHistoryEntry(
+                MESSAGE_CATEGORY_BY_VALUE[row["category"]],
+                TICKET_STATUS_BY_VALUE[row["status"]],
+                row["message_preview"],
+            )
+            for row in rows
+        ]
 
     async def get_by_status(self, status: TicketStatus) -> List[Ticket]:
         """Get all tickets with a given status.
@@ -158,13 +257,12 @@ class TicketRepository:
         Returns:
             List of tickets
         """
-        rows = await self.db.fetch_all(
+        return await self.db.fetch_all(
             "SELECT * FROM tickets WHERE status = ? ORDER BY created_at DESC",
             (status.value,),
+            row_factory=Ticket.from_row,
         )
 
-        return [Ticket.from_dict(dict(row)) for row in rows]
-
     async def get_by_category(self, category: MessageCategory) -> List[Ticket]:
         """Get all tickets with a given category.
 
@@ -174,13 +272,12 @@ class TicketRepository:
         Returns:
             List of tickets
         """
-        rows = await self.db.fetch_all(
+        return await self.db.fetch_all(
             "SELECT * FROM tickets WHERE category = ? ORDER BY created_at DESC",
             (category.value,),
+            row_factory=Ticket.from_row,
         )
 
-        return [Ticket.from_dict(dict(row)) for row in rows]
-
     async def get_recent(self, limit: int = 10) -> List[Ticket]:
         """Get recent tickets.
 
@@ -190,50 +287,131 @@ class TicketRepository:
         Returns:
             List of recent tickets
         """
-        rows = await self.db.fetch_all(
+        return await self.db.fetch_all(
             "SELECT * FROM tickets ORDER BY created_at DESC LIMIT ?",
             (limit,),
+            row_factory=Ticket.from_row,
         )
 
-        return [Ticket.from_dict(dict(row)) for row in rows]
-
-    async def resolve(self, ticket_id: str, response: str) -> Ticket:
+    async def resolve(self, ticket_id: str, response: str | None) -> Ticket:
         """Mark a ticket as resolved.
 
+        Args:
+            ticket_id: Ticket ID
+            response: Agent response, or None to keep the current one
+
+        Returns:
+            The updated ticket
+
+        Raises:
+            TicketNotFoundError: If ticket not found
+        """
+        ticket = await self._update_returning(
+            RESOLVE_TICKET_SQL,
+            (TicketStatus.RESOLVED.value, response, ticket_id),
+            ticket_id,
+            operation="resolve",
+        )
+
+        logger.debug("ticket_resolved", ticket_id=ticket_id)
+        return ticket
+
+    async def set_response(self, ticket_id: str, response: str, handler_agent: str) -> Ticket:
+        """Record a handler's response and mark the ticket in progress.
+
         Args:
             ticket_id: Ticket ID
             response: Agent response
+            handler_agent: Name of the handler agent
 
         Returns:
             The updated ticket
+
+        Raises:
+            TicketNotFoundError: If ticket not found
         """
-        ticket = await self.get_by_id(ticket_id)
-        ticket.status = TicketStatus.RESOLVED
-        ticket.agent_response = response
-        ticket.resolved_at = datetime.utcnow()
+        ticket = await self._update_returning(
+            SET_RESPONSE_SQL,
+            (TicketStatus.IN_PROGRESS.value, response, handler_agent, ticket_id),
+            ticket_id,
+            operation="set_response",
+        )
 
-        return await self.update(ticket)
+        logger.debug("ticket_response_set", ticket_id=ticket_id)
+        return ticket
 
-    async def count_by_status(self) -> dict[str, int]:
-        """Get count of tickets by status.
+    async def escalate(self, ticket_id: str, reason: str) -> Ticket:
+        """Mark a ticket as escalated, recording the reason in its metadata.
+
+        Args:
+            ticket_id: Ticket ID
+            reason: Escalation reason
 
         Returns:
-            Dictionary of status to count
+            The updated ticket
+
+        Raises:
+            TicketNotFoundError: If ticket not found
         """
-        rows = await self.db.fetch_all(
-            "SELECT status, COUNT(*) as count FROM tickets GROUP BY status"
+        ticket = await self._update_returning(
+            ESCALATE_TICKET_SQL,
+            (TicketStatus.ESCALATED.value, reason, ticket_id),
+            ticket_id,
+            operation="escalate",
         )
 
-        return {row["status"]: row["count"] for row in rows}
+        logger.debug("ticket_escalated", ticket_id=ticket_id)
+        return ticket
+
+    async def _update_returning(
+        self,
+        sql: str,
+        parameters: tuple,
+        ticket_id: str,
+        operation: str,
+    ) -> Ticket:
+        """Run a single-ticket UPDATE ... RETURNING * statement.
+
+        Args:
+            sql: Update statement
+            parameters: Statement parameters
+            ticket_id: Ticket ID, for the not-found error
+            operation: Operation name for error reporting
+
+        Returns:
+            The updated ticket
+
+        Raises:
+            TicketNotFoundError: If ticket not found
+        """
+        try:
+            rows = await self.db.execute_returning(sql, parameters)
+        except Exception as e:
+            raise DatabaseError(f"Failed to {operation} ticket: {e}", operation=operation)
+
+        if not rows:
+            raise TicketNotFoundError(ticket_id)
 
-    async def count_by_category(self) -> dict[str, int]:
-        """Get count of tickets by category.
+        return Ticket.from_row(rows[0])
+
+    async def count_by_status_and_category(self) -> tuple[dict[str, int], dict[str, int]]:
+        """Get ticket counts by status and by category in one query.
 
         Returns:
-            Dictionary of category to count
+            Tuple of (status to count, category to count)
         """
         rows = await self.db.fetch_all(
-            "SELECT category, COUNT(*) as count FROM tickets GROUP BY category"
+            """
+            SELECT 'status' AS dimension, status AS value, COUNT(*) AS count
+            FROM tickets GROUP BY status
+            UNION ALL
+            SELECT 'category', category, COUNT(*)
+            FROM tickets GROUP BY category
+            """
         )
 
-        return {row["category"]: row["count"] for row in rows}
+        counts: dict[str, dict[str, int]] = {"status": {}, "category": {}}
+        for dimension, value, count in rows:
+            counts[dimension][value] = count
+
+        return counts["status"], counts["category"]
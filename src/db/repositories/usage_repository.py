@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import Callable, List
 
 from ..connection import DatabaseConnection
 from ..models import TokenUsage, ModelPricing
@@ -11,6 +11,42 @@ from ...utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+INSERT_TOKEN_USAGE_SQL = """
+INSERT INTO token_usage
+(id, ticket_id, agent_name, model_name, provider,
+ input_tokens, output_tokens, input_cost_usd, output_cost_usd,
+ cached_tokens, created_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Add a batch of usage totals to the per-agent and per-model rollups
+UPSERT_USAGE_AGG_SQL = """
+INSERT INTO usage_agg_by_{dimension}
+({dimension}_name, requests, input_tokens, output_tokens,
+ input_cost_usd, output_cost_usd, cached_tokens)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT({dimension}_name) DO UPDATE SET
+    requests = requests + excluded.requests,
+    input_tokens = input_tokens + excluded.input_tokens,
+    output_tokens = output_tokens + excluded.output_tokens,
+    input_cost_usd = input_cost_usd + excluded.input_cost_usd,
+    output_cost_usd = output_cost_usd + excluded.output_cost_usd,
+    cached_tokens = cached_tokens + excluded.cached_tokens
+"""
+UPSERT_USAGE_AGG_BY_AGENT_SQL = UPSERT_USAGE_AGG_SQL.format(dimension="agent")
+UPSERT_USAGE_AGG_BY_MODEL_SQL = UPSERT_USAGE_AGG_SQL.format(dimension="model")
+
+# INSERT OR REPLACE so existing entries are overwritten
+UPSERT_MODEL_PRICING_SQL = """
+INSERT OR REPLACE INTO model_pricing
+(model_name, provider, input_cost_per_1k, output_cost_per_1k,
+ cached_input_cost_per_1k, updated_at)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# (summary, agent to cost, model to cost, agent to token counts)
+UsageAggregates = tuple[dict, dict[str, float], dict[str, float], dict[str, dict[str, int]]]
+
 
 class UsageRepository:
     """Repository for token usage database operations."""
@@ -32,31 +68,10 @@ class UsageRepository:
         Returns:
             The created token usage
         """
-        data = usage.to_dict()
-
         try:
-            await self.db.execute(
-                """
-                INSERT INTO token_usage
-                (id, ticket_id, agent_name, model_name, provider,
-                 input_tokens, output_tokens, input_cost_usd, output_cost_usd,
-                 cached_tokens, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    data["id"],
-                    data["ticket_id"],
-                    data["agent_name"],
-                    data["model_name"],
-                    data["provider"],
-                    data["input_tokens"],
-                    data["output_tokens"],
-                    data["input_cost_usd"],
-                    data["output_cost_usd"],
-                    data["cached_tokens"],
-                    data["created_at"],
-                ),
-            )
+            async with self.db.transaction():
+                await self.db.execute(INSERT_TOKEN_USAGE_SQL, usage.to_row())
+                await self._add_to_rollups([usage])
 
             logger.debug(
                 "token_usage_created",
@@ -69,6 +84,46 @@ class UsageRepository:
         except Exception as e:
             raise DatabaseError(f"Failed to create token usage: {e}", operation="create")
 
+    async def create_many(self, usages: List[TokenUsage]) -> None:
+        """Insert several token usage records with a single executemany.
+
+        Args:
+            usages: Token usage records to create
+        """
+        if not usages:
+            return
+
+        try:
+            async with self.db.transaction():
+                await self.db.execute_many(
+                    INSERT_TOKEN_USAGE_SQL,
+                    [usage.to_row() for usage in usages],
+                )
+                await self._add_to_rollups(usages)
+
+            logger.debug("token_usages_created", count=len(usages))
+
+        except Exception as e:
+            raise DatabaseError(f"Failed to create token usage: {e}", operation="create_many")
+
+    async def _add_to_rollups(self, usages: List[TokenUsage]) -> None:
+        """Add token usage records to the per-agent and per-model rollups.
+
+        Must run in the same transaction as the inserts so the rollups never
+        disagree with token_usage.
+
+        Args:
+            usages: Token usage records just inserted
+        """
+        await self.db.execute_many(
+            UPSERT_USAGE_AGG_BY_AGENT_SQL,
+            _rollup(usages, lambda usage: usage.agent_name),
+        )
+        await self.db.execute_many(
+            UPSERT_USAGE_AGG_BY_MODEL_SQL,
+            _rollup(usages, lambda usage: usage.model_name),
+        )
+
     async def get_by_ticket(self, ticket_id: str) -> List[TokenUsage]:
         """Get all token usage records for a ticket.
 
@@ -78,13 +133,12 @@ class UsageRepository:
         Returns:
             List of token usage records
         """
-        rows = await self.db.fetch_all(
+        return await self.db.fetch_all(
             "SELECT * FROM token_usage WHERE ticket_id = ? ORDER BY created_at ASC",
             (ticket_id,),
+            row_factory=TokenUsage.from_row,
         )
 
-        return [TokenUsage.from_dict(dict(row)) for row in rows]
-
     async def get_by_agent(self, agent_name: str, limit: int = 100) -> List[TokenUsage]:
         """Get token usage records for a specific agent.
 
@@ -95,7 +149,7 @@ class UsageRepository:
         Returns:
             List of token usage records
         """
-        rows = await self.db.fetch_all(
+        return await self.db.fetch_all(
             """
             SELECT * FROM token_usage
             WHERE agent_name = ?
@@ -103,10 +157,9 @@ class UsageRepository:
             LIMIT ?
             """,
             (agent_name, limit),
+            row_factory=TokenUsage.from_row,
         )
 
-        return [TokenUsage.from_dict(dict(row)) for row in rows]
-
     async def get_total_cost_by_ticket(self, ticket_id: str) -> float:
         """Get total cost for a ticket.
 
@@ -127,106 +180,96 @@ class UsageRepository:
 
         return row["total_cost"] if row and row["total_cost"] else 0.0
 
-    async def get_total_tokens_by_agent(self) -> dict[str, dict[str, int]]:
-        """Get total tokens by agent.
-
-        Returns:
-            Dictionary of agent name to token counts
-        """
-        rows = await self.db.fetch_all(
-            """
-            SELECT agent_name,
-                   SUM(input_tokens) as input_tokens,
-                   SUM(output_tokens) as output_tokens
-            FROM token_usage
-            GROUP BY agent_name
-            """
-        )
-
-        return {
-            row["agent_name"]: {
-                "input_tokens": row["input_tokens"],
-                "output_tokens": row["output_tokens"],
-                "total_tokens": row["input_tokens"] + row["output_tokens"],
-            }
-            for row in rows
-        }
+    async def get_total_costs_by_tickets(self, ticket_ids: List[str]) -> dict[str, float]:
+        """Get total costs for several tickets in one query.
 
-    async def get_total_cost_by_agent(self) -> dict[str, float]:
-        """Get total cost by agent.
+        Args:
+            ticket_ids: Ticket IDs
 
         Returns:
-            Dictionary of agent name to total cost in USD
+            Dictionary of ticket ID to total cost in USD (0.0 for tickets
+            without usage)
         """
+        costs = dict.fromkeys(ticket_ids, 0.0)
+        if not costs:
+            return costs
+
+        placeholders = ", ".join("?" * len(costs))
         rows = await self.db.fetch_all(
-            """
-            SELECT agent_name,
-                   SUM(input_cost_usd + output_cost_usd) as total_cost
+            f"""
+            SELECT ticket_id, SUM(input_cost_usd + output_cost_usd)
             FROM token_usage
-            GROUP BY agent_name
-            """
+            WHERE ticket_id IN ({placeholders})
+            GROUP BY ticket_id
+            """,
+            tuple(costs),
         )
+        costs.update(rows)
+        return costs
 
-        return {row["agent_name"]: row["total_cost"] for row in rows}
+    async def get_version(self) -> int:
+        """Get a value that changes whenever token usage rows are added.
 
-    async def get_total_cost_by_model(self) -> dict[str, float]:
-        """Get total cost by model.
+        Usage rows are only ever inserted, so the largest rowid identifies
+        the table's contents; it is read from the end of the rowid B-tree.
 
         Returns:
-            Dictionary of model name to total cost in USD
+            The current version (0 for an empty table)
         """
-        rows = await self.db.fetch_all(
-            """
-            SELECT model_name,
-                   SUM(input_cost_usd + output_cost_usd) as total_cost
-            FROM token_usage
-            GROUP BY model_name
-            """
-        )
+        row = await self.db.fetch_one("SELECT MAX(rowid) FROM token_usage")
+        return row[0] or 0
 
-        return {row["model_name"]: row["total_cost"] for row in rows}
+    async def get_aggregates(self) -> UsageAggregates:
+        """Get the usage summary and per-agent and per-model totals in one query.
 
-    async def get_summary(self) -> dict:
-        """Get overall usage summary.
+        Reads only the rollup tables, so the cost doesn't grow with
+        token_usage.
 
         Returns:
-            Summary statistics
+            Tuple of (summary, agent to cost, model to cost, agent to token
+            counts)
         """
-        row = await self.db.fetch_one(
+        rows = await self.db.fetch_all(
             """
-            SELECT
-                COUNT(*) as total_requests,
-                SUM(input_tokens) as total_input_tokens,
-                SUM(output_tokens) as total_output_tokens,
-                SUM(input_cost_usd) as total_input_cost,
-                SUM(output_cost_usd) as total_output_cost,
-                SUM(cached_tokens) as total_cached_tokens
-            FROM token_usage
+            SELECT 'total' AS dimension, NULL AS key, SUM(requests),
+                   SUM(input_tokens), SUM(output_tokens),
+                   SUM(input_cost_usd), SUM(output_cost_usd), SUM(cached_tokens)
+            FROM usage_agg_by_agent
+            UNION ALL
+            SELECT 'agent', agent_name, requests, input_tokens, output_tokens,
+                   input_cost_usd, output_cost_usd, cached_tokens
+            FROM usage_agg_by_agent
+            UNION ALL
+            SELECT 'model', model_name, requests, input_tokens, output_tokens,
+                   input_cost_usd, output_cost_usd, cached_tokens
+            FROM usage_agg_by_model
             """
         )
 
-        if not row:
-            return {
-                "total_requests": 0,
-                "total_input_tokens": 0,
-                "total_output_tokens": 0,
-                "total_tokens": 0,
-                "total_input_cost_usd": 0.0,
-                "total_output_cost_usd": 0.0,
-                "total_cost_usd": 0.0,
-                "total_cached_tokens": 0,
-            }
-
-        return {
-            "total_requests": row["total_requests"] or 0,
-            "total_input_tokens": row["total_input_tokens"] or 0,
-            "total_output_tokens": row["total_output_tokens"] or 0,
-            "total_tokens": (row["total_input_tokens"] or 0) + (row["total_output_tokens"] or 0),
-            "total_input_cost_usd": row["total_input_cost"] or 0.0,
-            "total_output_cost_usd": row["total_output_cost"] or 0.0,
-            "total_cost_usd": (row["total_input_cost"] or 0.0) + (row["total_output_cost"] or 0.0),
-            "total_cached_tokens": row["total_cached_tokens"] or 0,
-        }
+        summary: dict = {}
+        cost_by_agent: dict[str, float] = {}
+        cost_by_model: dict[str, float] = {}
+        tokens_by_agent: dict[str, dict[str, int]] = {}
+        for (
+            dimension, key, requests, input_tokens, output_tokens,
+            input_cost, output_cost, cached_tokens,
+        ) in rows:
+            if dimension == "total":
+                summary = _summary_from_totals(
+                    requests, input_tokens, output_tokens,
+                    input_cost, output_cost, cached_tokens,
+                )
+            elif dimension == "agent":
+                cost_by_agent[key] = input_cost + output_cost
+                tokens_by_agent[key] = {
+                    "input_tokens": input_tokens,
+                    "output_tokens": output_tokens,
+                    "total_tokens": input_tokens + output_tokens,
+                }
+            else:
+                cost_by_model[key] = input_cost + output_cost
+
+        return summary, cost_by_agent, cost_by_model, tokens_by_agent
 
     # Model pricing methods
 
@@ -239,16 +282,12 @@ class UsageRepository:
         Returns:
             Model pricing or None if not found
         """
-        row = await self.db.fetch_one(
+        return await self.db.fetch_one(
             "SELECT * FROM model_pricing WHERE model_name = ?",
             (model_name,),
+            row_factory=ModelPricing.from_row,
         )
 
-        if not row:
-            return None
-
-        return ModelPricing.from_dict(dict(row))
-
     async def upsert_model_pricing(self, pricing: ModelPricing) -> ModelPricing:
         """Insert or update model pricing.
 
@@ -258,24 +297,7 @@ class UsageRepository:
         Returns:
             The upserted model pricing
         """
-        data = pricing.to_dict()
-
-        await self.db.execute(
-            """
-            INSERT OR REPLACE INTO model_pricing
-            (model_name, provider, input_cost_per_1k, output_cost_per_1k,
-             cached_input_cost_per_1k, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                data["model_name"],
-                data["provider"],
-                data["input_cost_per_1k"],
-                data["output_cost_per_1k"],
-                data["cached_input_cost_per_1k"],
-                data["updated_at"],
-            ),
-        )
+        await self.db.execute(UPSERT_MODEL_PRICING_SQL, pricing.to_row())
 
         return pricing
 
@@ -285,8 +307,61 @@ class UsageRepository:
         Returns:
             List of model pricing records
         """
-        rows = await self.db.fetch_all(
-            "SELECT * FROM model_pricing ORDER BY provider, model_name"
+        return await self.db.fetch_all(
+            "SELECT * FROM model_pricing ORDER BY provider, model_name",
+            row_factory=ModelPricing.from_row,
         )
 
-        return [ModelPricing.from_dict(dict(row)) for row in rows]
+
+def _rollup(
+    usages: List[TokenUsage],
+    key: Callable[[TokenUsage], str],
+) -> list[tuple]:
+    """Total token usage records per key, as UPSERT_USAGE_AGG_SQL parameters.
+
+    Args:
+        usages: Token usage records
+        key: Returns the rollup key (agent or model name) of a record
+
+    Returns:
+        One (key, requests, input tokens, output tokens, input cost, output
+        cost, cached tokens) tuple per distinct key
+    """
+    totals: dict[str, list] = {}
+    for usage in usages:
+        name = key(usage)
+        row = totals.get(name)
+        if row is None:
+            row = totals[name] = [0, 0, 0, 0.0, 0.0, 0]
+        row[0] += 1
+        row[1] += usage.input_tokens
+        row[2] += usage.output_tokens
+        row[3] += usage.input_cost_usd
+        row[4] += usage.output_cost_usd
+        row[5] += usage.cached_tokens
+    return [(name, *row) for name, row in totals.items()]
+
+
+def _summary_from_totals(
+    requests: int,
+    input_tokens: int | None,
+    output_tokens: int | None,
+    input_cost: float | None,
+    output_cost: float | None,
+    cached_tokens: int | None,
+) -> dict:
+    """Build the usage summary dict from SUM() results, which are NULL when empty."""
+    input_tokens = input_tokens or 0
+    output_tokens = output_tokens or 0
+    input_cost = input_cost or 0.0
+    output_cost = output_cost or 0.0
+    return {
+        "total_requests": requests or 0,
+        "total_input_tokens": input_tokens,
+        "total_output_tokens": output_tokens,
+        "total_tokens": input_tokens + output_tokens,
+        "total_input_cost_usd": input_cost,
+        "total_output_cost_usd": output_cost,
+        "total_cost_usd": input_cost + output_cost,
+        "total_cached_tokens": cached_tokens or 0,
+    }
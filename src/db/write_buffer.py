@@ -0,0 +1,95 @@
+"""Per-request buffering of audit, token usage and ticket writes."""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List
+
+from .connection import DatabaseConnection
+from .models import AuditLog, Ticket, TokenUsage
+from .repositories.audit_repository import AuditRepository
+from .repositories.ticket_repository import TicketRepository
+from .repositories.usage_repository import UsageRepository
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Buffer collecting rows for the current task, if any
+_current_buffer: ContextVar[WriteBuffer | None] = ContextVar("write_buffer", default=None)
+
+
+@dataclass
+class WriteBuffer:
+    """Audit and token usage rows and ticket updates waiting to be written together."""
+
+    audit_logs: List[AuditLog] = field(default_factory=list)
+    token_usage: List[TokenUsage] = field(default_factory=list)
+    ticket_updates: List[Ticket] = field(default_factory=list)
+
+    async def flush(self, db: DatabaseConnection) -> None:
+        """Write all buffered rows in one transaction and clear the buffer.
+
+        Args:
+            db: Database connection
+        """
+        if not self.audit_logs and not self.token_usage and not self.ticket_updates:
+            return
+
+        async with db.transaction():
+            await AuditRepository(db).create_many(self.audit_logs)
+            await UsageRepository(db).create_many(self.token_usage)
+            ticket_repo = TicketRepository(db)
+            for ticket in self.ticket_updates:
+                await ticket_repo.update(ticket)
+
+        logger.debug(
+            "write_buffer_flushed",
+            audit_logs=len(self.audit_logs),
+            token_usage=len(self.token_usage),
+            ticket_updates=len(self.ticket_updates),
+        )
+
+        self.audit_logs.clear()
+        self.token_usage.clear()
+        self.ticket_updates.clear()
+
+
+def current_write_buffer() -> WriteBuffer | None:
+    """Get the write buffer active for the current task.
+
+    Returns:
+        The active WriteBuffer, or None if writes should go straight to the DB
+    """
+    return _current_buffer.get()
+
+
+@asynccontextmanager
+async def buffered_writes(db: DatabaseConnection) -> AsyncIterator[WriteBuffer]:
+    """Buffer audit, token usage and ticket writes until the block exits.
+
+    Rows logged inside the block are flushed in a single transaction when it
+    exits, whether or not it raised. If the block raised, a failed flush is
+    logged and the original exception propagates.
+
+    Args:
+        db: Database connection
+
+    Yields:
+        The active WriteBuffer
+    """
+    buffer = WriteBuffer()
+    token = _current_buffer.set(buffer)
+    try:
+        yield buffer
+    except BaseException:
+        _current_buffer.reset(token)
+        try:
+            await buffer.flush(db)
+        except Exception as e:
+            logger.error("write_buffer_flush_failed", error=str(e))
+        raise
+
+    _current_buffer.reset(token)
+    await buffer.flush(db)
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any
+import asyncio
+import hashlib
+from dataclasses import dataclass, replace
+from typing import Any, Callable
 
 from openai import AsyncOpenAI
 from anthropic import AsyncAnthropic
-from tenacity import retry, stop_after_attempt, wait_exponential
 
 from ..config import Settings, get_settings
 from ..utils.enums import LLMProvider
@@ -16,6 +17,16 @@ from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Finish reasons meaning the response hit max_tokens (OpenAI, Anthropic)
+TRUNCATED_FINISH_REASONS = frozenset({"length", "max_tokens"})
+
+# Retries of rate-limited, timed-out and 5xx requests, done by the provider
+# SDKs with exponential backoff that honors Retry-After
+LLM_MAX_RETRIES = 2
+
+# Receives each text delta of a streamed response
+TokenCallback = Callable[[str], None]
+
 
 @dataclass
 class LLMResponse:
@@ -30,6 +41,11 @@ class LLMResponse:
     finish_reason: str | None = None
     raw_response: Any = None
 
+    @property
+    def truncated(self) -> bool:
+        """Whether generation stopped because it reached max_tokens."""
+        return self.finish_reason in TRUNCATED_FINISH_REASONS
+
 
 class LLMClient:
     """Unified client for OpenAI and Anthropic APIs."""
@@ -44,6 +60,20 @@ class LLMClient:
         self._openai_client: AsyncOpenAI | None = None
         self._anthropic_client: AsyncAnthropic | None = None
 
+        # Bounds requests in flight; identical coalescable completions share one
+        self._concurrency = asyncio.Semaphore(self.settings.llm_max_concurrency)
+        self._inflight: dict[bytes, asyncio.Future[LLMResponse]] = {}
+
+        # Provider-specific implementations, looked up once per request
+        self._complete_by_provider = {
+            LLMProvider.OPENAI: self._complete_openai,
+            LLMProvider.ANTHROPIC: self._complete_anthropic,
+        }
+        self._stream_by_provider = {
+            LLMProvider.OPENAI: self._stream_openai,
+            LLMProvider.ANTHROPIC: self._stream_anthropic,
+        }
+
     @property
     def openai_client(self) -> AsyncOpenAI:
         """Get or create the OpenAI client."""
@@ -53,7 +83,10 @@ class LLMClient:
                     "OpenAI API key not configured",
                     provider="openai",
                 )
-            self._openai_client = AsyncOpenAI(api_key=self.settings.openai_api_key)
+            self._openai_client = AsyncOpenAI(
+                api_key=self.settings.openai_api_key,
+                max_retries=LLM_MAX_RETRIES,
+            )
         return self._openai_client
 
     @property
@@ -65,13 +98,12 @@ class LLMClient:
                     "Anthropic API key not configured",
                     provider="anthropic",
                 )
-            self._anthropic_client = AsyncAnthropic(api_key=self.settings.anthropic_api_key)
+            self._anthropic_client = AsyncAnthropic(
+                api_key=self.settings.anthropic_api_key,
+                max_retries=LLM_MAX_RETRIES,
+            )
         return self._anthropic_client
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-    )
     async def complete(
         self,
         system_prompt: str,
@@ -80,9 +112,20 @@ class LLMClient:
         provider: LLMProvider | None = None,
         max_tokens: int = 1024,
         temperature: float = 0.7,
+        cache_key: str | None = None,
+        coalesce: bool = False,
     ) -> LLMResponse:
         """Send a completion request to the LLM.
 
+        Rate-limited, timed-out and 5xx requests are retried by the provider
+        SDK (see LLM_MAX_RETRIES); other errors fail immediately.
+
+        At most settings.llm_max_concurrency requests are sent at once. A
+        coalescable call (coalesce=True, or temperature 0) identical to one
+        already in flight waits for that request instead of sending its own.
+        Sampled replies are never shared between callers. Each caller gets the
+        request's token counts, so every ticket is charged for its reply.
+
         Args:
             system_prompt: System prompt for the model
             user_message: User message to process
@@ -90,6 +133,10 @@ class LLMClient:
             provider: LLM provider (optional, uses settings default)
             max_tokens: Maximum tokens in response
             temperature: Sampling temperature
+            cache_key: Enables provider prompt caching of the system prompt;
+                requests sharing a key are routed to the same cache
+            coalesce: Share the request with identical ones in flight even
+                though temperature is above 0
 
         Returns:
             LLMResponse with content and usage data
@@ -97,6 +144,70 @@ class LLMClient:
         provider = provider or self.settings.llm_provider
         model = model or self.settings.active_model
 
+        request_kwargs = dict(
+            system_prompt=system_prompt,
+            user_message=user_message,
+            model=model,
+            provider=provider,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            cache_key=cache_key,
+        )
+        if not coalesce and temperature != 0:
+            return await self._complete_once(**request_kwargs)
+
+        key = _request_key(provider, model, system_prompt, user_message, max_tokens, temperature)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            logger.debug("llm_request_coalesced", provider=provider.value, model=model)
+            # Copied so waiters don't share one mutable response
+            return replace(await asyncio.shield(inflight))
+
+        # Shielded so the request carries on for other waiters if this caller
+        # is cancelled
+        request = asyncio.ensure_future(self._complete_once(**request_kwargs))
+        self._inflight[key] = request
+        request.add_done_callback(lambda fut: self._request_done(key, fut))
+        return await asyncio.shield(request)
+
+    def _request_done(self, key: bytes, request: asyncio.Future) -> None:
+        """Forget a finished request and retrieve its error.
+
+        The error is also raised to any waiters; retrieving it here keeps it
+        from being reported as never retrieved when every waiter was cancelled.
+
+        Args:
+            key: Request key from _request_key
+            request: The finished request
+        """
+        self._inflight.pop(key, None)
+        if not request.cancelled() and request.exception() is not None:
+            logger.debug("llm_request_finished_with_error", error=str(request.exception()))
+
+    async def _complete_once(
+        self,
+        system_prompt: str,
+        user_message: str,
+        model: str,
+        provider: LLMProvider,
+        max_tokens: int,
+        temperature: float,
+        cache_key: str | None,
+    ) -> LLMResponse:
+        """Send one completion request once a concurrency slot is free.
+
+        Args:
+            system_prompt: System prompt
+            user_message: User message
+            model: Model name
+            provider: LLM provider
+            max_tokens: Max tokens
+            temperature: Temperature
+            cache_key: Prompt cache routing key
+
+        Returns:
+            LLMResponse
+        """
         logger.debug(
             "llm_request",
             provider=provider.value,
@@ -105,21 +216,14 @@ class LLMClient:
         )
 
         try:
-            if provider == LLMProvider.OPENAI:
-                return await self._complete_openai(
-                    system_prompt=system_prompt,
-                    user_message=user_message,
-                    model=model,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                )
-            else:
-                return await self._complete_anthropic(
+            async with self._concurrency:
+                return await self._complete_by_provider[provider](
                     system_prompt=system_prompt,
                     user_message=user_message,
                     model=model,
                     max_tokens=max_tokens,
                     temperature=temperature,
+                    cache_key=cache_key,
                 )
 
         except LLMError:
@@ -144,6 +248,7 @@ class LLMClient:
         model: str,
         max_tokens: int,
         temperature: float,
+        cache_key: str | None = None,
     ) -> LLMResponse:
         """Send completion request to OpenAI.
 
@@ -153,6 +258,7 @@ class LLMClient:
             model: Model name
             max_tokens: Max tokens
             temperature: Temperature
+            cache_key: Prompt cache routing key
 
         Returns:
             LLMResponse
@@ -165,6 +271,7 @@ class LLMClient:
             ],
             max_tokens=max_tokens,
             temperature=temperature,
+            extra_body=self._openai_extra_body(cache_key),
         )
 
         content = response.choices[0].message.content or ""
@@ -201,6 +308,7 @@ class LLMClient:
         model: str,
         max_tokens: int,
         temperature: float,
+        cache_key: str | None = None,
     ) -> LLMResponse:
         """Send completion request to Anthropic.
 
@@ -210,13 +318,14 @@ class LLMClient:
             model: Model name
             max_tokens: Max tokens
             temperature: Temperature
+            cache_key: Marks the system prompt as cacheable when set
 
         Returns:
             LLMResponse
         """
         response = await self.anthropic_client.messages.create(
             model=model,
-            system=system_prompt,
+            system=self._anthropic_system(system_prompt, cache_key),
             messages=[
                 {"role": "user", "content": user_message},
             ],
@@ -251,6 +360,212 @@ class LLMClient:
             raw_response=response,
         )
 
+    async def complete_stream(
+        self,
+        system_prompt: str,
+        user_message: str,
+        on_token: TokenCallback,
+        model: str | None = None,
+        provider: LLMProvider | None = None,
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+        cache_key: str | None = None,
+    ) -> LLMResponse:
+        """Stream a completion, passing each text delta to a callback.
+
+        The SDK retries a request that fails before streaming starts, but a
+        stream that fails part-way is not retried since part of the response
+        may already have been shown.
+
+        Args:
+            system_prompt: System prompt for the model
+            user_message: User message to process
+            on_token: Called with each text delta as it arrives
+            model: Model name (optional, uses settings default)
+            provider: LLM provider (optional, uses settings default)
+            max_tokens: Maximum tokens in response
+            temperature: Sampling temperature
+            cache_key: Enables provider prompt caching of the system prompt
+
+        Returns:
+            LLMResponse with the full content and usage data
+        """
+        provider = provider or self.settings.llm_provider
+        model = model or self.settings.active_model
+
+        logger.debug(
+            "llm_stream_request",
+            provider=provider.value,
+            model=model,
+            user_message_length=len(user_message),
+        )
+
+        try:
+            async with self._concurrency:
+                return await self._stream_by_provider[provider](
+                    system_prompt=system_prompt,
+                    user_message=user_message,
+                    on_token=on_token,
+                    model=model,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    cache_key=cache_key,
+                )
+
+        except LLMError:
+            raise
+        except Exception as e:
+            logger.error(
+                "llm_stream_failed",
+                provider=provider.value,
+                model=model,
+                error=str(e),
+            )
+            raise LLMError(
+                f"LLM stream failed: {e}",
+                provider=provider.value,
+                model=model,
+            )
+
+    async def _stream_openai(
+        self,
+        system_prompt: str,
+        user_message: str,
+        on_token: TokenCallback,
+        model: str,
+        max_tokens: int,
+        temperature: float,
+        cache_key: str | None = None,
+    ) -> LLMResponse:
+        """Stream a completion from OpenAI.
+
+        Args:
+            system_prompt: System prompt
+            user_message: User message
+            on_token: Text delta callback
+            model: Model name
+            max_tokens: Max tokens
+            temperature: Temperature
+            cache_key: Prompt cache routing key
+
+        Returns:
+            LLMResponse
+        """
+        stream = await self.openai_client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_message},
+            ],
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True,
+            stream_options={"include_usage": True},
+            extra_body=self._openai_extra_body(cache_key),
+        )
+
+        parts: list[str] = []
+        finish_reason = None
+        usage = None
+        async for chunk in stream:
+            # The final chunk carries usage and no choices
+            if chunk.usage:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            if choice.delta.content:
+                parts.append(choice.delta.content)
+                on_token(choice.delta.content)
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+
+        cached_tokens = 0
+        if usage and getattr(usage, "prompt_tokens_details", None):
+            cached_tokens = getattr(usage.prompt_tokens_details, "cached_tokens", 0) or 0
+
+        return LLMResponse(
+            content="".join(parts),
+            model=model,
+            provider="openai",
+            input_tokens=usage.prompt_tokens if usage else 0,
+            output_tokens=usage.completion_tokens if usage else 0,
+            cached_tokens=cached_tokens,
+            finish_reason=finish_reason,
+        )
+
+    async def _stream_anthropic(
+        self,
+        system_prompt: str,
+        user_message: str,
+        on_token: TokenCallback,
+        model: str,
+        max_tokens: int,
+        temperature: float,
+        cache_key: str | None = None,
+    ) -> LLMResponse:
+        """Stream a completion from Anthropic.
+
+        Args:
+            system_prompt: System prompt
+            user_message: User message
+            on_token: Text delta callback
+            model: Model name
+            max_tokens: Max tokens
+            temperature: Temperature
+            cache_key: Marks the system prompt as cacheable when set
+
+        Returns:
+            LLMResponse
+        """
+        async with self.anthropic_client.messages.stream(
+            model=model,
+            system=self._anthropic_system(system_prompt, cache_key),
+            messages=[
+                {"role": "user", "content": user_message},
+            ],
+            max_tokens=max_tokens,
+            temperature=temperature,
+        ) as stream:
+            async for text in stream.text_stream:
+                on_token(text)
+            response = await stream.get_final_message()
+
+        usage = response.usage
+
+        return LLMResponse(
+            content="".join(block.text for block in response.content if block.type == "text"),
+            model=model,
+            provider="anthropic",
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            cached_tokens=getattr(usage, "cache_read_input_tokens", 0) or 0,
+            finish_reason=response.stop_reason,
+            raw_response=response,
+        )
+
+    @staticmethod
+    def _openai_extra_body(cache_key: str | None) -> dict[str, Any] | None:
+        """Build extra OpenAI request fields for prompt caching.
+
+        OpenAI caches prompt prefixes automatically; the key keeps requests
+        with the same system prompt on the same cache.
+        """
+        return {"prompt_cache_key": cache_key} if cache_key else None
+
+    @staticmethod
+    def _anthropic_system(system_prompt: str, cache_key: str | None) -> Any:
+        """Build the Anthropic system parameter, marked cacheable if keyed."""
+        if not cache_key:
+            return system_prompt
+        return [
+            {
+                "type": "text",
+                "text": system_prompt,
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
+
     async def close(self) -> None:
         """Close the client connections."""
         if self._openai_client:
@@ -262,6 +577,34 @@ class LLMClient:
             self._anthropic_client = None
 
 
+def _request_key(
+    provider: LLMProvider,
+    model: str,
+    system_prompt: str,
+    user_message: str,
+    max_tokens: int,
+    temperature: float,
+) -> bytes:
+    """Build the key identifying identical completion requests.
+
+    Args:
+        provider: LLM provider
+        model: Model name
+        system_prompt: System prompt
+        user_message: User message
+        max_tokens: Max tokens
+        temperature: Temperature
+
+    Returns:
+        16-byte digest
+    """
+    return hashlib.blake2b(
+        f"{provider.value}\0{model}\0{max_tokens}\0{temperature}\0"
+        f"{system_prompt}\0{user_message}".encode("utf-8"),
+        digest_size=16,
+    ).digest()
+
+
 # Global client instance
 _llm_client: LLMClient | None = None
 
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-from ..db.models import TokenUsage, ModelPricing
+from ..db.models import TokenUsage
 from ..db.connection import DatabaseConnection
-from ..db.repositories.usage_repository import UsageRepository
+from ..db.repositories.usage_repository import UsageAggregates, UsageRepository
+from ..db.write_buffer import current_write_buffer
 from ..utils.logger import get_logger
 from .client import LLMResponse
 
@@ -21,7 +22,10 @@ class TokenTracker:
             db: Database connection
         """
         self.usage_repo = UsageRepository(db)
-        self._pricing_cache: dict[str, ModelPricing] = {}
+        # Per-token (input, cached input, output) rates by model name
+        self._token_rates: dict[str, tuple[float, float, float]] = {}
+        # Usage aggregates and the usage version they were computed at
+        self._aggregates_cache: tuple[int, UsageAggregates] | None = None
 
     async def track_usage(
         self,
@@ -40,21 +44,20 @@ class TokenTracker:
             Created TokenUsage record
         """
         # Get pricing for the model
-        pricing = await self._get_pricing(response.model)
+        rates = await self._get_token_rates(response.model)
 
         # Calculate costs
         input_cost = 0.0
         output_cost = 0.0
 
-        if pricing:
-            # Calculate input cost (considering cached tokens)
-            regular_input_tokens = response.input_tokens - response.cached_tokens
-            cached_input_cost = (response.cached_tokens / 1000) * pricing.cached_input_cost_per_1k
-            regular_input_cost = (regular_input_tokens / 1000) * pricing.input_cost_per_1k
-            input_cost = regular_input_cost + cached_input_cost
-
-            # Calculate output cost
-            output_cost = (response.output_tokens / 1000) * pricing.output_cost_per_1k
+        if rates:
+            input_rate, cached_input_rate, output_rate = rates
+            # Cached input tokens are billed at their own rate
+            input_cost = (
+                (response.input_tokens - response.cached_tokens) * input_rate
+                + response.cached_tokens * cached_input_rate
+            )
+            output_cost = response.output_tokens * output_rate
 
         # Create usage record
         usage = TokenUsage(
@@ -69,8 +72,12 @@ class TokenTracker:
             cached_tokens=response.cached_tokens,
         )
 
-        # Save to database
-        await self.usage_repo.create(usage)
+        # Save to database, batched when inside buffered_writes()
+        buffer = current_write_buffer()
+        if buffer is not None:
+            buffer.token_usage.append(usage)
+        else:
+            await self.usage_repo.create(usage)
 
         logger.info(
             "token_usage_tracked",
@@ -84,21 +91,35 @@ class TokenTracker:
 
         return usage
 
-    async def _get_pricing(self, model_name: str) -> ModelPricing | None:
-        """Get pricing for a model, using cache.
+    async def warm_pricing(self) -> None:
+        """Load pricing for every known model into the cache.
+
+        Called once at startup so pricing lookups during tracking are plain
+        dict hits; models added later are still loaded on first use.
+        """
+        self._token_rates = {
+            pricing.model_name: pricing.per_token_rates()
+            for pricing in await self.usage_repo.get_all_model_pricing()
+        }
+        logger.debug("pricing_cache_warmed", models=len(self._token_rates))
+
+    async def _get_token_rates(self, model_name: str) -> tuple[float, float, float] | None:
+        """Get a model's per-token rates, using cache.
 
         Args:
             model_name: Name of the model
 
         Returns:
-            Model pricing or None if not found
+            (input, cached input, output) cost per token in USD, or None if
+            the model has no pricing
         """
-        if model_name not in self._pricing_cache:
+        rates = self._token_rates.get(model_name)
+        if rates is None:
             pricing = await self.usage_repo.get_model_pricing(model_name)
             if pricing:
-                self._pricing_cache[model_name] = pricing
+                rates = self._token_rates[model_name] = pricing.per_token_rates()
 
-        return self._pricing_cache.get(model_name)
+        return rates
 
     async def get_ticket_cost(self, ticket_id: str) -> float:
         """Get total cost for a ticket.
@@ -111,6 +132,17 @@ class TokenTracker:
         """
         return await self.usage_repo.get_total_cost_by_ticket(ticket_id)
 
+    async def get_ticket_costs(self, ticket_ids: list[str]) -> dict[str, float]:
+        """Get total costs for several tickets.
+
+        Args:
+            ticket_ids: Ticket IDs
+
+        Returns:
+            Dictionary of ticket ID to total cost in USD
+        """
+        return await self.usage_repo.get_total_costs_by_tickets(ticket_ids)
+
     async def get_ticket_usage(self, ticket_id: str) -> list[TokenUsage]:
         """Get all usage records for a ticket.
 
@@ -128,7 +160,28 @@ class TokenTracker:
         Returns:
             Usage summary statistics
         """
-        return await self.usage_repo.get_summary()
+        summary, _, _, _ = await self.get_aggregates()
+        return summary
+
+    async def get_aggregates(self) -> UsageAggregates:
+        """Get the usage summary and per-agent and per-model breakdowns at once.
+
+        The result is cached until new token usage rows are written, so
+        repeated dashboard reads cost one index lookup instead of a full
+        aggregation. The returned dicts are shared and must not be modified.
+
+        Returns:
+            Tuple of (summary, agent to cost, model to cost, agent to token
+            counts)
+        """
+        version = await self.usage_repo.get_version()
+        cached = self._aggregates_cache
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        aggregates = await self.usage_repo.get_aggregates()
+        self._aggregates_cache = (version, aggregates)
+        return aggregates
 
     async def get_cost_by_agent(self) -> dict[str, float]:
         """Get total cost breakdown by agent.
@@ -136,7 +189,8 @@ class TokenTracker:
         Returns:
             Dictionary of agent name to total cost
         """
-        return await self.usage_repo.get_total_cost_by_agent()
+        _, cost_by_agent, _, _ = await self.get_aggregates()
+        return cost_by_agent
 
     async def get_cost_by_model(self) -> dict[str, float]:
         """Get total cost breakdown by model.
@@ -144,7 +198,8 @@ class TokenTracker:
         Returns:
             Dictionary of model name to total cost
         """
-        return await self.usage_repo.get_total_cost_by_model()
+        _, _, cost_by_model, _ = await self.get_aggregates()
+        return cost_by_model
 
     async def get_tokens_by_agent(self) -> dict[str, dict[str, int]]:
         """Get token usage breakdown by agent.
@@ -152,8 +207,9 @@ class TokenTracker:
         Returns:
             Dictionary of agent name to token counts
         """
-        return await self.usage_repo.get_total_tokens_by_agent()
+        _, _, _, tokens_by_agent = await self.get_aggregates()
+        return tokens_by_agent
 
     def clear_pricing_cache(self) -> None:
         """Clear the pricing cache."""
-        self._pricing_cache.clear()
+        self._token_rates.clear()
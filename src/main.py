@@ -1,9 +1,10 @@
 """Main entry point for IntelliFlow SupportFlow."""
 
 import asyncio
-import json
+from dataclasses import dataclass
 from pathlib import Path
 
+import orjson
 from dotenv import load_dotenv
 
 from .config import get_settings
@@ -14,6 +15,47 @@ from .agents.orchestrator import Orchestrator
 from .utils.logger import setup_logging, get_logger
 
 
+@dataclass(frozen=True, slots=True)
+class DemoMessage:
+    """A sample customer message run by the demo."""
+
+    customer_id: str
+    message: str
+    expected_category: str
+
+
+# Test messages for each category
+DEMO_MESSAGES = (
+    DemoMessage(
+        customer_id="CUST001",
+        message="Thank you for the excellent service! Your mobile app is amazing and made my banking so much easier.",
+        expected_category="positive",
+    ),
+    DemoMessage(
+        customer_id="CUST002",
+        message="I'm very frustrated with the unexpected fees on my account! I was charged $35 for something I don't understand.",
+        expected_category="negative",
+    ),
+    DemoMessage(
+        customer_id="CUST003",
+        message="What are your branch hours? I need to visit to open a new savings account.",
+        expected_category="query",
+    ),
+)
+
+
+def _dump_json(value: object) -> str:
+    """Format a value as indented JSON for display.
+
+    Args:
+        value: Value to format; unsupported types are shown via str()
+
+    Returns:
+        JSON text
+    """
+    return orjson.dumps(value, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+
+
 async def initialize() -> Orchestrator:
     """Initialize all components.
 
@@ -51,6 +93,7 @@ async def initialize() -> Orchestrator:
 
     # Create orchestrator
     orchestrator = Orchestrator(db=db, llm_client=llm_client)
+    await orchestrator.token_tracker.warm_pricing()
 
     logger.info("initialization_complete")
 
@@ -77,39 +120,28 @@ async def run_demo() -> None:
     print("IntelliFlow SupportFlow Demo")
     print("=" * 60 + "\n")
 
-    # Test messages for each category
-    test_messages = [
-        {
-            "customer_id": "CUST001",
-            "message": "Thank you for the excellent service! Your mobile app is amazing and made my banking so much easier.",
-            "expected_category": "positive",
-        },
-        {
-            "customer_id": "CUST002",
-            "message": "I'm very frustrated with the unexpected fees on my account! I was charged $35 for something I don't understand.",
-            "expected_category": "negative",
-        },
-        {
-            "customer_id": "CUST003",
-            "message": "What are your branch hours? I need to visit to open a new savings account.",
-            "expected_category": "query",
-        },
-    ]
-
     results = []
 
-    for test in test_messages:
+    # The customers are independent, so process them concurrently and print
+    # the outcomes in order afterwards
+    outcomes = await orchestrator.process_messages(
+        ((test.customer_id, test.message) for test in DEMO_MESSAGES),
+        return_exceptions=True,
+    )
+    costs = await orchestrator.token_tracker.get_ticket_costs(
+        [result.ticket.id for result in outcomes if not isinstance(result, BaseException)]
+    )
+
+    for test, result in zip(DEMO_MESSAGES, outcomes):
         print(f"\n{'-' * 50}")
-        print(f"Customer: {test['customer_id']}")
-        print(f"Message: {test['message']}")
-        print(f"Expected Category: {test['expected_category']}")
+        print(f"Customer: {test.customer_id}")
+        print(f"Message: {test.message}")
+        print(f"Expected Category: {test.expected_category}")
         print("-" * 50)
 
         try:
-            result = await orchestrator.process_message(
-                customer_id=test["customer_id"],
-                message=test["message"],
-            )
+            if isinstance(result, BaseException):
+                raise result
 
             print(f"\nClassification:")
             print(f"  Category: {result.classification.category.value}")
@@ -127,22 +159,19 @@ async def run_demo() -> None:
             print(f"  {result.response}")
 
             print(f"\nTicket ID: {result.ticket.id}")
-
-            # Get ticket details including costs
-            details = await orchestrator.get_ticket_details(result.ticket.id)
-            print(f"Total Cost: ${details['total_cost_usd']:.6f}")
+            print(f"Total Cost: ${costs[result.ticket.id]:.6f}")
 
             results.append({
-                "customer_id": test["customer_id"],
+                "customer_id": test.customer_id,
                 "ticket_id": result.ticket.id,
                 "category": result.classification.category.value,
-                "expected": test["expected_category"],
-                "match": result.classification.category.value == test["expected_category"],
-                "cost_usd": details["total_cost_usd"],
+                "expected": test.expected_category,
+                "match": result.classification.category.value == test.expected_category,
+                "cost_usd": costs[result.ticket.id],
             })
 
         except Exception as e:
-            logger.error("demo_error", error=str(e), customer_id=test["customer_id"])
+            logger.error("demo_error", error=str(e), customer_id=test.customer_id)
             print(f"\n[X] Error processing message: {e}")
 
     # Print summary
@@ -161,7 +190,7 @@ async def run_demo() -> None:
     stats = await orchestrator.get_statistics()
     print("\nSystem Statistics:")
     print(f"  Total tickets: {stats['tickets']['total_tickets']}")
-    print(f"  By category: {json.dumps(stats['tickets']['by_category'], indent=4)}")
+    print(f"  By category: {_dump_json(stats['tickets']['by_category'])}")
     print(f"  Total tokens used: {stats['usage']['total_tokens']}")
     print(f"  Total API cost: ${stats['usage']['total_cost_usd']:.6f}")
 
@@ -201,7 +230,7 @@ async def interactive_mode() -> None:
             if message.lower() == "stats":
                 stats = await orchestrator.get_statistics()
                 print("\nSystem Statistics:")
-                print(json.dumps(stats, indent=2, default=str))
+                print(_dump_json(stats))
                 continue
 
             try:
@@ -217,9 +246,8 @@ async def interactive_mode() -> None:
                 if result.requires_escalation:
                     print(f"\n[!]  This issue has been escalated: {result.escalation_reason}")
 
-                # Get cost
-                details = await orchestrator.get_ticket_details(result.ticket.id)
-                print(f"\n[Cost: ${details['total_cost_usd']:.6f}]")
+                cost = await orchestrator.token_tracker.get_ticket_cost(result.ticket.id)
+                print(f"\n[Cost: ${cost:.6f}]")
 
             except Exception as e:
                 print(f"\n[X] Error: {e}")
@@ -9,6 +9,7 @@ from typing import AsyncIterator, List
 from ..db.connection import DatabaseConnection
 from ..db.models import AuditLog
 from ..db.repositories.audit_repository import AuditRepository
+from ..db.write_buffer import current_write_buffer
 from ..utils.enums import AuditAction
 from ..utils.logger import get_logger
 
@@ -69,7 +70,12 @@ class AuditService:
             error_message=error_message,
         )
 
-        await self.audit_repo.create(audit_log)
+        # Within buffered_writes() the row is inserted with the rest of the batch
+        buffer = current_write_buffer()
+        if buffer is not None:
+            buffer.audit_logs.append(audit_log)
+        else:
+            await self.audit_repo.create(audit_log)
 
         log_fn = logger.info if success else logger.warning
         log_fn(
@@ -172,9 +178,7 @@ class AuditService:
         Returns:
             Dictionary with statistics
         """
-        by_agent = await self.audit_repo.count_by_agent()
-        by_action = await self.audit_repo.count_by_action()
-        avg_duration = await self.audit_repo.get_average_duration_by_agent()
+        by_agent, by_action, avg_duration = await self.audit_repo.get_aggregates()
 
         return {
             "by_agent": by_agent,
@@ -210,7 +214,7 @@ class ActionTracker:
         self.confidence_score: float | None = None
         self.success: bool = True
         self.error_message: str | None = None
-        self._start_time = time.perf_counter()
+        self._start_ns = time.perf_counter_ns()
 
     def set_output(
         self,
@@ -245,4 +249,4 @@ class ActionTracker:
         Returns:
             Duration in milliseconds
         """
-        return int((time.perf_counter() - self._start_time) * 1000)
+        return (time.perf_counter_ns() - self._start_ns) // 1_000_000
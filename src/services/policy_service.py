@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import hashlib
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 
@@ -11,8 +13,18 @@ from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Policy entries ("### POLICY-XXX: Title" then content) and category headings
+_POLICY_RE = re.compile(r"### (POLICY-\d+): (.+?)\n(.+?)(?=\n###|\n---|\Z)", re.DOTALL)
+_CATEGORY_RE = re.compile(r"^## (.+?)$", re.MULTILINE)
 
-@dataclass
+# Message words shorter than this are ignored by content-based search
+MIN_CONTENT_TERM_LENGTH = 5
+
+# Maximum number of memoized policy searches
+SEARCH_CACHE_MAX_ENTRIES = 1024
+
+
+@dataclass(frozen=True, slots=True)
 class Policy:
     """A banking policy rule."""
 
@@ -116,6 +128,18 @@ class PolicyService:
 
         self.policy_file = policy_file
         self.policies: dict[str, Policy] = {}
+        # Content hash of the loaded policy file, for keying derived caches
+        self.version = ""
+
+        # Content-based search index, built when policies are loaded
+        self._content_index: dict[str, set[str]] = {}
+        self._title_words: dict[str, frozenset[str]] = {}
+
+        # Per-instance memoization of searches and prompt formatting; both are
+        # pure over the policies, which are loaded once per instance
+        self._search_cache = lru_cache(maxsize=SEARCH_CACHE_MAX_ENTRIES)(self._search_policy_ids)
+        self._format_cache = lru_cache(maxsize=512)(self._format_policy_ids)
+
         self._load_policies()
 
     def _load_policies(self) -> None:
@@ -125,27 +149,24 @@ class PolicyService:
             return
 
         content = self.policy_file.read_text(encoding="utf-8")
+        self.version = hashlib.blake2b(content.encode("utf-8"), digest_size=8).hexdigest()
 
-        # Parse markdown to extract policies
-        # Pattern matches: ### POLICY-XXX: Title\nContent
-        pattern = r"### (POLICY-\d+): (.+?)\n(.+?)(?=\n###|\n---|\Z)"
-        matches = re.findall(pattern, content, re.DOTALL)
-
+        # Category headings in file order; each policy belongs to the last
+        # heading before it, found by advancing through them alongside the
+        # policies
+        category_positions = [(m.start(), m.group(1)) for m in _CATEGORY_RE.finditer(content)]
         current_category = "General"
-        category_pattern = r"## (.+?)\n"
-        categories = re.findall(category_pattern, content)
+        next_category = 0
 
-        # Build category mapping based on position
-        category_positions = [(m.start(), m.group(1)) for m in re.finditer(category_pattern, content)]
-
-        for policy_id, title, body in matches:
-            # Find which category this policy belongs to
-            policy_pos = content.find(f"### {policy_id}")
-            for pos, cat in reversed(category_positions):
-                if pos < policy_pos:
-                    current_category = cat
-                    break
+        for match in _POLICY_RE.finditer(content):
+            while (
+                next_category < len(category_positions)
+                and category_positions[next_category][0] < match.start()
+            ):
+                current_category = category_positions[next_category][1]
+                next_category += 1
 
+            policy_id, title, body = match.groups()
             policy = Policy(
                 id=policy_id,
                 title=title.strip(),
@@ -154,8 +175,31 @@ class PolicyService:
             )
             self.policies[policy_id] = policy
 
+        self._build_search_index()
+
         logger.info("policies_loaded", count=len(self.policies))
 
+    def _build_search_index(self) -> None:
+        """Index the loaded policies for content-based search.
+
+        A message word matches a policy when it is a substring of the
+        policy's lowercased content. Words never contain whitespace, so every
+        substring of at least MIN_CONTENT_TERM_LENGTH characters of each
+        whitespace-separated content token is indexed, making each match a
+        single dict lookup.
+        """
+        self._content_index = {}
+        for policy_id, policy in self.policies.items():
+            for token in set(policy.content.lower().split()):
+                for start in range(len(token) - MIN_CONTENT_TERM_LENGTH + 1):
+                    for end in range(start + MIN_CONTENT_TERM_LENGTH, len(token) + 1):
+                        self._content_index.setdefault(token[start:end], set()).add(policy_id)
+
+        self._title_words = {
+            policy_id: frozenset(policy.title.lower().split())
+            for policy_id, policy in self.policies.items()
+        }
+
     def get_policy(self, policy_id: str) -> Optional[Policy]:
         """Get a specific policy by ID.
 
@@ -171,6 +215,8 @@ class PolicyService:
         """Search for relevant policies based on message content.
 
         Uses keyword matching to find policies relevant to the customer message.
+        Results are memoized by normalized message (lowercased, whitespace
+        collapsed), so repeated phrasings skip the scan entirely.
 
         Args:
             message: Customer message to analyze
@@ -179,34 +225,8 @@ class PolicyService:
         Returns:
             List of relevant Policy objects
         """
-        message_lower = message.lower()
-        found_policy_ids: set[str] = set()
-
-        # Check keyword mappings
-        for keyword, policy_ids in self.KEYWORD_MAPPINGS.items():
-            if keyword in message_lower:
-                found_policy_ids.update(policy_ids)
-
-        # Also do content-based search
-        for policy_id, policy in self.policies.items():
-            # Check if key terms from policy appear in message
-            policy_terms = policy.content.lower()
-            message_words = set(message_lower.split())
-
-            # Look for significant term overlaps
-            if any(word in policy_terms for word in message_words if len(word) > 4):
-                if policy_id not in found_policy_ids:
-                    # Score by relevance - check title match
-                    title_words = set(policy.title.lower().split())
-                    if message_words & title_words:
-                        found_policy_ids.add(policy_id)
-
-        # Convert to Policy objects and sort by ID
-        policies = [
-            self.policies[pid]
-            for pid in sorted(found_policy_ids)
-            if pid in self.policies
-        ]
+        policy_ids = self._search_cache(" ".join(message.lower().split()), max_results)
+        policies = [self.policies[pid] for pid in policy_ids]
 
         logger.debug(
             "policies_searched",
@@ -214,7 +234,53 @@ class PolicyService:
             policies_found=len(policies),
         )
 
-        return policies[:max_results]
+        return policies
+
+    def search_cache_info(self) -> dict[str, int]:
+        """Get hit and size counters of the policy search cache.
+
+        Returns:
+            Dictionary with hits, misses, size and max_size
+        """
+        info = self._search_cache.cache_info()
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "max_size": info.maxsize,
+        }
+
+    def _search_policy_ids(self, message_lower: str, max_results: int) -> tuple[str, ...]:
+        """Find the IDs of policies relevant to a normalized message.
+
+        Args:
+            message_lower: Normalized customer message
+            max_results: Maximum number of policy IDs to return
+
+        Returns:
+            Tuple of matching policy IDs, sorted by ID
+        """
+        found_policy_ids: set[str] = set()
+
+        # Check keyword mappings
+        for keyword, policy_ids in self.KEYWORD_MAPPINGS.items():
+            if keyword in message_lower:
+                found_policy_ids.update(policy_ids)
+
+        # Also do content-based search: policies whose content contains a
+        # significant message word and whose title shares a word with it
+        message_words = set(message_lower.split())
+        for word in message_words:
+            if len(word) < MIN_CONTENT_TERM_LENGTH:
+                continue
+            for policy_id in self._content_index.get(word, ()):
+                if not message_words.isdisjoint(self._title_words[policy_id]):
+                    found_policy_ids.add(policy_id)
+
+        # Keep known policies only, sorted by ID
+        return tuple(
+            pid for pid in sorted(found_policy_ids) if pid in self.policies
+        )[:max_results]
 
     def get_all_policies(self) -> List[Policy]:
         """Get all loaded policies.
@@ -236,6 +302,34 @@ class PolicyService:
         if not policies:
             return ""
 
+        # Only policies owned by this service can be cached by ID
+        policy_ids = tuple(policy.id for policy in policies)
+        if all(self.policies.get(pid) is policy for pid, policy in zip(policy_ids, policies)):
+            return self._format_cache(policy_ids)
+
+        return self._format_policies(policies)
+
+    def _format_policy_ids(self, policy_ids: tuple[str, ...]) -> str:
+        """Format loaded policies, looked up by ID, for an LLM prompt.
+
+        Args:
+            policy_ids: IDs of loaded policies
+
+        Returns:
+            Formatted string for prompt injection
+        """
+        return self._format_policies([self.policies[pid] for pid in policy_ids])
+
+    @staticmethod
+    def _format_policies(policies: List[Policy]) -> str:
+        """Build the prompt block for a list of policies.
+
+        Args:
+            policies: Policies to format
+
+        Returns:
+            Formatted string for prompt injection
+        """
         lines = ["[Relevant Bank Policies - cite these in your response:]"]
         for policy in policies:
             lines.append(f"\n{policy.id} ({policy.title}):")
@@ -0,0 +1,114 @@
+"""Optional Redis-backed persistence for UI session snapshots."""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Optional
+
+import orjson
+
+from ..config import Settings, get_settings
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# How long an idle session snapshot is kept
+SESSION_TTL_SECONDS = 86400
+
+
+class SessionStore:
+    """Stores UI session snapshots in Redis so sessions survive restarts."""
+
+    def __init__(self, redis_url: str, ttl_seconds: int = SESSION_TTL_SECONDS):
+        """Initialize the session store.
+
+        Args:
+            redis_url: Redis connection URL
+            ttl_seconds: Expiry applied to each saved snapshot
+        """
+        # Imported lazily so redis is only required when persistence is enabled
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(redis_url)
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        """Get the Redis key for a session."""
+        return f"session:{session_id}"
+
+    async def save(self, session_id: str, snapshot: dict[str, Any]) -> None:
+        """Save a session snapshot, logging rather than raising on failure.
+
+        Args:
+            session_id: Session identifier
+            snapshot: JSON-serializable session data
+        """
+        try:
+            await self._redis.set(
+                self._key(session_id),
+                orjson.dumps(snapshot),
+                ex=self.ttl_seconds,
+            )
+        except Exception as e:
+            logger.warning("session_save_failed", session_id=session_id, error=str(e))
+
+    async def load(self, session_id: str) -> Optional[dict[str, Any]]:
+        """Load a session snapshot.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            The saved snapshot, or None if missing or unavailable
+        """
+        try:
+            blob = await self._redis.get(self._key(session_id))
+        except Exception as e:
+            logger.warning("session_load_failed", session_id=session_id, error=str(e))
+            return None
+
+        return orjson.loads(blob) if blob else None
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        await self._redis.aclose()
+
+
+# Global instance for easy access
+_session_store: Optional[SessionStore] = None
+
+# Serializes first-time creation of the global store across script threads
+_session_store_lock = threading.Lock()
+
+
+def get_session_store(settings: Settings | None = None) -> Optional[SessionStore]:
+    """Get the global SessionStore, or None when REDIS_URL is not configured.
+
+    Args:
+        settings: Optional settings instance
+
+    Returns:
+        SessionStore instance or None
+    """
+    global _session_store
+
+    settings = settings or get_settings()
+    if not settings.redis_url:
+        return None
+
+    if _session_store is None:
+        with _session_store_lock:
+            if _session_store is None:
+                _session_store = SessionStore(settings.redis_url)
+
+    return _session_store
+
+
+async def close_session_store() -> None:
+    """Close the global SessionStore."""
+    global _session_store
+
+    if _session_store:
+        await _session_store.close()
+        _session_store = None
@@ -7,6 +7,7 @@ from typing import List
 from ..db.connection import DatabaseConnection
 from ..db.models import Ticket
 from ..db.repositories.ticket_repository import TicketRepository
+from ..db.write_buffer import current_write_buffer
 from ..utils.enums import MessageCategory, TicketStatus, TicketPriority
 from ..utils.logger import get_logger
 
@@ -84,7 +85,13 @@ class TicketService:
         Returns:
             The updated ticket
         """
-        updated = await self.ticket_repo.update(ticket)
+        # Within buffered_writes() the update is written with the rest of the batch
+        buffer = current_write_buffer()
+        if buffer is not None:
+            buffer.ticket_updates.append(ticket)
+            updated = ticket
+        else:
+            updated = await self.ticket_repo.update(ticket)
 
         logger.info(
             "ticket_updated",
@@ -94,6 +101,17 @@ class TicketService:
 
         return updated
 
+    async def save_classification(self, ticket: Ticket) -> Ticket:
+        """Persist a ticket's classification without its other fields.
+
+        Args:
+            ticket: Ticket with updated category and metadata
+
+        Returns:
+            The updated ticket
+        """
+        return await self.ticket_repo.update_classification(ticket)
+
     async def set_response(
         self,
         ticket_id: str,
@@ -110,12 +128,7 @@ class TicketService:
         Returns:
             The updated ticket
         """
-        ticket = await self.ticket_repo.get_by_id(ticket_id)
-        ticket.agent_response = response
-        ticket.handler_agent = handler_agent
-        ticket.status = TicketStatus.IN_PROGRESS
-
-        return await self.ticket_repo.update(ticket)
+        return await self.ticket_repo.set_response(ticket_id, response, handler_agent)
 
     async def resolve_ticket(
         self,
@@ -131,12 +144,7 @@ class TicketService:
         Returns:
             The resolved ticket
         """
-        if response:
-            ticket = await self.ticket_repo.resolve(ticket_id, response)
-        else:
-            ticket = await self.ticket_repo.get_by_id(ticket_id)
-            ticket.status = TicketStatus.RESOLVED
-            ticket = await self.ticket_repo.update(ticket)
+        ticket = await self.ticket_repo.resolve(ticket_id, response or None)
 
         logger.info("ticket_resolved", ticket_id=ticket_id)
 
@@ -151,12 +159,11 @@ class TicketService:
 
         Returns:
             The escalated ticket
-        """
-        ticket = await self.ticket_repo.get_by_id(ticket_id)
-        ticket.status = TicketStatus.ESCALATED
-        ticket.metadata["escalation_reason"] = reason
 
-        updated = await self.ticket_repo.update(ticket)
+        Raises:
+            TicketNotFoundError: If ticket not found
+        """
+        updated = await self.ticket_repo.escalate(ticket_id, reason)
 
         logger.info(
             "ticket_escalated",
@@ -216,8 +223,7 @@ class TicketService:
         Returns:
             Dictionary with statistics
         """
-        by_status = await self.ticket_repo.count_by_status()
-        by_category = await self.ticket_repo.count_by_category()
+        by_status, by_category = await self.ticket_repo.count_by_status_and_category()
 
         total = sum(by_status.values())
 
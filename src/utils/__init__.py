@@ -1,6 +1,16 @@
 """Utility modules."""
 
-from .enums import MessageCategory, TicketStatus, TicketPriority, LLMProvider, AuditAction
+from .enums import (
+    MessageCategory,
+    TicketStatus,
+    TicketPriority,
+    LLMProvider,
+    AuditAction,
+    MESSAGE_CATEGORY_BY_VALUE,
+    TICKET_STATUS_BY_VALUE,
+    TICKET_PRIORITY_BY_VALUE,
+    AUDIT_ACTION_BY_VALUE,
+)
 from .exceptions import (
     SupportFlowError,
     ClassificationError,
@@ -9,6 +19,7 @@ from .exceptions import (
     ConfigurationError,
 )
 from .logger import get_logger, setup_logging
+from .text import compile_keyword_pattern
 
 __all__ = [
     "MessageCategory",
@@ -16,6 +27,10 @@ __all__ = [
     "TicketPriority",
     "LLMProvider",
     "AuditAction",
+    "MESSAGE_CATEGORY_BY_VALUE",
+    "TICKET_STATUS_BY_VALUE",
+    "TICKET_PRIORITY_BY_VALUE",
+    "AUDIT_ACTION_BY_VALUE",
     "SupportFlowError",
     "ClassificationError",
     "LLMError",
@@ -23,4 +38,5 @@ __all__ = [
     "ConfigurationError",
     "get_logger",
     "setup_logging",
+    "compile_keyword_pattern",
 ]
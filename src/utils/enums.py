@@ -47,3 +47,11 @@ class AuditAction(str, Enum):
     ESCALATE = "escalate"
     CREATE_TICKET = "create_ticket"
     UPDATE_TICKET = "update_ticket"
+
+
+# Stored values to enum members, for converting database rows and parsed LLM
+# output with a dict lookup instead of an Enum constructor call
+MESSAGE_CATEGORY_BY_VALUE = {member.value: member for member in MessageCategory}
+TICKET_STATUS_BY_VALUE = {member.value: member for member in TicketStatus}
+TICKET_PRIORITY_BY_VALUE = {member.value: member for member in TicketPriority}
+AUDIT_ACTION_BY_VALUE = {member.value: member for member in AuditAction}
@@ -12,18 +12,24 @@ import structlog
 def setup_logging(
     level: str = "INFO",
     log_format: str = "json",
+    use_contextvars: bool = True,
 ) -> None:
     """Configure structured logging for the application.
 
     Args:
         level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_format: Output format ("json" or "console")
+        use_contextvars: Merge values bound with
+            structlog.contextvars.bind_contextvars into every event; callers
+            that never bind any can disable this to skip the lookup per event
     """
+    numeric_level = getattr(logging, level.upper())
+
     # Configure standard library logging
     logging.basicConfig(
         format="%(message)s",
         stream=sys.stdout,
-        level=getattr(logging, level.upper()),
+        level=numeric_level,
     )
 
     # Choose processors based on format
@@ -32,19 +38,22 @@ def setup_logging(
     else:
         renderer = structlog.dev.ConsoleRenderer(colors=True)
 
+    processors = [
+        structlog.processors.add_log_level,
+        structlog.processors.StackInfoRenderer(),
+        structlog.processors.TimeStamper(fmt="iso"),
+        structlog.processors.format_exc_info,
+        renderer,
+    ]
+    if use_contextvars:
+        processors.insert(0, structlog.contextvars.merge_contextvars)
+
     # Configure structlog
     structlog.configure(
-        processors=[
-            structlog.contextvars.merge_contextvars,
-            structlog.processors.add_log_level,
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.processors.format_exc_info,
-            renderer,
-        ],
-        wrapper_class=structlog.make_filtering_bound_logger(
-            getattr(logging, level.upper())
-        ),
+        processors=processors,
+        # Calls below the level are no-ops on the bound logger itself, so
+        # filtered events never reach the processors above
+        wrapper_class=structlog.make_filtering_bound_logger(numeric_level),
         context_class=dict,
         logger_factory=structlog.PrintLoggerFactory(),
         cache_logger_on_first_use=True,
@@ -0,0 +1,22 @@
+"""Text matching helpers."""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+
+def compile_keyword_pattern(keywords: Iterable[str]) -> re.Pattern[str]:
+    """Compile keywords into a single case-insensitive alternation.
+
+    Matches are anchored at a word start, so "sue" does not match inside
+    "issue" while stems such as "fraud" still match "fraudulent".
+
+    Args:
+        keywords: Keywords or phrases to match
+
+    Returns:
+        Compiled pattern whose first group is the matched keyword
+    """
+    alternation = "|".join(map(re.escape, keywords))
+    return re.compile(rf"\b({alternation})", re.IGNORECASE)
@@ -24,12 +24,15 @@ from src.db.connection import DatabaseConnection
 from src.db.migrations import run_migrations
 from src.db.models import Ticket
 from src.db.repositories.ticket_repository import TicketRepository
-from src.utils.enums import MessageCategory, TicketStatus, TicketPriority
+from src.utils.enums import LLMProvider, MessageCategory, TicketStatus, TicketPriority
 from src.utils.exceptions import ChaosError
-from src.llm.client import LLMResponse
+from src.config import Settings
+from src.llm.client import LLMClient, LLMResponse
 from src.agents.classifier_agent import ClassifierAgent, ClassificationResult
 from src.agents.query_handler import QueryHandler, HandlerResponse
+from src.agents.negative_handler import NegativeHandler
 from src.agents.orchestrator import Orchestrator
+from src.agents.response_cache import CachedResponse, ResponseCache
 from src.services.ticket_service import TicketService
 from src.services.audit_service import AuditService
 from src.llm.token_tracker import TokenTracker
@@ -67,43 +70,47 @@ def mock_token_tracker():
     return tracker
 
 
+# Stand-ins for the ActionTracker context manager returned by track_action
+@dataclass
+class MockTracker:
+    def set_output(self, output_summary: str, reasoning: str = None, confidence: float = None):
+        pass
+
+
+class MockContextManager:
+    async def __aenter__(self):
+        return MockTracker()
+    async def __aexit__(self, *args):
+        pass
+
+
 @pytest.fixture
 def mock_audit_service():
     """Create a mock audit service."""
     service = MagicMock(spec=AuditService)
     service.log_action = AsyncMock()
     service.get_ticket_audit_trail = AsyncMock(return_value=[])
-
-    # Create a context manager mock for track_action
-    @dataclass
-    class MockTracker:
-        def set_output(self, output_summary: str):
-            pass
-
-    class MockContextManager:
-        async def __aenter__(self):
-            return MockTracker()
-        async def __aexit__(self, *args):
-            pass
-
     service.track_action = MagicMock(return_value=MockContextManager())
     return service
 
 
+# Fields shared by every mocked LLM response
+_BASE_LLM_KWARGS = {
+    "model": "test-model",
+    "provider": "test",
+    "input_tokens": 100,
+    "output_tokens": 50,
+    "cached_tokens": 0,
+}
+
+
 def create_llm_response(content: str) -> LLMResponse:
     """Helper to create an LLM response."""
-    return LLMResponse(
-        content=content,
-        model="test-model",
-        provider="test",
-        input_tokens=100,
-        output_tokens=50,
-        cached_tokens=0,
-    )
+    return LLMResponse(content=content, **_BASE_LLM_KWARGS)
 
 
 # ============================================================================
-# Classifier Tests - POSITIVE (2 test cases)
+# Classifier Tests - POSITIVE (4 test cases)
 # ============================================================================
 
 class TestClassifierPositive:
@@ -163,6 +170,54 @@ class TestClassifierPositive:
         assert result.category == MessageCategory.POSITIVE
         assert 0.0 <= result.confidence <= 1.0
 
+    @pytest.mark.asyncio
+    async def test_positive_message_reply_drafted_with_classification(self, test_db, mock_llm_client, mock_token_tracker, mock_audit_service):
+        """Test that the single-call path returns a reply only for POSITIVE messages."""
+        mock_llm_client.complete.return_value = create_llm_response(
+            json.dumps({
+                "category": "positive",
+                "confidence": 0.93,
+                "reasoning": "Customer expressing gratitude",
+                "response": "Thank you for the kind words!"
+            })
+        )
+
+        classifier = ClassifierAgent(
+            db=test_db,
+            llm_client=mock_llm_client,
+            token_tracker=mock_token_tracker,
+            audit_service=mock_audit_service,
+        )
+
+        result, reply = await classifier.process_and_respond(
+            ticket_id="test-ticket-3",
+            message="Thanks for the quick help today!"
+        )
+
+        assert result.category == MessageCategory.POSITIVE
+        assert reply == "Thank you for the kind words!"
+        assert mock_llm_client.complete.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_obvious_positive_message_skips_llm(self, test_db, mock_llm_client, mock_token_tracker, mock_audit_service):
+        """Test that a bare thank-you is classified without calling the LLM."""
+        classifier = ClassifierAgent(
+            db=test_db,
+            llm_client=mock_llm_client,
+            token_tracker=mock_token_tracker,
+            audit_service=mock_audit_service,
+        )
+
+        result, reply = await classifier.process_and_respond(
+            ticket_id="test-ticket-4",
+            message="Thank you so much!"
+        )
+
+        assert result.category == MessageCategory.POSITIVE
+        assert result.confidence >= 0.95
+        assert reply is None
+        mock_llm_client.complete.assert_not_awaited()
+
 
 # ============================================================================
 # Classifier Tests - NEGATIVE (2 test cases)
@@ -226,7 +281,7 @@ class TestClassifierNegative:
 
 
 # ============================================================================
-# Classifier Tests - QUERY (2 test cases)
+# Classifier Tests - QUERY (4 test cases)
 # ============================================================================
 
 class TestClassifierQuery:
@@ -284,6 +339,68 @@ class TestClassifierQuery:
         assert result.category == MessageCategory.QUERY
         assert isinstance(result, ClassificationResult)
 
+    @pytest.mark.asyncio
+    async def test_repeated_query_reuses_classification(self, test_db, mock_llm_client, mock_token_tracker, mock_audit_service):
+        """Test that a repeated message is classified once by the LLM."""
+        mock_llm_client.complete.return_value = create_llm_response(
+            json.dumps({
+                "category": "query",
+                "confidence": 0.93,
+                "reasoning": "Customer asking about fees"
+            })
+        )
+
+        classifier = ClassifierAgent(
+            db=test_db,
+            llm_client=mock_llm_client,
+            token_tracker=mock_token_tracker,
+            audit_service=mock_audit_service,
+        )
+
+        first = await classifier.process(
+            ticket_id="test-ticket-7",
+            message="What is the fee for a wire transfer?"
+        )
+        second = await classifier.process(
+            ticket_id="test-ticket-8",
+            message="what is the fee for a  wire transfer?"
+        )
+
+        assert second.category == first.category == MessageCategory.QUERY
+        assert mock_llm_client.complete.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_single_call_path_keeps_its_own_cache_entry(self, test_db, mock_llm_client, mock_token_tracker, mock_audit_service):
+        """Test that a classification from process() is not reused by process_and_respond()."""
+        mock_llm_client.complete.side_effect = [
+            create_llm_response(json.dumps({
+                "category": "positive",
+                "confidence": 0.9,
+                "reasoning": "Customer expressing gratitude"
+            })),
+            create_llm_response(json.dumps({
+                "category": "positive",
+                "confidence": 0.9,
+                "reasoning": "Customer expressing gratitude",
+                "response": "Glad we could help!"
+            })),
+        ]
+
+        classifier = ClassifierAgent(
+            db=test_db,
+            llm_client=mock_llm_client,
+            token_tracker=mock_token_tracker,
+            audit_service=mock_audit_service,
+        )
+
+        message = "The new savings account is working out nicely for us"
+        await classifier.process(ticket_id="test-ticket-9", message=message)
+        _, reply = await classifier.process_and_respond(ticket_id="test-ticket-10", message=message)
+        _, repeat_reply = await classifier.process_and_respond(ticket_id="test-ticket-11", message=message)
+
+        assert reply == repeat_reply == "Glad we could help!"
+        assert mock_llm_client.complete.await_count == 2
+
 
 # ============================================================================
 # Database Tests - Ticket Creation
@@ -343,6 +460,24 @@ class TestDatabaseTicketCreation:
         assert len(negative_tickets) >= 1
         assert any(t.id == ticket.id for t in negative_tickets)
 
+    @pytest.mark.asyncio
+    async def test_transaction_rolls_back_joined_writes(self, test_db):
+        """Test that repository writes inside a transaction roll back together."""
+        ticket_repo = TicketRepository(test_db)
+        ticket = Ticket(
+            customer_id="customer-789",
+            customer_message="Please fix my account.",
+            category=MessageCategory.NEGATIVE,
+        )
+
+        with pytest.raises(RuntimeError):
+            async with test_db.transaction():
+                await ticket_repo.create(ticket)
+                assert await ticket_repo.get_by_id(ticket.id) is not None
+                raise RuntimeError("abort")
+
+        assert await ticket_repo.get_by_customer("customer-789") == []
+
 
 # ============================================================================
 # Query Handler Tests - Database Retrieval
@@ -399,7 +534,6 @@ class TestQueryHandlerDatabaseRetrieval:
             category=MessageCategory.QUERY,
             status=TicketStatus.RESOLVED,
         )
-        await ticket_repo.create(old_ticket)
 
         # Create current ticket
         current_ticket = Ticket(
@@ -407,15 +541,10 @@ class TestQueryHandlerDatabaseRetrieval:
             customer_message="New question about transfers",
             category=MessageCategory.QUERY,
         )
-        await ticket_repo.create(current_ticket)
-
-        # Setup mock - capture what's sent to LLM
-        captured_messages = []
-        async def capture_complete(**kwargs):
-            captured_messages.append(kwargs.get("user_message", ""))
-            return create_llm_response("Here's info about transfers.")
+        await ticket_repo.create_many([old_ticket, current_ticket])
 
-        mock_llm_client.complete = capture_complete
+        # Setup mock - the AsyncMock records what's sent to LLM
+        mock_llm_client.complete.return_value = create_llm_response("Here's info about transfers.")
 
         handler = QueryHandler(
             db=test_db,
@@ -430,11 +559,190 @@ class TestQueryHandlerDatabaseRetrieval:
         )
 
         # Verify history context was included
-        assert len(captured_messages) == 1
-        sent_message = captured_messages[0]
+        mock_llm_client.complete.assert_awaited_once()
+        sent_message = mock_llm_client.complete.call_args.kwargs["user_message"]
         assert "Previous interactions" in sent_message
 
 
+# ============================================================================
+# Negative Handler Tests - Escalation Detection
+# ============================================================================
+
+class TestNegativeHandlerEscalation:
+    """Test that complaint escalation triggers are detected correctly."""
+
+    @pytest.mark.asyncio
+    async def test_escalation_keyword_detected(self, test_db, mock_llm_client, mock_token_tracker, mock_audit_service):
+        """Test that an escalation keyword is detected regardless of case."""
+        handler = NegativeHandler(
+            db=test_db,
+            llm_client=mock_llm_client,
+            token_tracker=mock_token_tracker,
+            audit_service=mock_audit_service,
+        )
+
+        needs_escalation, reason = handler._check_escalation(
+            "There are FRAUDULENT charges on my card!"
+        )
+
+        assert needs_escalation is True
+        assert "fraud" in reason
+        assert handler._determine_priority("anything", needs_escalation) == TicketPriority.CRITICAL
+
+    @pytest.mark.asyncio
+    async def test_keyword_inside_word_not_escalated(self, test_db, mock_llm_client, mock_token_tracker, mock_audit_service):
+        """Test that a keyword embedded in another word does not escalate."""
+        handler = NegativeHandler(
+            db=test_db,
+            llm_client=mock_llm_client,
+            token_tracker=mock_token_tracker,
+            audit_service=mock_audit_service,
+        )
+
+        needs_escalation, reason = handler._check_escalation(
+            "I have an issue with the app being slow."
+        )
+
+        assert needs_escalation is False
+        assert reason is None
+
+    @pytest.mark.asyncio
+    async def test_truncated_response_retried(self, test_db, mock_llm_client, mock_token_tracker, mock_audit_service):
+        """Test that a response cut off at max_tokens is regenerated with the larger limit."""
+        truncated = create_llm_response("I'm sorry to hear")
+        truncated.finish_reason = "max_tokens"
+        mock_llm_client.complete.side_effect = [
+            truncated,
+            create_llm_response("I'm sorry to hear about the delay. Here is what we can do."),
+        ]
+
+        handler = NegativeHandler(
+            db=test_db,
+            llm_client=mock_llm_client,
+            token_tracker=mock_token_tracker,
+            audit_service=mock_audit_service,
+        )
+
+        result = await handler.process(ticket_id="ticket-1", message="My transfer is late.")
+
+        assert result.response.endswith("what we can do.")
+        limits = [call.kwargs["max_tokens"] for call in mock_llm_client.complete.call_args_list]
+        assert limits == [256, 768]
+        assert mock_token_tracker.track_usage.await_count == 2
+
+
+# ============================================================================
+# Response Cache Tests
+# ============================================================================
+
+class TestResponseCache:
+    """Test that cached replies are matched and invalidated correctly."""
+
+    def test_normalized_hit_and_policy_invalidation(self):
+        """Test that case/whitespace variants hit and a policy change misses."""
+        cache = ResponseCache(max_entries=2)
+        entry = CachedResponse(
+            classification=ClassificationResult(MessageCategory.POSITIVE, 0.9, "thanks"),
+            handler_name="positive_handler",
+            handler_response=HandlerResponse(response="You're welcome!", priority=TicketPriority.MINIMAL),
+        )
+        cache.put("Thanks  so much!", "v1", entry)
+
+        assert cache.get("thanks so much!", "v1") is entry
+        assert cache.get("thanks so much!", "v2") is None
+
+        # Least recently used entry is evicted past max_entries
+        cache.put("a", "v1", entry)
+        cache.put("b", "v1", entry)
+        assert cache.get("Thanks so much!", "v1") is None
+
+
+# ============================================================================
+# LLM Client Tests - Concurrency and Coalescing (3 test cases)
+# ============================================================================
+
+class TestLLMClientConcurrency:
+    """Test request coalescing and the concurrency limit of LLMClient."""
+
+    @staticmethod
+    def make_client(max_concurrency: int = 8) -> tuple[LLMClient, dict]:
+        """Create a client whose OpenAI calls wait on a gate and are counted."""
+        client = LLMClient(Settings(llm_provider=LLMProvider.OPENAI, llm_max_concurrency=max_concurrency))
+        state = {"calls": 0, "active": 0, "peak": 0, "gate": asyncio.Event()}
+
+        async def fake_openai(**kwargs):
+            state["calls"] += 1
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            try:
+                await state["gate"].wait()
+            finally:
+                state["active"] -= 1
+            return create_llm_response(f"reply to {kwargs['user_message']}")
+
+        client._complete_by_provider[LLMProvider.OPENAI] = fake_openai
+        return client, state
+
+    @pytest.mark.asyncio
+    async def test_only_coalescable_requests_are_shared(self):
+        """Test that identical coalesced requests share one call and sampled ones don't."""
+        client, state = self.make_client()
+
+        coalesced = [
+            asyncio.create_task(client.complete("sys", "hello", temperature=0.3, coalesce=True))
+            for _ in range(2)
+        ]
+        sampled = [
+            asyncio.create_task(client.complete("sys", "hello", temperature=0.7))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0.01)
+        state["gate"].set()
+        responses = await asyncio.gather(*coalesced, *sampled)
+
+        assert state["calls"] == 3
+        # Every caller is charged the usage of the reply it got
+        assert all(r.input_tokens == 100 and r.output_tokens == 50 for r in responses)
+        assert responses[0] is not responses[1]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_request(self):
+        """Test that a coalesced waiter still gets the reply when the first caller is cancelled."""
+        client, state = self.make_client()
+
+        first = asyncio.create_task(client.complete("sys", "hello", temperature=0))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(client.complete("sys", "hello", temperature=0))
+        await asyncio.sleep(0.01)
+
+        first.cancel()
+        state["gate"].set()
+        response = await second
+
+        assert first.cancelled()
+        assert response.content == "reply to hello"
+        assert state["calls"] == 1
+        assert client._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_requests_limited_to_max_concurrency(self):
+        """Test that no more than llm_max_concurrency requests run at once."""
+        client, state = self.make_client(max_concurrency=2)
+
+        tasks = [
+            asyncio.create_task(client.complete("sys", f"message {i}"))
+            for i in range(5)
+        ]
+        await asyncio.sleep(0.01)
+        assert state["active"] == 2
+
+        state["gate"].set()
+        await asyncio.gather(*tasks)
+
+        assert state["calls"] == 5
+        assert state["peak"] == 2
+
+
 # ============================================================================
 # Chaos Mode Tests
 # ============================================================================
@@ -451,20 +759,20 @@ class TestChaosMode:
             llm_client=mock_llm_client,
         )
 
-        # Run many times with chaos mode enabled
-        # With 30% probability, we should see at least one error in 50 attempts
+        # Scripted random bytes: checks fail below CHAOS_FAILURE_THRESHOLD (77),
+        # and each failure draws one more byte to pick its message
+        random_bytes = bytes([0, 1, 255, 76, 0, 77])
         errors_triggered = 0
-        for _ in range(50):
-            try:
-                orchestrator._maybe_trigger_chaos("TestComponent", chaos_mode=True)
-            except ChaosError as e:
-                errors_triggered += 1
-                assert "CHAOS" in str(e)
-                assert e.component == "TestComponent"
+        with patch("src.agents.orchestrator.os.urandom", return_value=random_bytes):
+            for _ in range(4):
+                try:
+                    orchestrator._maybe_trigger_chaos("TestComponent", chaos_mode=True)
+                except ChaosError as e:
+                    errors_triggered += 1
+                    assert "CHAOS" in str(e)
+                    assert e.component == "TestComponent"
 
-        # Statistical check: should trigger at least a few times out of 50
-        assert errors_triggered > 0, "Chaos mode should trigger at least once in 50 attempts"
-        assert errors_triggered < 50, "Chaos mode should not trigger every time"
+        assert errors_triggered == 2
 
     @pytest.mark.asyncio
     async def test_chaos_mode_disabled_no_errors(self, test_db, mock_llm_client):
@@ -474,12 +782,12 @@ class TestChaosMode:
             llm_client=mock_llm_client,
         )
 
-        # Run many times with chaos mode disabled
-        for _ in range(100):
-            # Should never raise when chaos_mode=False
-            orchestrator._maybe_trigger_chaos("TestComponent", chaos_mode=False)
+        # Bytes that would always fail, if chaos mode consulted them
+        with patch("src.agents.orchestrator.os.urandom", return_value=bytes(64)) as urandom:
+            for _ in range(10):
+                orchestrator._maybe_trigger_chaos("TestComponent", chaos_mode=False)
 
-        # If we get here without exception, test passed
+        urandom.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_chaos_error_has_correct_attributes(self):
@@ -499,16 +807,12 @@ class TestChaosMode:
 def run_all_tests():
     """Run all tests and print a summary, writing results to test_results.txt for CI."""
     from datetime import datetime
-    from io import StringIO
 
     print("=" * 70)
     print("IntelliFlow SupportFlow Test Suite")
     print("=" * 70)
     print()
 
-    # Capture output for test_results.txt
-    output_capture = StringIO()
-
     # Run pytest programmatically
     exit_code = pytest.main([
         __file__,
@@ -528,14 +832,17 @@ Exit Code: {exit_code}
 {'=' * 50}
 
 Test Categories:
-- Classifier POSITIVE: 2 tests
+- Classifier POSITIVE: 4 tests
 - Classifier NEGATIVE: 2 tests
-- Classifier QUERY: 2 tests
-- Database Ticket Creation: 2 tests
+- Classifier QUERY: 4 tests
+- Database Ticket Creation: 3 tests
 - Query Handler DB Retrieval: 2 tests
+- Negative Handler Escalation: 3 tests
+- Response Cache: 1 test
+- LLM Client Concurrency: 3 tests
 - Chaos Mode: 3 tests
 
-Total: 13 tests
+Total: 25 tests
 
 {'=' * 50}
 """